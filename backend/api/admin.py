@@ -1,7 +1,7 @@
 
 # Register your models here.
 from django.contrib import admin
-from .models import Game, PlayerToGame, Action, Statistics, Debts, UserProfile
+from .models import Game, PlayerToGame, Action, ActionSummary, Statistics, Debts, GameSummary, ArchivedGame, ArchivedTotals, HeadToHead, PlayerRating, UserProfile
 
 @admin.register(Game)
 class GameAdmin(admin.ModelAdmin):
@@ -20,6 +20,11 @@ class ActionGameAdmin(admin.ModelAdmin):
     list_display = ('player_to_game', 'action_time', 'multiplier')
     list_filter = ('player_to_game__game__code',)
 
+@admin.register(ActionSummary)
+class ActionSummaryGameAdmin(admin.ModelAdmin):
+    list_display = ('player_to_game', 'actions', 'multiplier', 'first_action_time', 'last_action_time')
+    list_filter = ('player_to_game__game__code',)
+
 @admin.register(Statistics)
 class StatisticsGameAdmin(admin.ModelAdmin):
     list_display = ('player_to_game', 'buy_in', 'cash_out')
@@ -36,7 +41,50 @@ class DebtsGameAdmin(admin.ModelAdmin):
     get_phone_number.short_description = 'Numer telefonu'
 
 
+@admin.register(GameSummary)
+class GameSummaryAdmin(admin.ModelAdmin):
+    list_display = ('code', 'game_date', 'duration', 'total_pot', 'players', 'created_at')
+    search_fields = ('code',)
+    readonly_fields = ('code', 'game', 'document', 'etag', 'created_at')
+
+    def game_date(self, obj):
+        return obj.document.get('date')
+
+    def duration(self, obj):
+        return obj.document.get('duration')
+
+    def total_pot(self, obj):
+        return obj.document.get('total_pot')
+
+    def players(self, obj):
+        return len(obj.document.get('players', []))
+
+    game_date.short_description = 'Data gry'
+
+@admin.register(ArchivedGame)
+class ArchivedGameAdmin(admin.ModelAdmin):
+    list_display = ('code', 'start_time', 'buy_in', 'archived_at')
+    list_filter = ('start_time',)
+    search_fields = ('code',)
+
+@admin.register(ArchivedTotals)
+class ArchivedTotalsAdmin(admin.ModelAdmin):
+    list_display = ('user', 'games_played', 'total_buy_in', 'total_cash_out', 'play_time')
+
+
+@admin.register(HeadToHead)
+class HeadToHeadAdmin(admin.ModelAdmin):
+    list_display = ('user', 'opponent', 'games', 'net', 'opponent_net')
+    list_select_related = ('user', 'opponent')
+
+
+@admin.register(PlayerRating)
+class PlayerRatingAdmin(admin.ModelAdmin):
+    list_display = ('user', 'rating', 'games')
+    list_select_related = ('user',)
+    ordering = ('-rating',)
+
 
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
-    list_display = ('user', 'phone_number')
\ No newline at end of file
+    list_display = ('user', 'phone_number')
@@ -0,0 +1,172 @@
+"""Archive tier for ended games.
+
+Active-game lookups only ever need the few games being played, yet `Game` and its child tables
+hold every game ever played. An ended game whose debts are all accepted is moved into the archive
+tables instead: `ArchivedGame` (the game, same id and code), `ArchivedResult` (one row per seat
+with its cash-out and action totals) and `ArchivedDebt` (the debts, same ids).
+
+The statistics views add each user's `ArchivedTotals`, recomputed whenever one of their games is
+archived or restored, to their live results. Games are moved by the `archive_games` command, which
+restores them with `--restore`; restored games keep their ids and codes, and their actions stay
+compacted (see `api.compaction`). The summary document of an archived game (see `api.summaries`)
+is kept, so it can still be fetched by code.
+"""
+
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Max, Sum
+
+from api.compaction import compact_game
+from api.models import (
+    ActionSummary, ArchivedDebt, ArchivedGame, ArchivedResult, ArchivedTotals, Debts, Game, GameSummary, PlayerToGame,
+    Statistics, explicit_auto_now_add,
+)
+from api.summaries import get_summary
+
+
+GAME_FIELDS = (
+    'code', 'start_time', 'buy_in', 'end_time', 'game_time', 'blind', 'how_many_plo', 'how_often_stand_up',
+    'is_poker_jackpot', 'is_win_27', 'creator_id',
+)
+DEBT_FIELDS = ('amount', 'sender_id', 'reciver_id', 'is_send', 'send_date', 'is_accepted', 'accept_date')
+
+
+def archivable_games(before):
+    """Ended games that ended before `before` and have no open debts, oldest first."""
+    return (
+        Game.objects.filter(is_end=True, end_time__lt=before)
+        .exclude(debt_to_game__is_accepted=False)
+        .order_by('end_time', 'id')
+    )
+
+
+def archive_game(game_id):
+    """Moves an ended game without open debts into the archive tables; returns whether it was moved."""
+    compact_game(game_id)
+
+    with transaction.atomic():
+        game = Game.objects.select_for_update().filter(pk=game_id, is_end=True).first()
+        if game is None or Debts.objects.filter(game=game, is_accepted=False).exists():
+            return False
+
+        statistics = {stat.player_to_game_id: stat for stat in Statistics.objects.filter(player_to_game__game=game)}
+        summaries = {summary.player_to_game_id: summary for summary in ActionSummary.objects.filter(player_to_game__game=game)}
+
+        archived = ArchivedGame.objects.create(id=game.id, **{field: getattr(game, field) for field in GAME_FIELDS})
+        results = []
+        for seat in PlayerToGame.objects.filter(game=game):
+            stat = statistics.get(seat.id)
+            summary = summaries.get(seat.id)
+            results.append(ArchivedResult(
+                game=archived,
+                seat_id=seat.id,
+                player_id=seat.player_id,
+                join_time=seat.join_time,
+                statistics_id=stat and stat.id,
+                buy_in=stat and stat.buy_in,
+                cash_out=stat and stat.cash_out,
+                cash_out_time=stat and stat.cash_out_time,
+                actions=summary.actions if summary else 0,
+                multiplier=summary.multiplier if summary else 0,
+                first_action_time=summary and summary.first_action_time,
+                last_action_time=summary and summary.last_action_time,
+            ))
+        ArchivedResult.objects.bulk_create(results)
+        ArchivedDebt.objects.bulk_create([
+            ArchivedDebt(id=debt.id, game=archived, **{field: getattr(debt, field) for field in DEBT_FIELDS})
+            for debt in Debts.objects.filter(game=game)
+        ])
+
+        # Its seats, statistics, action summaries and debts go with it; its summary document stays.
+        get_summary(game)
+        game.delete()
+        refresh_totals([result.player_id for result in results])
+    return True
+
+
+def restore_game(code):
+    """Moves an archived game back into the live tables; returns whether it was found.
+
+    Restored rows keep their archived timestamps, so it is meant for management commands only
+    (see `explicit_auto_now_add`).
+    """
+    with transaction.atomic(), explicit_auto_now_add(Game, PlayerToGame, Statistics):
+        archived = ArchivedGame.objects.select_for_update().filter(code=code).first()
+        if archived is None:
+            return False
+
+        game = Game.objects.create(
+            id=archived.id, is_end=True, actions_compacted=True, **{field: getattr(archived, field) for field in GAME_FIELDS}
+        )
+        results = list(archived.results.all())
+        PlayerToGame.objects.bulk_create([
+            PlayerToGame(id=result.seat_id, game=game, player_id=result.player_id, join_time=result.join_time)
+            for result in results
+        ])
+        Statistics.objects.bulk_create([
+            Statistics(
+                id=result.statistics_id,
+                player_to_game_id=result.seat_id,
+                buy_in=result.buy_in,
+                cash_out=result.cash_out,
+                cash_out_time=result.cash_out_time,
+            )
+            for result in results if result.statistics_id is not None
+        ])
+        ActionSummary.objects.bulk_create([
+            ActionSummary(
+                player_to_game_id=result.seat_id,
+                actions=result.actions,
+                multiplier=result.multiplier,
+                first_action_time=result.first_action_time,
+                last_action_time=result.last_action_time,
+            )
+            for result in results if result.actions
+        ])
+        Debts.objects.bulk_create([
+            Debts(id=debt.id, game=game, **{field: getattr(debt, field) for field in DEBT_FIELDS})
+            for debt in archived.debts.all()
+        ])
+
+        GameSummary.objects.filter(code=code).update(game=game)
+        archived.delete()
+        refresh_totals([result.player_id for result in results])
+    return True
+
+
+def refresh_totals(user_ids):
+    """Recomputes the `ArchivedTotals` of the given users from their archived results."""
+    user_ids = set(user_ids)
+    totals = (
+        ArchivedResult.objects.filter(player__in=user_ids)
+        .values('player')
+        .annotate(
+            games_played=Count('id'),
+            results=Count('statistics_id'),
+            total_buy_in=Sum('buy_in'),
+            total_cash_out=Sum('cash_out'),
+            highest_win=Max(F('cash_out') - F('buy_in')),
+            play_time=Sum(ExpressionWrapper(F('game__end_time') - F('game__start_time'), output_field=DurationField())),
+        )
+        .order_by()
+    )
+    rows = [
+        ArchivedTotals(
+            user_id=row['player'],
+            games_played=row['games_played'],
+            results=row['results'],
+            total_buy_in=row['total_buy_in'] or 0,
+            total_cash_out=row['total_cash_out'] or 0,
+            highest_win=row['highest_win'],
+            play_time=row['play_time'] or timedelta(),
+        )
+        for row in totals
+    ]
+    ArchivedTotals.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['user'],
+        update_fields=['games_played', 'results', 'total_buy_in', 'total_cash_out', 'highest_win', 'play_time'],
+    )
+    ArchivedTotals.objects.filter(user__in=user_ids - {row.user_id for row in rows}).delete()
@@ -0,0 +1,105 @@
+"""Allocation of game codes.
+
+Every game gets a number from a database counter and its code is that number passed through a
+keyed permutation of the 26**8 eight-letter codes. Distinct numbers give distinct codes, so no
+code is ever checked for existence, while consecutive numbers give unrelated codes that cannot be
+guessed without `settings.GAME_CODE_KEY`.
+
+The permutation is a 4-round Feistel network on 38-bit values (2**38 > 26**8), cycle-walking until
+the result falls inside the code space. Numbers are reserved from the counter in blocks of
+`BLOCK_SIZE`, one query per block, from the `api_game_code_seq` PostgreSQL sequence (INCREMENT BY
+BLOCK_SIZE). A sequence is outside transactions, so a rolled back block is never handed out again;
+other databases are not supported.
+
+GAME_CODE_KEY must never change once games exist: a new key maps numbers to different codes,
+which could repeat the codes of existing games. Codes drawn at random before this allocator have
+a chance of about one in 2 * 10**11 each to be hit again, which the unique constraint reports.
+"""
+
+import hashlib
+import string
+import threading
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, NotSupportedError, connections
+
+
+ALPHABET = string.ascii_uppercase
+CODE_LENGTH = 8
+CODE_SPACE = len(ALPHABET) ** CODE_LENGTH
+HALF_BITS = 19
+HALF_MASK = (1 << HALF_BITS) - 1
+ROUNDS = 4
+BLOCK_SIZE = 100
+SEQUENCE_NAME = 'api_game_code_seq'
+
+
+@lru_cache(maxsize=4)
+def round_keys(key):
+    return [hashlib.sha256(f'game-code:{index}:{key}'.encode()).digest()[:16] for index in range(ROUNDS)]
+
+
+def _feistel(value, keys):
+    left, right = value >> HALF_BITS, value & HALF_MASK
+    for round_key in keys:
+        digest = hashlib.blake2b(right.to_bytes(3, 'big'), key=round_key, digest_size=4).digest()
+        left, right = right, left ^ (int.from_bytes(digest, 'big') & HALF_MASK)
+    return (left << HALF_BITS) | right
+
+
+def permute(number, key):
+    """Maps 0 <= number < CODE_SPACE to a distinct value of the same range."""
+    if not 0 <= number < CODE_SPACE:
+        raise ValueError(f"Game code number out of range: {number}")
+
+    keys = round_keys(key)
+    value = _feistel(number, keys)
+    while value >= CODE_SPACE:
+        value = _feistel(value, keys)
+    return value
+
+
+def encode(value):
+    letters = []
+    for _ in range(CODE_LENGTH):
+        value, index = divmod(value, len(ALPHABET))
+        letters.append(ALPHABET[index])
+    return ''.join(reversed(letters))
+
+
+def code_for(number):
+    """The game code of the `number`-th game."""
+    return encode(permute(number, settings.GAME_CODE_KEY))
+
+
+def reserve_block(using=DEFAULT_DB_ALIAS):
+    """Reserves BLOCK_SIZE numbers from the database sequence; returns the first one."""
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        raise NotSupportedError("Game codes are allocated from a PostgreSQL sequence.")
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT nextval(%s)", [SEQUENCE_NAME])
+        end = cursor.fetchone()[0]
+    return end - BLOCK_SIZE
+
+
+class CodeAllocator:
+    """Hands out game codes from blocks of numbers reserved in the database, thread-safely."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next = 0
+        self._end = 0
+
+    def allocate(self):
+        with self._lock:
+            if self._next >= self._end:
+                self._next = reserve_block()
+                self._end = self._next + BLOCK_SIZE
+            number = self._next
+            self._next += 1
+        return code_for(number)
+
+
+allocator = CodeAllocator()
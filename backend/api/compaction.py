@@ -0,0 +1,74 @@
+"""Compaction of the actions of ended games.
+
+Every rebuy is an `Action` row, but once a game has ended only each player's totals are read. A
+compacted game keeps one `ActionSummary` row per player (number of actions, total multiplier,
+first and last action time) instead, and `Game.actions_compacted` is set.
+
+Games are compacted by `api.tasks.compact_game_actions` once `EndGameView` commits, and by the
+`api.tasks.compact_ended_games` beat task for any game left behind. Reads go through `rebuys()`,
+which sums the actions of a seat or, when there are none, its summary. A game that ended without
+a summary document (see `api.summaries`) gets one before its actions go, so its rebuy timeline
+is kept.
+"""
+
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Sum
+from django.db.models.functions import Coalesce
+
+from api.models import Action, ActionSummary, Game
+
+
+def rebuys(prefix=''):
+    """Total multiplier of the seat reached through `prefix` (e.g. `'player_to_game__'`), compacted or not.
+
+    Sums the `Action` rows of the seat, so it groups the query by seat like `Sum` does.
+    """
+    return Coalesce(Sum(f'{prefix}game_player__multiplier'), F(f'{prefix}action_summary__multiplier'), 0)
+
+
+def compact_game(game_id):
+    """Folds the actions of an ended game into `ActionSummary` rows; returns the number of actions removed.
+
+    Active and already compacted games are left alone, so the call can be repeated safely.
+    """
+    with transaction.atomic():
+        game = Game.objects.select_for_update().filter(pk=game_id, is_end=True, actions_compacted=False).first()
+        if game is None:
+            return 0
+        # Imported here: api.summaries reads the rebuys through this module.
+        from api.summaries import get_summary
+        get_summary(game)
+
+        totals = (
+            Action.objects.filter(player_to_game__game=game)
+            .values('player_to_game')
+            .annotate(
+                actions=Count('id'),
+                multiplier=Sum('multiplier'),
+                first_action_time=Min('action_time'),
+                last_action_time=Max('action_time'),
+            )
+            .order_by()
+        )
+        ActionSummary.objects.bulk_create([
+            ActionSummary(
+                player_to_game_id=row['player_to_game'],
+                actions=row['actions'],
+                multiplier=row['multiplier'],
+                first_action_time=row['first_action_time'],
+                last_action_time=row['last_action_time'],
+            )
+            for row in totals
+        ])
+        removed, _ = Action.objects.filter(player_to_game__game=game).delete()
+
+        game.actions_compacted = True
+        game.save(update_fields=['actions_compacted'])
+    return removed
+
+
+def games_to_compact(limit):
+    """Ids of up to `limit` ended games whose actions are not compacted yet, oldest first."""
+    return list(
+        Game.objects.filter(is_end=True, actions_compacted=False).order_by('end_time', 'id').values_list('id', flat=True)[:limit]
+    )
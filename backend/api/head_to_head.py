@@ -0,0 +1,147 @@
+"""Head-to-head results between players: games played together and each side's net result.
+
+The totals of every pair come from a results matrix with one row per game and one column per
+player, holding results in grosze (0 where the player did not play) next to a mask of who played.
+Two matrix products give all pairs at once: `played.T @ played` counts the games two players shared
+and `results.T @ played` sums each player's results in the games shared with each other player.
+
+`HeadToHead` keeps one row per ordered pair. `EndGameView` adds the ended game to its players' rows
+(`record_game`), and the `rebuild_head_to_head` command recomputes all of them from the live and
+archived results (`rebuild`). Archiving a game does not change them.
+"""
+
+from decimal import Decimal
+
+import numpy as np
+from django.db import connection, transaction
+from django.db.models import F
+
+from api.models import ArchivedResult, HeadToHead, PlayerToGame
+
+
+def _cents(amount):
+    return int(Decimal(amount).scaleb(2))
+
+
+def _amount(cents):
+    return Decimal(int(cents)).scaleb(-2)
+
+
+def pair_totals(results, played):
+    """Returns the `(games, net)` matrices of all pairs of columns of a games × players matrix.
+
+    `games[i, j]` is the number of games players `i` and `j` played together and `net[i, j]` is
+    player `i`'s total result in them, so `net.T` holds the opponents' results. The diagonals are 0.
+    """
+    played = played.astype(np.int64)
+    games = played.T @ played
+    net = results.T @ played
+    np.fill_diagonal(games, 0)
+    np.fill_diagonal(net, 0)
+    return games, net
+
+
+def record_game(results):
+    """Adds an ended game to the head-to-head rows of its players.
+
+    `results` maps the ids of the game's players to their results. Meant to run inside the
+    transaction ending the game; the rows are locked, so concurrently ended games add up correctly.
+    """
+    user_ids = sorted(results)
+    if len(user_ids) < 2:
+        return
+
+    games, net = pair_totals(
+        np.array([[_cents(results[user_id]) for user_id in user_ids]], dtype=np.int64),
+        np.ones((1, len(user_ids)), dtype=bool),
+    )
+    index = {user_id: position for position, user_id in enumerate(user_ids)}
+
+    HeadToHead.objects.bulk_create(
+        [HeadToHead(user_id=user, opponent_id=opponent) for user in user_ids for opponent in user_ids if user != opponent],
+        ignore_conflicts=True,
+    )
+    rows = list(
+        HeadToHead.objects.select_for_update()
+        .filter(user__in=user_ids, opponent__in=user_ids)
+        .order_by('user', 'opponent')
+    )
+    for row in rows:
+        i, j = index[row.user_id], index[row.opponent_id]
+        row.games += int(games[i, j])
+        row.net += _amount(net[i, j])
+        row.opponent_net += _amount(net[j, i])
+    HeadToHead.objects.bulk_update(rows, ['games', 'net', 'opponent_net'])
+
+
+def _results():
+    """`(game id, player id, result)` of every settled seat, live and archived, ordered by game."""
+    columns = ('game_id', 'player_id', 'result')
+    live = PlayerToGame.objects.filter(game__is_end=True, statistics__isnull=False).annotate(
+        result=F('statistics__cash_out') - F('statistics__buy_in'),
+    )
+    # Archived games keep the ids of the games they were.
+    archived = ArchivedResult.objects.filter(cash_out__isnull=False).annotate(result=F('cash_out') - F('buy_in'))
+    return live.values_list(*columns).union(archived.values_list(*columns), all=True).order_by('game_id')
+
+
+def _player_ids():
+    live = PlayerToGame.objects.filter(game__is_end=True, statistics__isnull=False).values_list('player_id')
+    archived = ArchivedResult.objects.filter(cash_out__isnull=False).values_list('player_id')
+    return sorted(player_id for player_id, in live.union(archived))
+
+
+def _add_chunk(games, net, seats, index):
+    """Adds the pairs of a chunk of `_results` rows, whole games only, to the `games` and `net` totals."""
+    game_index = {game_id: position for position, game_id in enumerate(dict.fromkeys(game_id for game_id, *_ in seats))}
+    results = np.zeros((len(game_index), len(index)), dtype=np.int64)
+    played = np.zeros(results.shape, dtype=bool)
+    for game_id, player_id, result in seats:
+        results[game_index[game_id], index[player_id]] = _cents(result)
+        played[game_index[game_id], index[player_id]] = True
+    chunk_games, chunk_net = pair_totals(results, played)
+    games += chunk_games
+    net += chunk_net
+
+
+def rebuild(chunk_size=5000):
+    """Recomputes every `HeadToHead` row from the results of all ended games; returns the number of rows.
+
+    The results are streamed and added up `chunk_size` games at a time, so memory stays bounded by
+    the chunk and the players × players totals. On PostgreSQL, the table is locked for the whole
+    rebuild: games ending meanwhile wait for it instead of being lost.
+    """
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(f'LOCK TABLE {HeadToHead._meta.db_table} IN EXCLUSIVE MODE')
+
+        player_ids = _player_ids()
+        index = {player_id: position for position, player_id in enumerate(player_ids)}
+        games = np.zeros((len(player_ids), len(player_ids)), dtype=np.int64)
+        net = np.zeros_like(games)
+        seats = []
+        chunk_games = 0
+        for seat in _results().iterator():
+            if not seats or seat[0] != seats[-1][0]:
+                if chunk_games == chunk_size:
+                    _add_chunk(games, net, seats, index)
+                    seats, chunk_games = [], 0
+                chunk_games += 1
+            seats.append(seat)
+        if seats:
+            _add_chunk(games, net, seats, index)
+
+        users, opponents = np.nonzero(games)
+        HeadToHead.objects.all().delete()
+        HeadToHead.objects.bulk_create([
+            HeadToHead(
+                user_id=player_ids[i],
+                opponent_id=player_ids[j],
+                games=int(games[i, j]),
+                net=_amount(net[i, j]),
+                opponent_net=_amount(net[j, i]),
+            )
+            for i, j in zip(users, opponents)
+        ], batch_size=1000)
+    return len(users)
@@ -0,0 +1,78 @@
+"""Game history of a user, live and archived, with keyset pagination.
+
+A page is a single query: the user's seats in ended games (`PlayerToGame`) and in archived games
+(`ArchivedResult`, see `api.archive`) are reached through their `(player, ...)` indexes, joined to
+their game by primary key and merged with `UNION ALL`, newest first. Pages are delimited by a
+cursor on `(start_time, game id)` instead of an offset, so a deep page reads no more rows than the
+first one.
+"""
+
+import base64
+from datetime import datetime
+
+from django.db.models import Count, Exists, F, IntegerField, OuterRef, Q, Subquery
+
+from api.models import ArchivedResult, PlayerToGame
+
+
+COLUMNS = ('game_id', 'game_code', 'game_start', 'game_duration', 'game_buy_in', 'result', 'players')
+
+
+def encode_cursor(start_time, game_id):
+    return base64.urlsafe_b64encode(f'{start_time.isoformat()}|{game_id}'.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Returns the `(start_time, game id)` of a cursor; raises `ValueError` for invalid ones."""
+    start_time, _, game_id = base64.urlsafe_b64decode(cursor.encode()).decode().partition('|')
+    return datetime.fromisoformat(start_time), int(game_id)
+
+
+def _count(model, **filters):
+    return Subquery(
+        model.objects.filter(**filters).values('game').annotate(count=Count('id')).values('count')[:1],
+        output_field=IntegerField(),
+    )
+
+
+def _page_filters(before, date_from, date_to):
+    filters = Q()
+    if before is not None:
+        start_time, game_id = before
+        filters &= Q(game__start_time__lt=start_time) | Q(game__start_time=start_time, game_id__lt=game_id)
+    if date_from is not None:
+        filters &= Q(game__start_time__date__gte=date_from)
+    if date_to is not None:
+        filters &= Q(game__start_time__date__lte=date_to)
+    return filters
+
+
+def game_history(user, limit, before=None, date_from=None, date_to=None, with_username=None):
+    """Returns up to `limit` ended games of `user`, newest first, as dicts of `COLUMNS`.
+
+    `before` is a decoded cursor; `with_username` keeps the games shared with that player.
+    """
+    filters = _page_filters(before, date_from, date_to)
+
+    live = PlayerToGame.objects.filter(filters, player=user, game__is_end=True).annotate(
+        game_code=F('game__code'),
+        game_start=F('game__start_time'),
+        game_duration=F('game__game_time'),
+        game_buy_in=F('game__buy_in'),
+        result=F('statistics__cash_out') - F('statistics__buy_in'),
+        players=_count(PlayerToGame, game=OuterRef('game')),
+    )
+    archived = ArchivedResult.objects.filter(filters, player=user).annotate(
+        game_code=F('game__code'),
+        game_start=F('game__start_time'),
+        game_duration=F('game__game_time'),
+        game_buy_in=F('game__buy_in'),
+        result=F('cash_out') - F('buy_in'),
+        players=_count(ArchivedResult, game=OuterRef('game')),
+    )
+    if with_username:
+        live = live.filter(Exists(PlayerToGame.objects.filter(game=OuterRef('game'), player__username=with_username)))
+        archived = archived.filter(Exists(ArchivedResult.objects.filter(game=OuterRef('game'), player__username=with_username)))
+
+    games = live.values_list(*COLUMNS).union(archived.values_list(*COLUMNS), all=True).order_by('-game_start', '-game_id')
+    return [dict(zip(COLUMNS, row)) for row in games[:limit]]
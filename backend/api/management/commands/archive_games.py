@@ -0,0 +1,35 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.archive import archivable_games, archive_game, restore_game
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves ended games without open debts into the archive tables (see api.archive), "
+        "or moves archived games back with --restore."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than', type=int, default=180, help="Archive games that ended at least this many days ago.")
+        parser.add_argument('--limit', type=int, default=None, help="Archive at most this many games.")
+        parser.add_argument('--restore', nargs='+', metavar='CODE', help="Restore the archived games with these codes.")
+
+    def handle(self, *args, **options):
+        if options['restore']:
+            missing = [code for code in options['restore'] if not restore_game(code)]
+            restored = len(options['restore']) - len(missing)
+            self.stdout.write(self.style.SUCCESS(f"Restored {restored} games."))
+            if missing:
+                raise CommandError(f"No archived games with codes: {', '.join(missing)}.")
+            return
+
+        if options['older_than'] < 0:
+            raise CommandError("--older-than cannot be negative.")
+
+        before = timezone.now() - timedelta(days=options['older_than'])
+        game_ids = list(archivable_games(before).values_list('id', flat=True)[:options['limit']])
+        archived = sum(archive_game(game_id) for game_id in game_ids)
+        self.stdout.write(self.style.SUCCESS(f"Archived {archived} of {len(game_ids)} games."))
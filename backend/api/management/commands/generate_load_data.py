@@ -0,0 +1,193 @@
+import random
+import string
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from api.models import Action, Debts, Game, PlayerToGame, Statistics, UserProfile, explicit_auto_now_add
+from api.settlement import compute_transfers
+
+
+BUY_INS = (20, 50, 50, 50, 100, 200)
+BLINDS = {20: Decimal('0.20'), 50: Decimal('0.50'), 100: Decimal('1.00'), 200: Decimal('2.00')}
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates users and ended games with realistic rebuys, statistics and debts for load testing. "
+        "The same --seed always produces the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=50)
+        parser.add_argument('--games', type=int, default=1000)
+        parser.add_argument('--min-players', type=int, default=4)
+        parser.add_argument('--max-players', type=int, default=10)
+        parser.add_argument('--days', type=int, default=3 * 365, help="Length of the generated history, ending today.")
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=2000, help="Games generated per transaction.")
+        parser.add_argument('--prefix', default='load_', help="Username prefix of generated users.")
+        parser.add_argument('--password', default='load-password', help="Password of every generated user.")
+        parser.add_argument('--clear', action='store_true', help="Delete users with the prefix (and their games) first.")
+
+    def handle(self, *args, **options):
+        if options['users'] < options['max_players'] or options['min_players'] < 2:
+            raise CommandError("--users must be at least --max-players, and --min-players at least 2.")
+        if options['min_players'] > options['max_players']:
+            raise CommandError("--min-players cannot be greater than --max-players.")
+
+        self.rng = random.Random(options['seed'])
+        self.prefix = options['prefix']
+        started = time.perf_counter()
+
+        if options['clear']:
+            deleted, _ = User.objects.filter(username__startswith=self.prefix).delete()
+            self.stdout.write(f"Deleted {deleted} rows of previously generated data.")
+        elif User.objects.filter(username__startswith=self.prefix).exists():
+            raise CommandError(f"Users with prefix {self.prefix!r} already exist, use --clear or another --prefix.")
+
+        user_ids = self.create_users(options['users'], options['password'])
+        end = timezone.now().replace(hour=18, minute=0, second=0, microsecond=0) - timedelta(days=1)
+        first_day = end - timedelta(days=options['days'])
+        codes = set()
+
+        with explicit_auto_now_add(Game, PlayerToGame, Action, Statistics):
+            for offset in range(0, options['games'], options['batch_size']):
+                count = min(options['batch_size'], options['games'] - offset)
+                starts = sorted(
+                    first_day + timedelta(seconds=self.rng.randrange(options['days'] * 86400))
+                    for _ in range(count)
+                )
+                with transaction.atomic():
+                    self.create_games(starts, user_ids, codes, end, options['min_players'], options['max_players'])
+                self.stdout.write(f"Generated {offset + count}/{options['games']} games...")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {len(user_ids)} users and {options['games']} games in {time.perf_counter() - started:.1f}s."
+        ))
+
+    def create_users(self, count, password):
+        password_hash = make_password(password)
+        users = [
+            User(
+                username=f'{self.prefix}{index:06d}',
+                email=f'{self.prefix}{index:06d}@example.com',
+                first_name='Load',
+                last_name=f'User {index}',
+                password=password_hash,
+                is_staff=index == 0,
+                is_superuser=index == 0,
+            )
+            for index in range(count)
+        ]
+        with transaction.atomic():
+            User.objects.bulk_create(users, batch_size=1000)
+            user_ids = list(
+                User.objects.filter(username__startswith=self.prefix).order_by('username').values_list('id', flat=True)
+            )
+            UserProfile.objects.bulk_create(
+                [UserProfile(user_id=user_id, phone_number=f'{self.rng.randrange(500000000, 900000000)}') for user_id in user_ids],
+                batch_size=1000,
+            )
+        return user_ids
+
+    def unique_code(self, codes):
+        while True:
+            code = ''.join(self.rng.choices(string.ascii_uppercase, k=8))
+            if code not in codes:
+                codes.add(code)
+                return code
+
+    def create_games(self, starts, user_ids, codes, now, min_players, max_players):
+        rng = self.rng
+        games, seats = [], []
+
+        for start in starts:
+            buy_in = rng.choice(BUY_INS)
+            duration = timedelta(minutes=rng.randrange(90, 7 * 60, 5))
+            games.append(Game(
+                code=self.unique_code(codes),
+                start_time=start,
+                end_time=start + duration,
+                game_time=duration,
+                is_end=True,
+                buy_in=buy_in,
+                blind=BLINDS[buy_in],
+                how_many_plo=rng.randrange(0, 4),
+                how_often_stand_up=rng.choice((0, 30, 60)),
+                creator_id=user_ids[0],
+            ))
+            seats.append(rng.sample(user_ids, rng.randint(min_players, max_players)))
+
+        Game.objects.bulk_create(games)
+
+        players = [
+            PlayerToGame(player_id=user_id, game=game, join_time=game.start_time + timedelta(minutes=rng.randrange(0, 30)))
+            for game, user_ids_in_game in zip(games, seats)
+            for user_id in user_ids_in_game
+        ]
+        PlayerToGame.objects.bulk_create(players)
+
+        actions, statistics, debts = [], [], []
+        players_by_game = {}
+        for player in players:
+            players_by_game.setdefault(player.game_id, []).append(player)
+
+        for game in games:
+            game_players = players_by_game[game.id]
+            buy_ins = {}
+            for player in game_players:
+                # Everyone buys in once; rebuys follow a geometric distribution.
+                rebuys = 1
+                while rng.random() < 0.35 and rebuys < 10:
+                    rebuys += 1
+                buy_ins[player.id] = rebuys * game.buy_in
+                span = (game.end_time - player.join_time).total_seconds()
+                for index in range(rebuys):
+                    action_time = player.join_time + timedelta(seconds=0 if index == 0 else rng.uniform(0, span))
+                    actions.append(Action(player_to_game=player, action_time=action_time, multiplier=1))
+
+            cash_outs = self.split_pot(sum(buy_ins.values()), len(game_players))
+            balances = []
+            for player, cash_out in zip(game_players, cash_outs):
+                statistics.append(Statistics(
+                    player_to_game=player,
+                    buy_in=Decimal(buy_ins[player.id]),
+                    cash_out=Decimal(cash_out),
+                    cash_out_time=game.end_time,
+                ))
+                balances.append((player.player_id, cash_out - buy_ins[player.id]))
+
+            settled = (now - game.end_time).days > 14
+            for sender_id, receiver_id, amount in compute_transfers(balances):
+                is_send = settled or rng.random() < 0.5
+                is_accepted = settled or (is_send and rng.random() < 0.5)
+                debts.append(Debts(
+                    game=game,
+                    amount=Decimal(amount),
+                    sender_id=sender_id,
+                    reciver_id=receiver_id,
+                    is_send=is_send,
+                    send_date=game.end_time + timedelta(days=1) if is_send else None,
+                    is_accepted=is_accepted,
+                    accept_date=game.end_time + timedelta(days=2) if is_accepted else None,
+                ))
+
+        Action.objects.bulk_create(actions, batch_size=5000)
+        Statistics.objects.bulk_create(statistics, batch_size=5000)
+        Debts.objects.bulk_create(debts, batch_size=5000)
+
+    def split_pot(self, pot, players):
+        """Splits `pot` whole PLN between players with skewed weights; the shares always sum to `pot`."""
+        weights = [self.rng.paretovariate(1.5) * self.rng.random() for _ in range(players)]
+        total = sum(weights)
+        shares = [int(pot * weight / total) for weight in weights]
+        for index in self.rng.sample(range(players), pot - sum(shares)):
+            shares[index] += 1
+        return shares
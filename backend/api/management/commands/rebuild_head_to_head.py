@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.head_to_head import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recomputes the head-to-head results of all pairs of players from the live and archived games (see api.head_to_head)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=5000, help="Games per results matrix.")
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size must be positive.")
+
+        rows = rebuild(options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} head-to-head rows."))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from api.ratings import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recomputes all skill ratings and rating histories by replaying the live and archived games in the order they ended (see api.ratings)."
+
+    def handle(self, *args, **options):
+        games = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Replayed {games} rated games."))
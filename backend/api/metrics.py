@@ -0,0 +1,150 @@
+"""Prometheus metrics for the API and the Celery workers.
+
+With several processes (gunicorn workers, Celery prefork children) every process writes its
+samples to its service's PROMETHEUS_MULTIPROC_DIR and `/metrics` aggregates the directories of
+`settings.METRICS_COLLECT_DIRS` (by default its own); without it, the metrics of the serving
+process only are exposed. Each service needs its own directory: their processes live in separate
+PID namespaces, and gunicorn clears its directory on start.
+"""
+
+import glob
+import os
+import time
+from urllib.parse import urlparse
+
+from celery.signals import before_task_publish, task_failure, task_postrun, task_prerun
+from django.conf import settings
+from prometheus_client import CollectorRegistry, Counter, Histogram, REGISTRY, multiprocess
+from prometheus_client.core import GaugeMetricFamily
+
+
+REQUESTS = Counter(
+    'cashboard_http_requests_total', "HTTP requests handled, per URL name.",
+    ['view', 'method', 'status'],
+)
+REQUEST_LATENCY = Histogram(
+    'cashboard_http_request_duration_seconds', "HTTP request latency, per URL name.",
+    ['view'], buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUEST_QUERIES = Histogram(
+    'cashboard_http_request_db_queries', "Database queries per HTTP request, per URL name.",
+    ['view'], buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+CACHE_REQUESTS = Counter(
+    'cashboard_cache_requests_total', "Application cache lookups, per cache and result (hit or miss).",
+    ['cache', 'result'],
+)
+TASKS_PUBLISHED = Counter(
+    'cashboard_celery_tasks_published_total', "Celery tasks sent to the broker.",
+    ['task'],
+)
+TASKS_STARTED = Counter(
+    'cashboard_celery_tasks_started_total', "Celery tasks picked up by a worker.",
+    ['task'],
+)
+TASK_QUEUE_WAIT = Histogram(
+    'cashboard_celery_task_queue_seconds', "Time between publishing a Celery task and a worker starting it.",
+    ['task'], buckets=(0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30, 60, 300),
+)
+TASK_DURATION = Histogram(
+    'cashboard_celery_task_duration_seconds', "Celery task run time.",
+    ['task'], buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30),
+)
+TASKS = Counter(
+    'cashboard_celery_tasks_total', "Finished Celery tasks, per task and state.",
+    ['task', 'state'],
+)
+SMTP_FAILURES = Counter(
+    'cashboard_smtp_failures_total', "Emails that could not be delivered to the SMTP server.",
+    ['task'],
+)
+
+_task_started = {}
+_queue_collector = None
+
+
+def record_cache(cache_name, hit):
+    """Counts one lookup in an application cache."""
+    CACHE_REQUESTS.labels(cache=cache_name, result='hit' if hit else 'miss').inc()
+
+
+@before_task_publish.connect
+def _task_published(sender=None, headers=None, **kwargs):
+    # Tasks published but not started yet (published - started) is the backlog of one task.
+    TASKS_PUBLISHED.labels(task=sender).inc()
+    if headers is not None:
+        headers['published_at'] = time.time()
+
+
+@task_prerun.connect
+def _task_started_handler(task_id=None, task=None, **kwargs):
+    _task_started[task_id] = time.perf_counter()
+    TASKS_STARTED.labels(task=task.name).inc()
+    published_at = getattr(task.request, 'published_at', None) or (task.request.headers or {}).get('published_at')
+    if published_at:
+        TASK_QUEUE_WAIT.labels(task=task.name).observe(max(time.time() - published_at, 0))
+
+
+@task_postrun.connect
+def _task_finished_handler(task_id=None, task=None, state=None, **kwargs):
+    started = _task_started.pop(task_id, None)
+    if started is not None:
+        TASK_DURATION.labels(task=task.name).observe(time.perf_counter() - started)
+    TASKS.labels(task=task.name, state=state or 'UNKNOWN').inc()
+
+
+@task_failure.connect
+def _task_failed_handler(sender=None, task_id=None, **kwargs):
+    _task_started.pop(task_id, None)
+
+
+class CeleryQueueCollector:
+    """Reports the number of messages waiting in the Redis broker's Celery queue at scrape time."""
+
+    def __init__(self, broker_url, queue='celery'):
+        self.broker_url = broker_url
+        self.queue = queue
+
+    def collect(self):
+        import redis
+
+        gauge = GaugeMetricFamily(
+            'cashboard_celery_queue_length', "Messages waiting in the Celery broker queue.", labels=['queue'],
+        )
+        try:
+            client = redis.Redis.from_url(self.broker_url, socket_connect_timeout=0.5, socket_timeout=0.5)
+            gauge.add_metric([self.queue], client.llen(self.queue))
+        except redis.RedisError:
+            return
+        yield gauge
+
+
+class MultiDirectoryCollector:
+    """Aggregates the multiprocess samples of several directories, like `MultiProcessCollector` does for one."""
+
+    def __init__(self, paths):
+        self.paths = paths
+
+    def collect(self):
+        files = [name for path in self.paths for name in glob.glob(os.path.join(path, '*.db'))]
+        return multiprocess.MultiProcessCollector.merge(files, accumulate=True)
+
+
+def build_registry():
+    """Returns the registry to expose: aggregated over processes when PROMETHEUS_MULTIPROC_DIR is set."""
+    global _queue_collector
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        registry.register(MultiDirectoryCollector(settings.METRICS_COLLECT_DIRS or [os.environ['PROMETHEUS_MULTIPROC_DIR']]))
+    else:
+        registry = REGISTRY
+
+    broker_url = getattr(settings, 'CELERY_BROKER_URL', '')
+    if urlparse(broker_url).scheme in ('redis', 'rediss'):
+        if registry is not REGISTRY:
+            registry.register(CeleryQueueCollector(broker_url))
+        elif _queue_collector is None:
+            _queue_collector = CeleryQueueCollector(broker_url)
+            REGISTRY.register(_queue_collector)
+    return registry
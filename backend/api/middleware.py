@@ -0,0 +1,329 @@
+import gzip
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+import brotli
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+
+logger = logging.getLogger('api.timing')
+
+_current_timing = ContextVar('request_timing', default=None)
+
+
+class RequestTiming:
+    """Measurements collected while handling a single request."""
+
+    __slots__ = ('start', 'queries', 'db_time', 'serialize_start', 'serialize_time')
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serialize_start = None
+        self.serialize_time = 0.0
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper adding each query and its duration to the current request's timing."""
+    timing = _current_timing.get()
+    if timing is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timing.queries += 1
+        timing.db_time += time.perf_counter() - start
+
+
+def install_query_recorder(sender=None, connection=None, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class TimingHistogram:
+    """Rolling per-URL-name window of request timings, kept in process memory.
+
+    Every worker process keeps its own window of the last `window` requests per URL name.
+    """
+
+    BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+    def __init__(self, window=1000):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def add(self, url_name, total_ms, db_ms, serialize_ms, queries):
+        with self._lock:
+            samples = self._samples.setdefault(url_name, deque(maxlen=self.window))
+            samples.append((total_ms, db_ms, serialize_ms, queries))
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    def snapshot(self):
+        with self._lock:
+            samples = {url_name: list(values) for url_name, values in self._samples.items()}
+        return {url_name: self._summarize(values) for url_name, values in sorted(samples.items())}
+
+    def _summarize(self, samples):
+        totals = sorted(sample[0] for sample in samples)
+        count = len(samples)
+        histogram = {f'le_{bucket}ms': 0 for bucket in self.BUCKETS_MS}
+        histogram['le_inf'] = 0
+        for total in totals:
+            bucket = next((b for b in self.BUCKETS_MS if total <= b), None)
+            histogram[f'le_{bucket}ms' if bucket else 'le_inf'] += 1
+
+        return {
+            'count': count,
+            'total_ms': {
+                'avg': round(sum(totals) / count, 3),
+                'p50': round(totals[int(0.50 * (count - 1))], 3),
+                'p95': round(totals[int(0.95 * (count - 1))], 3),
+                'max': round(totals[-1], 3),
+            },
+            'db_ms_avg': round(sum(sample[1] for sample in samples) / count, 3),
+            'serialize_ms_avg': round(sum(sample[2] for sample in samples) / count, 3),
+            'queries_avg': round(sum(sample[3] for sample in samples) / count, 2),
+            'queries_max': max(sample[3] for sample in samples),
+            'histogram': histogram,
+        }
+
+
+timing_histogram = TimingHistogram()
+
+
+class RequestTimingMiddleware:
+    """Records query count, DB time, serialization time and total time of every request.
+
+    Enabled with `settings.REQUEST_TIMING`. Results are:
+    - sent back in a `Server-Timing` header,
+    - logged as one JSON line per request on the `api.timing` logger,
+    - added to the per-URL-name `timing_histogram`, readable from the request timings endpoint.
+
+    Queries are counted through a database execute wrapper, so it works with async views too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_TIMING', False):
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+        connection_created.connect(install_query_recorder, dispatch_uid='api.request_timing')
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection=connection)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection=connection)
+        timing = RequestTiming()
+        token = _current_timing.set(timing)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current_timing.reset(token)
+        self.finish(request, response, timing)
+        return response
+
+    async def __acall__(self, request):
+        timing = RequestTiming()
+        token = _current_timing.set(timing)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current_timing.reset(token)
+        self.finish(request, response, timing)
+        return response
+
+    def process_template_response(self, request, response):
+        """Times rendering (DRF serialization to JSON) through a post-render callback."""
+        timing = _current_timing.get()
+        if timing is not None:
+            timing.serialize_start = time.perf_counter()
+
+            def rendered(response):
+                timing.serialize_time = time.perf_counter() - timing.serialize_start
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def finish(self, request, response, timing):
+        total_ms = (time.perf_counter() - timing.start) * 1000
+        db_ms = timing.db_time * 1000
+        serialize_ms = timing.serialize_time * 1000
+        match = getattr(request, 'resolver_match', None)
+        url_name = (match.url_name if match else None) or 'unresolved'
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={db_ms:.2f};desc="{timing.queries} queries"',
+            f'serialize;dur={serialize_ms:.2f}',
+            f'total;dur={total_ms:.2f}',
+        ])
+        timing_histogram.add(url_name, total_ms, db_ms, serialize_ms, timing.queries)
+        logger.info(json.dumps({
+            'event': 'request_timing',
+            'method': request.method,
+            'path': request.path,
+            'url_name': url_name,
+            'status': response.status_code,
+            'queries': timing.queries,
+            'db_ms': round(db_ms, 2),
+            'serialize_ms': round(serialize_ms, 2),
+            'total_ms': round(total_ms, 2),
+        }))
+
+
+class PrometheusMiddleware:
+    """Counts requests and records latency and query counts per URL name for `/metrics`.
+
+    Enabled with `settings.METRICS_ENABLED`. Shares the query recorder with `RequestTimingMiddleware`
+    and reuses its measurements when both are enabled.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'METRICS_ENABLED', False):
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+        connection_created.connect(install_query_recorder, dispatch_uid='api.request_timing')
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection=connection)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        for connection in connections.all(initialized_only=True):
+            install_query_recorder(connection=connection)
+        timing, token = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            if token is not None:
+                _current_timing.reset(token)
+        self.observe(request, response, timing)
+        return response
+
+    async def __acall__(self, request):
+        timing, token = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            if token is not None:
+                _current_timing.reset(token)
+        self.observe(request, response, timing)
+        return response
+
+    def start(self):
+        timing = _current_timing.get()
+        if timing is not None:
+            return timing, None
+        timing = RequestTiming()
+        return timing, _current_timing.set(timing)
+
+    def observe(self, request, response, timing):
+        from api.metrics import REQUEST_LATENCY, REQUEST_QUERIES, REQUESTS
+
+        match = getattr(request, 'resolver_match', None)
+        url_name = (match.url_name if match else None) or 'unresolved'
+        if url_name == 'metrics':
+            return
+
+        REQUESTS.labels(view=url_name, method=request.method, status=response.status_code).inc()
+        REQUEST_LATENCY.labels(view=url_name).observe(time.perf_counter() - timing.start)
+        REQUEST_QUERIES.labels(view=url_name).observe(timing.queries)
+
+
+def accepted_encodings(header):
+    """Returns the content codings of an Accept-Encoding header that are not refused with q=0."""
+    codings = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = params.strip().removeprefix('q=')
+        try:
+            refused = bool(params) and float(quality) <= 0
+        except ValueError:
+            refused = False
+        if coding and not refused:
+            codings.add(coding.strip().lower())
+    return codings
+
+
+def encoded_etag(etag, encoding):
+    """The strong ETag of the `encoding`-compressed representation of a response with `etag`."""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Compresses responses of at least `settings.COMPRESSION_MIN_SIZE` bytes with brotli or gzip.
+
+    Brotli is preferred when the client accepts it. Small responses are sent as they are: the
+    compression overhead is not worth it below the threshold. Streaming responses, responses that
+    already have a Content-Encoding and non-text content types are left untouched. Strong ETags get
+    the encoding as a suffix (see `encoded_etag`), so each representation keeps its own.
+    """
+
+    COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'application/xml', 'application/msgpack')
+
+    def process_response(self, request, response):
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '').partition(';')[0]
+        if not content_type.startswith(self.COMPRESSIBLE_TYPES) and not content_type.endswith('+json'):
+            return response
+        if len(response.content) < settings.COMPRESSION_MIN_SIZE:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        codings = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if 'br' in codings:
+            encoding = 'br'
+            content = brotli.compress(response.content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+        elif 'gzip' in codings:
+            encoding = 'gzip'
+            content = gzip.compress(response.content, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0)
+        else:
+            return response
+
+        if len(content) >= len(response.content):
+            return response
+        response.content = content
+        response.headers['Content-Length'] = str(len(content))
+        # A strong ETag must not be reused for a different representation.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = encoded_etag(etag, encoding)
+        response.headers['Content-Encoding'] = encoding
+        return response
@@ -0,0 +1,90 @@
+# Generated by Django 5.1.1 on 2026-10-19 17:11
+
+import api.models
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Game',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(default=api.models.generate_unique_code, max_length=8, unique=True)),
+                ('start_time', models.DateTimeField(auto_now_add=True)),
+                ('buy_in', models.IntegerField(default=50)),
+                ('end_time', models.DateTimeField(blank=True, null=True)),
+                ('is_end', models.BooleanField(default=False)),
+                ('game_time', models.DurationField(blank=True, null=True)),
+                ('blind', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('how_many_plo', models.IntegerField(default=0)),
+                ('how_often_stand_up', models.IntegerField(default=0)),
+                ('is_poker_jackpot', models.BooleanField(default=True)),
+                ('is_win_27', models.BooleanField(default=True)),
+                ('creator', models.ForeignKey(default=api.models.get_default_creator, on_delete=django.db.models.deletion.CASCADE, related_name='created_games', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Debts',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('is_send', models.BooleanField(default=False)),
+                ('send_date', models.DateTimeField(blank=True, null=True)),
+                ('is_accepted', models.BooleanField(default=False)),
+                ('accept_date', models.DateTimeField(blank=True, null=True)),
+                ('reciver', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reciver', to=settings.AUTH_USER_MODEL)),
+                ('sender', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sender', to=settings.AUTH_USER_MODEL)),
+                ('game', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='debt_to_game', to='api.game')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PlayerToGame',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('join_time', models.DateTimeField(auto_now_add=True)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='players', to='api.game')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='games', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Action',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('action_time', models.DateTimeField(auto_now_add=True)),
+                ('multiplier', models.IntegerField(default=1)),
+                ('player_to_game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='game_player', to='api.playertogame')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='Statistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('buy_in', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('cash_out', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('cash_out_time', models.DateTimeField(auto_now_add=True)),
+                ('player_to_game', models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='statistics', to='api.playertogame')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='UserProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('phone_number', models.CharField(blank=True, max_length=15, null=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='playertogame',
+            constraint=models.UniqueConstraint(fields=('player', 'game'), name='unique_player_game'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1.1 on 2026-10-19 17:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Create the composite indexes before dropping the foreign key indexes they replace.
+        migrations.AddIndex(
+            model_name='action',
+            index=models.Index(fields=['player_to_game', 'action_time'], include=('multiplier',), name='action_player_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='debts',
+            index=models.Index(condition=models.Q(('is_accepted', False), ('is_send', False)), fields=['sender'], name='debts_open_outgoing_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='debts',
+            index=models.Index(condition=models.Q(('is_accepted', False), ('is_send', True)), fields=['reciver'], name='debts_open_incoming_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='statistics',
+            index=models.Index(fields=['player_to_game', 'cash_out_time'], include=('buy_in', 'cash_out'), name='stats_player_time_idx'),
+        ),
+        migrations.AlterField(
+            model_name='action',
+            name='player_to_game',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='game_player', to='api.playertogame'),
+        ),
+        migrations.AlterField(
+            model_name='statistics',
+            name='player_to_game',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='statistics', to='api.playertogame'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+
+BLOCK_SIZE = 100  # api.codes.BLOCK_SIZE when this migration was written
+
+
+def create_counter(apps, schema_editor):
+    schema_editor.execute(
+        f"CREATE SEQUENCE api_game_code_seq INCREMENT BY {BLOCK_SIZE} MINVALUE {BLOCK_SIZE} START WITH {BLOCK_SIZE}"
+    )
+
+
+def drop_counter(apps, schema_editor):
+    schema_editor.execute("DROP SEQUENCE api_game_code_seq")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_counter, drop_counter),
+    ]
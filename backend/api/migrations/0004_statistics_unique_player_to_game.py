@@ -0,0 +1,52 @@
+# Generated by Django 5.1.1 on 2026-10-19 17:19
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def delete_duplicate_results(apps, schema_editor):
+    """Keeps the first cash-out of every seat; later ones come from games ended twice.
+
+    Ending a game twice also settled it twice, so in those games the repeated debts (same sender,
+    receiver and amount) are deleted too, keeping the one furthest along (accepted, then sent).
+    """
+    Statistics = apps.get_model('api', 'Statistics')
+    Debts = apps.get_model('api', 'Debts')
+    duplicated = (
+        Statistics.objects.values('player_to_game')
+        .annotate(rows=Count('id'), first=Min('id'))
+        .filter(player_to_game__isnull=False, rows__gt=1)
+    )
+    games = set()
+    for row in duplicated:
+        games.add(Statistics.objects.filter(id=row['first']).values_list('player_to_game__game', flat=True).get())
+        Statistics.objects.filter(player_to_game=row['player_to_game']).exclude(id=row['first']).delete()
+
+    kept = set()
+    repeated = []
+    debts = Debts.objects.filter(game__in=games).order_by('-is_accepted', '-is_send', 'id')
+    for debt_id, *key in debts.values_list('id', 'game', 'sender', 'reciver', 'amount'):
+        if tuple(key) in kept:
+            repeated.append(debt_id)
+        kept.add(tuple(key))
+    Debts.objects.filter(id__in=repeated).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_game_code_sequence'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_results, migrations.RunPython.noop),
+        # The constraint's index replaces stats_player_time_idx, so it is created first.
+        migrations.AddConstraint(
+            model_name='statistics',
+            constraint=models.UniqueConstraint(fields=('player_to_game',), name='stats_unique_player_to_game'),
+        ),
+        migrations.RemoveIndex(
+            model_name='statistics',
+            name='stats_player_time_idx',
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.1 on 2026-10-19 17:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_statistics_unique_player_to_game'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='game',
+            name='actions_compacted',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.CreateModel(
+            name='ActionSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('actions', models.PositiveIntegerField()),
+                ('multiplier', models.IntegerField()),
+                ('first_action_time', models.DateTimeField()),
+                ('last_action_time', models.DateTimeField()),
+                ('player_to_game', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='action_summary', to='api.playertogame')),
+            ],
+        ),
+    ]
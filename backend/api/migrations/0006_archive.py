@@ -0,0 +1,82 @@
+# Generated by Django 5.1.1 on 2026-10-19 17:24
+
+import datetime
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_action_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedGame',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('code', models.CharField(max_length=8, unique=True)),
+                ('start_time', models.DateTimeField()),
+                ('buy_in', models.IntegerField()),
+                ('end_time', models.DateTimeField(blank=True, null=True)),
+                ('game_time', models.DurationField(blank=True, null=True)),
+                ('blind', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('how_many_plo', models.IntegerField()),
+                ('how_often_stand_up', models.IntegerField()),
+                ('is_poker_jackpot', models.BooleanField()),
+                ('is_win_27', models.BooleanField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('creator', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_games', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedTotals',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='archived_totals', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('games_played', models.PositiveIntegerField(default=0)),
+                ('results', models.PositiveIntegerField(default=0)),
+                ('total_buy_in', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('total_cash_out', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('highest_win', models.DecimalField(decimal_places=2, max_digits=10, null=True)),
+                ('play_time', models.DurationField(default=datetime.timedelta)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedDebt',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('is_send', models.BooleanField()),
+                ('send_date', models.DateTimeField(blank=True, null=True)),
+                ('is_accepted', models.BooleanField()),
+                ('accept_date', models.DateTimeField(blank=True, null=True)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='debts', to='api.archivedgame')),
+                ('reciver', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_received_debts', to=settings.AUTH_USER_MODEL)),
+                ('sender', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_sent_debts', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ArchivedResult',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seat_id', models.BigIntegerField(unique=True)),
+                ('join_time', models.DateTimeField()),
+                ('statistics_id', models.BigIntegerField(null=True)),
+                ('buy_in', models.DecimalField(decimal_places=2, max_digits=10, null=True)),
+                ('cash_out', models.DecimalField(decimal_places=2, max_digits=10, null=True)),
+                ('cash_out_time', models.DateTimeField(null=True)),
+                ('actions', models.PositiveIntegerField(default=0)),
+                ('multiplier', models.IntegerField(default=0)),
+                ('first_action_time', models.DateTimeField(null=True)),
+                ('last_action_time', models.DateTimeField(null=True)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='results', to='api.archivedgame')),
+                ('player', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='archived_results', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['player', 'cash_out_time'], include=('buy_in', 'cash_out'), name='archived_player_time_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.1 on 2026-10-19 17:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GameSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=8, unique=True)),
+                ('document', models.JSONField()),
+                ('etag', models.CharField(max_length=64)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('game', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='summary', to='api.game')),
+            ],
+        ),
+    ]
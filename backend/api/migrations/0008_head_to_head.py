@@ -0,0 +1,30 @@
+# Generated by Django 5.1.1 on 2026-10-19 17:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_game_summary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HeadToHead',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('games', models.PositiveIntegerField(default=0)),
+                ('net', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('opponent_net', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('opponent', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='head_to_head', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'opponent'), name='head_to_head_unique_pair')],
+            },
+        ),
+    ]
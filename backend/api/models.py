@@ -1,27 +1,59 @@
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
 from django.db import models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.contrib.auth.models import User
-import random
-import string
+from api.codes import allocator
 
 
 def generate_unique_code():
-    """Generates a unique 8-character game code consisting of uppercase letters."""
-    length = 8
+    """Allocates a unique 8-character game code consisting of uppercase letters (see `api.codes`)."""
+    return allocator.allocate()
 
-    while True:
-        code = ''.join(random.choices(string.ascii_uppercase, k=length))
-        if not Game.objects.filter(code=code).exists():
-            break
 
-    return code
+_default_creator_ids = {}
 
 
 def get_default_creator():
-    """Returns the default creator user (if available) to assign as the game creator."""
+    """Returns the id of the default game creator, `settings.GAME_DEFAULT_CREATOR_USERNAME` (if available).
+
+    Only evaluated for games created without a creator. The id, or its absence, is looked up once
+    per process and forgotten when that user is renamed or deleted, or a user takes the username.
+    """
+    username = settings.GAME_DEFAULT_CREATOR_USERNAME
+    if not username:
+        return None
+    if username not in _default_creator_ids:
+        _default_creator_ids[username] = User.objects.filter(username=username).values_list('id', flat=True).first()
+    return _default_creator_ids[username]
+
+
+@receiver([post_save, post_delete], sender=User, dispatch_uid='api.forget_default_creator')
+def forget_default_creator(instance, update_fields=None, **kwargs):
+    # Logins only save `last_login`.
+    if update_fields is not None and 'username' not in update_fields:
+        return
+    if instance.username in _default_creator_ids or instance.pk in _default_creator_ids.values():
+        _default_creator_ids.clear()
+
+
+@contextmanager
+def explicit_auto_now_add(*models):
+    """Lets inserts keep the timestamps set on the instances instead of `auto_now_add` ones.
+
+    It changes the fields for the whole process, so it is meant for management commands only.
+    """
+    fields = [field for model in models for field in model._meta.concrete_fields if getattr(field, 'auto_now_add', False)]
+    for field in fields:
+        field.auto_now_add = False
     try:
-        return User.objects.get(username='karski').id
-    except User.DoesNotExist:
-        return None  
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
 
 
 class Game(models.Model):
@@ -40,6 +72,7 @@ class Game(models.Model):
     - `is_poker_jackpot`: Flag for poker jackpot eligibility.
     - `is_win_27`: Flag for a special "Win 27" condition.
     - `creator`: Reference to the user who created the game.
+    - `actions_compacted`: Flag set once the game's actions are folded into `ActionSummary` rows.
     """
 
     code = models.CharField(max_length=8, unique=True, default=generate_unique_code)
@@ -54,6 +87,7 @@ class Game(models.Model):
     is_poker_jackpot = models.BooleanField(default=True)
     is_win_27 = models.BooleanField(default=True)
     creator = models.ForeignKey(User, on_delete=models.CASCADE, default=get_default_creator, related_name='created_games')
+    actions_compacted = models.BooleanField(default=False)
 
     def __str__(self):
         return f"Game {self.code}"
@@ -90,14 +124,42 @@ class Action(models.Model):
     - `multiplier`: Number of rebuys or action multiplier.
     """
 
-    player_to_game = models.ForeignKey(PlayerToGame, on_delete=models.CASCADE, related_name='game_player')
+    player_to_game = models.ForeignKey(PlayerToGame, on_delete=models.CASCADE, related_name='game_player', db_index=False)
     action_time = models.DateTimeField(auto_now_add=True)
     multiplier = models.IntegerField(default=1)
 
+    class Meta:
+        indexes = [
+            # Last action of a player and the sum of a player's rebuys, without reading the table;
+            # also the index of the `player_to_game` foreign key.
+            models.Index(fields=['player_to_game', 'action_time'], include=['multiplier'], name='action_player_time_idx'),
+        ]
+
     def __str__(self):
         return f"{self.player_to_game.player.username} rebuys in Game {self.player_to_game.game.code}"
 
 
+class ActionSummary(models.Model):
+    """Totals of a player's actions in an ended game, replacing its `Action` rows (see `api.compaction`).
+
+    Attributes:
+    - `player_to_game`: Reference to the PlayerToGame.
+    - `actions`: Number of folded actions.
+    - `multiplier`: Sum of their multipliers (total number of buy-ins).
+    - `first_action_time`: Time of the first action.
+    - `last_action_time`: Time of the last action.
+    """
+
+    player_to_game = models.OneToOneField(PlayerToGame, on_delete=models.CASCADE, related_name='action_summary')
+    actions = models.PositiveIntegerField()
+    multiplier = models.IntegerField()
+    first_action_time = models.DateTimeField()
+    last_action_time = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.player_to_game.player.username} bought in {self.multiplier} times in Game {self.player_to_game.game.code}"
+
+
 class Statistics(models.Model):
     """Stores statistical data related to a player's performance in a game.
 
@@ -108,11 +170,18 @@ class Statistics(models.Model):
     - `cash_out_time`: Timestamp when the player exited the game.
     """
 
-    player_to_game = models.ForeignKey(PlayerToGame, on_delete=models.CASCADE, related_name='statistics', null=True)
+    player_to_game = models.ForeignKey(PlayerToGame, on_delete=models.CASCADE, related_name='statistics', null=True, db_index=False)
     buy_in = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     cash_out = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     cash_out_time = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            # A player cashes out of a game once, which backs the end-game lock against double settlement.
+            # Covers a player's results (stats and plot data) and serves as the foreign key index.
+            models.UniqueConstraint(fields=['player_to_game'], name='stats_unique_player_to_game'),
+        ]
+
     def __str__(self):
         return f"{self.player_to_game.player.username} cashed out {self.cash_out} PLN"
 
@@ -140,10 +209,218 @@ class Debts(models.Model):
     is_accepted = models.BooleanField(default=False)
     accept_date = models.DateTimeField(null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Open debts only: settled ones, the vast majority, are never listed again.
+            models.Index(fields=['sender'], condition=models.Q(is_send=False, is_accepted=False), name='debts_open_outgoing_idx'),
+            models.Index(fields=['reciver'], condition=models.Q(is_send=True, is_accepted=False), name='debts_open_incoming_idx'),
+        ]
+
     def __str__(self):
         return f"{self.sender.username} owes {self.reciver.username} {self.amount} PLN for Game {self.game.code}"
 
 
+class GameSummary(models.Model):
+    """Summary document of an ended game, written once when it ends and served as is (see `api.summaries`).
+
+    Attributes:
+    - `code`: Code of the game; the summary outlives the game when it is archived.
+    - `game`: Reference to the game, unset while it is archived.
+    - `document`: The summary: settings, table data, per-player results and transfers.
+    - `etag`: Hash of the document, from which the ETags of its responses are derived.
+    - `created_at`: Timestamp when the summary was written.
+    """
+
+    code = models.CharField(max_length=8, unique=True)
+    game = models.OneToOneField(Game, on_delete=models.SET_NULL, null=True, blank=True, related_name='summary')
+    document = models.JSONField()
+    etag = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Summary of Game {self.code}"
+
+
+class HeadToHead(models.Model):
+    """Results of a user in the games played together with another user (see `api.head_to_head`).
+
+    Every pair of players has a row in each direction.
+
+    Attributes:
+    - `user`: The user.
+    - `opponent`: The other player.
+    - `games`: Number of ended games both played in.
+    - `net`: The user's total result in those games.
+    - `opponent_net`: The opponent's total result in those games.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='head_to_head', db_index=False)
+    opponent = models.ForeignKey(User, on_delete=models.CASCADE, related_name='+', db_index=False)
+    games = models.PositiveIntegerField(default=0)
+    net = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    opponent_net = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            # Also the index of a user's rows.
+            models.UniqueConstraint(fields=['user', 'opponent'], name='head_to_head_unique_pair'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} against {self.opponent.username} in {self.games} games"
+
+
+class PlayerRating(models.Model):
+    """Current skill rating of a user (see `api.ratings`).
+
+    Attributes:
+    - `user`: The user.
+    - `rating`: The rating, starting at `api.ratings.INITIAL_RATING`.
+    - `games`: Number of rated games.
+    """
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='rating')
+    rating = models.FloatField()
+    games = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-rating'], name='player_rating_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username}: {self.rating:.0f}"
+
+
+class RatingChange(models.Model):
+    """Change of a user's rating in one game, the history behind `PlayerRating`.
+
+    Attributes:
+    - `user`: The user.
+    - `game_id`: Id of the game; not a foreign key, so the history outlives archived games.
+    - `time`: End time of the game.
+    - `rating`: The user's rating after the game.
+    - `change`: How much the game changed it.
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='rating_changes', db_index=False)
+    game_id = models.BigIntegerField()
+    time = models.DateTimeField()
+    rating = models.FloatField()
+    change = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'time'], include=['rating'], name='rating_change_user_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} {self.change:+.1f} in game {self.game_id}"
+
+
+class ArchivedGame(models.Model):
+    """An ended game moved out of `Game` by `api.archive`, keeping its id, code and settings.
+
+    Attributes:
+    - `id`: Id of the game in `Game`, reused when it is restored.
+    - `archived_at`: Timestamp when the game was archived.
+    The other fields are those of `Game`.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    code = models.CharField(max_length=8, unique=True)
+    start_time = models.DateTimeField()
+    buy_in = models.IntegerField()
+    end_time = models.DateTimeField(null=True, blank=True)
+    game_time = models.DurationField(null=True, blank=True)
+    blind = models.DecimalField(max_digits=10, decimal_places=2)
+    how_many_plo = models.IntegerField()
+    how_often_stand_up = models.IntegerField()
+    is_poker_jackpot = models.BooleanField()
+    is_win_27 = models.BooleanField()
+    creator = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_games')
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Archived Game {self.code}"
+
+
+class ArchivedResult(models.Model):
+    """A seat of an archived game: its `PlayerToGame`, `Statistics` and `ActionSummary` rows in one.
+
+    Attributes:
+    - `game`: Reference to the archived game.
+    - `seat_id`: Id of the `PlayerToGame` row.
+    - `player`: The user who played.
+    - `join_time`: Timestamp when the player joined.
+    - `statistics_id`, `buy_in`, `cash_out`, `cash_out_time`: The `Statistics` row, if the player cashed out.
+    - `actions`, `multiplier`, `first_action_time`, `last_action_time`: The player's `ActionSummary`.
+    """
+
+    game = models.ForeignKey(ArchivedGame, on_delete=models.CASCADE, related_name='results')
+    seat_id = models.BigIntegerField(unique=True)
+    player = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_results', db_index=False)
+    join_time = models.DateTimeField()
+    statistics_id = models.BigIntegerField(null=True)
+    buy_in = models.DecimalField(max_digits=10, decimal_places=2, null=True)
+    cash_out = models.DecimalField(max_digits=10, decimal_places=2, null=True)
+    cash_out_time = models.DateTimeField(null=True)
+    actions = models.PositiveIntegerField(default=0)
+    multiplier = models.IntegerField(default=0)
+    first_action_time = models.DateTimeField(null=True)
+    last_action_time = models.DateTimeField(null=True)
+
+    class Meta:
+        indexes = [
+            # A player's archived results in cash-out order (plot data); also the foreign key index.
+            models.Index(fields=['player', 'cash_out_time'], include=['buy_in', 'cash_out'], name='archived_player_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.player.username} in Archived Game {self.game.code}"
+
+
+class ArchivedDebt(models.Model):
+    """A settled debt of an archived game, keeping its id; the fields are those of `Debts`."""
+
+    id = models.BigIntegerField(primary_key=True)
+    game = models.ForeignKey(ArchivedGame, on_delete=models.CASCADE, related_name='debts')
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    sender = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_sent_debts')
+    reciver = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_received_debts')
+    is_send = models.BooleanField()
+    send_date = models.DateTimeField(null=True, blank=True)
+    is_accepted = models.BooleanField()
+    accept_date = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.sender.username} paid {self.reciver.username} {self.amount} PLN for Archived Game {self.game.code}"
+
+
+class ArchivedTotals(models.Model):
+    """Precomputed totals of a user's archived results, added to the live ones by the statistics views.
+
+    Attributes:
+    - `user`: The user.
+    - `games_played`: Number of archived seats.
+    - `results`: Number of archived cash-outs.
+    - `total_buy_in`, `total_cash_out`: Sums over the archived cash-outs.
+    - `highest_win`: Best archived result, if any.
+    - `play_time`: Total duration of the archived games played.
+    """
+
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='archived_totals')
+    games_played = models.PositiveIntegerField(default=0)
+    results = models.PositiveIntegerField(default=0)
+    total_buy_in = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    total_cash_out = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    highest_win = models.DecimalField(max_digits=10, decimal_places=2, null=True)
+    play_time = models.DurationField(default=timedelta)
+
+    def __str__(self):
+        return f"Archived totals of {self.user.username}"
+
+
 class UserProfile(models.Model):
     """Stores additional user information, including phone numbers.
 
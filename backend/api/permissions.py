@@ -0,0 +1,134 @@
+"""Resolution of the game a request is about, and permissions based on it.
+
+`GameMixin` resolves the game of the URL (`game_code`) and whether the user plays in it with a
+single query, memoizes both on the request and keeps them in the cache for
+`settings.GAME_ACCESS_CACHE_TTL` seconds, so players polling a game do not query it again.
+Saving or deleting the game or one of its seats drops its cache entry, but only in the process
+that did it, so other processes may read a game that ended or a seat that is gone until the entry
+expires. Only reads (safe methods) are served from the cache; requests that change something read
+the game and the membership from the database.
+"""
+
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.exceptions import NotFound
+from rest_framework.permissions import SAFE_METHODS, BasePermission
+
+from api.metrics import record_cache
+from api.models import Game, PlayerToGame
+
+
+def game_cache_key(code):
+    return f'game-access:{code}'
+
+
+@receiver([post_save, post_delete], sender=Game, dispatch_uid='api.forget_game')
+def forget_game(instance, **kwargs):
+    key = game_cache_key(instance.code)
+    cache.delete(key)
+    # Again once committed: a request may have cached the old row meanwhile (ending a game locks it for a while).
+    transaction.on_commit(partial(cache.delete, key))
+
+
+@receiver([post_save, post_delete], sender=PlayerToGame, dispatch_uid='api.forget_membership')
+def forget_membership(instance, origin=None, **kwargs):
+    if PlayerToGame.game.is_cached(instance):
+        code = instance.game.code
+    elif origin is not None and origin is not instance:
+        # Deleted along with its game (which forgets itself) or its player (who cannot log in anymore).
+        return
+    else:
+        code = Game.objects.filter(pk=instance.game_id).values_list('code', flat=True).first()
+    if code is not None:
+        cache.delete(game_cache_key(code))
+
+
+def resolve_game_access(request, code):
+    """Returns `(game, is_member)` for the game with `code`, or `(None, False)` if there is none.
+
+    The cache holds, per game code, the game and the membership of every user who asked recently.
+    """
+    memo = request.__dict__.setdefault('_game_access', {})
+    if code in memo:
+        return memo[code]
+
+    user_id = request.user.pk
+    key = game_cache_key(code)
+    if request.method in SAFE_METHODS:
+        game, members = cache.get(key) or (None, {})
+        hit = user_id in members
+        record_cache('game_access', hit)
+    else:
+        game, members, hit = None, {}, False
+
+    if not hit:
+        fresh = Game.objects.annotate(
+            is_member=Exists(PlayerToGame.objects.filter(game=OuterRef('pk'), player_id=user_id))
+        ).filter(code=code).first()
+        if fresh is None:
+            memo[code] = (None, False)
+            return memo[code]
+        if game is None or (game.pk, game.start_time) != (fresh.pk, fresh.start_time):
+            members = {}
+        game = fresh
+        members[user_id] = game.__dict__.pop('is_member')
+        cache.set(key, (game, members), settings.GAME_ACCESS_CACHE_TTL)
+
+    memo[code] = (game, members[user_id])
+    return memo[code]
+
+
+class GameMixin:
+    """Resolves the game of the `game_code` URL argument before the handler runs.
+
+    The handler reads `self.game` and `self.is_game_member`. A missing game raises
+    `game_not_found_exception(game_not_found_message)`.
+    """
+
+    game_lookup_kwarg = 'game_code'
+    game_not_found_exception = NotFound
+    game_not_found_message = "Game not found."
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.game_lookup_kwarg in kwargs:
+            self.game, self.is_game_member = self.get_game_access(kwargs[self.game_lookup_kwarg])
+
+    def get_game_access(self, code):
+        game, is_member = resolve_game_access(self.request, code)
+        if game is None:
+            raise self.game_not_found_exception(self.game_not_found_message)
+        return game, is_member
+
+
+class IsGameMember(BasePermission):
+    """Allows players of the game of the URL; the view's `game_access_denied_message` is returned otherwise."""
+
+    message = "You do not have access to this game."
+
+    def has_permission(self, request, view):
+        _, is_member = view.get_game_access(view.kwargs[view.game_lookup_kwarg])
+        self.message = getattr(view, 'game_access_denied_message', self.message)
+        return is_member
+
+
+class IsGameAdmin(BasePermission):
+    """Allows superusers, the administrators of every game, once the game of the URL is known to exist.
+
+    The view's `game_admin_message` is returned to other users.
+    """
+
+    message = "Only superusers can manage this game."
+
+    def has_permission(self, request, view):
+        self.message = getattr(view, 'game_admin_message', self.message)
+        if not request.user.is_superuser:
+            return False
+        view.get_game_access(view.kwargs[view.game_lookup_kwarg])
+        return True
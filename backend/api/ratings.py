@@ -0,0 +1,158 @@
+"""Skill ratings of players, updated at the end of every game.
+
+Raw earnings mostly measure the stakes and the number of games played. A rating is Elo adapted to
+multi-player cash games: each player is rated against the average rating of the rest of the table,
+and their result, in stacks of the game's `buy_in`, is mapped to a score between 0 and 1 (0.5 for
+breaking even). The rating moves by `K_FACTOR` times the difference between that score and the one
+the ratings expected, so a game costs O(players) regardless of the history.
+
+`EndGameView` rates the ended game (`update_ratings`), recording every change in `RatingChange`.
+The `rebuild_ratings` command replays all ended games, live and archived, in the order they ended
+(`rebuild`), e.g. after changing the formula.
+"""
+
+import math
+from itertools import groupby
+
+from django.db import transaction
+from django.db.models import Count, ExpressionWrapper, F, IntegerField, Window
+from django.db.models.functions import Greatest, RowNumber
+from rest_framework import serializers
+
+from api.models import ArchivedResult, PlayerRating, PlayerToGame, RatingChange
+
+
+INITIAL_RATING = 1500.0
+K_FACTOR = 32.0
+# Rating difference at which the stronger player is expected to score 10 times as much.
+SCALE = 400.0
+# Points of the rating history returned by the statistics and leaderboard views.
+HISTORY_POINTS = 100
+
+_time = serializers.DateTimeField().to_representation
+
+
+def score(result, buy_in):
+    """Maps a result to a score between 0 and 1: 0.5 for breaking even, about 0.73 for winning a stack."""
+    return 1 / (1 + math.exp(-float(result) / buy_in))
+
+
+def rate_game(ratings, results, buy_in):
+    """Returns the ratings of a game's players after it.
+
+    `ratings` and `results` map the players' ids to their ratings before the game and their results.
+    """
+    total = sum(ratings.values())
+    others = len(ratings) - 1
+    new_ratings = {}
+    for player, rating in ratings.items():
+        field = (total - rating) / others
+        expected = 1 / (1 + 10 ** ((field - rating) / SCALE))
+        new_ratings[player] = rating + K_FACTOR * (score(results[player], buy_in) - expected)
+    return new_ratings
+
+
+def update_ratings(game, results):
+    """Rates an ended game; `results` maps the ids of its players to their results.
+
+    Meant to run inside the transaction ending the game, after `end_time` is set. Games with a
+    single player or without a buy-in are not rated.
+    """
+    user_ids = sorted(results)
+    if len(user_ids) < 2 or not game.buy_in:
+        return
+
+    PlayerRating.objects.bulk_create(
+        [PlayerRating(user_id=user_id, rating=INITIAL_RATING) for user_id in user_ids],
+        ignore_conflicts=True,
+    )
+    ratings = list(PlayerRating.objects.select_for_update().filter(user__in=user_ids).order_by('user'))
+    new_ratings = rate_game({rating.user_id: rating.rating for rating in ratings}, results, game.buy_in)
+
+    changes = []
+    for rating in ratings:
+        changes.append(RatingChange(
+            user_id=rating.user_id,
+            game_id=game.pk,
+            time=game.end_time,
+            rating=new_ratings[rating.user_id],
+            change=new_ratings[rating.user_id] - rating.rating,
+        ))
+        rating.rating = new_ratings[rating.user_id]
+        rating.games += 1
+    PlayerRating.objects.bulk_update(ratings, ['rating', 'games'])
+    RatingChange.objects.bulk_create(changes)
+
+
+def _results():
+    """`(game id, end time, buy-in, player id, result)` of every settled seat, live and archived, in the order the games ended."""
+    columns = ('game_id', 'game_end', 'game_buy_in', 'player_id', 'result')
+    live = PlayerToGame.objects.filter(game__is_end=True, statistics__isnull=False).annotate(
+        game_end=F('game__end_time'),
+        game_buy_in=F('game__buy_in'),
+        result=F('statistics__cash_out') - F('statistics__buy_in'),
+    )
+    # Archived games keep the ids of the games they were.
+    archived = ArchivedResult.objects.filter(cash_out__isnull=False).annotate(
+        game_end=F('game__end_time'),
+        game_buy_in=F('game__buy_in'),
+        result=F('cash_out') - F('buy_in'),
+    )
+    return live.values_list(*columns).union(archived.values_list(*columns), all=True).order_by('game_end', 'game_id')
+
+
+def rebuild():
+    """Replays every ended game into new ratings and rating histories; returns the number of rated games."""
+    ratings = {}
+    games = {}
+    changes = []
+    for (game_id, end_time, buy_in), seats in groupby(_results(), key=lambda row: row[:3]):
+        results = {player: result for *_, player, result in seats}
+        if len(results) < 2 or not buy_in:
+            continue
+        before = {player: ratings.get(player, INITIAL_RATING) for player in results}
+        ratings.update(rate_game(before, results, buy_in))
+        for player in results:
+            games[player] = games.get(player, 0) + 1
+            changes.append(RatingChange(
+                user_id=player, game_id=game_id, time=end_time, rating=ratings[player], change=ratings[player] - before[player],
+            ))
+
+    with transaction.atomic():
+        RatingChange.objects.all().delete()
+        PlayerRating.objects.all().delete()
+        PlayerRating.objects.bulk_create(
+            [PlayerRating(user_id=player, rating=rating, games=games[player]) for player, rating in ratings.items()],
+            batch_size=1000,
+        )
+        RatingChange.objects.bulk_create(changes, batch_size=1000)
+    return len({change.game_id for change in changes})
+
+
+def rating_histories(user_ids, max_points=HISTORY_POINTS):
+    """Returns the rating histories of the given users as `{user id: [[time, rating], ...]}`, oldest first.
+
+    A history is cut down to at most `max_points` (at least 2) evenly spaced points, always
+    including the first and the latest, in the database: only the points returned are read.
+    """
+    order = [F('time').asc(), F('id').asc()]
+    position = Window(RowNumber(), partition_by=[F('user')], order_by=order) - 1
+    spacing = Greatest(Window(Count('id'), partition_by=[F('user')]) - 1, 1)
+    steps = max_points - 1
+    # Position × steps / spacing, rounded down, grows by at most 1 per point once there are more
+    # points than `max_points`; a point is kept where it reaches a new integer. `+ spacing` keeps
+    # the dividends of the first point non-negative.
+    changes = (
+        RatingChange.objects.filter(user__in=user_ids)
+        .annotate(
+            bucket=ExpressionWrapper((position * steps + spacing) / spacing, output_field=IntegerField()),
+            previous_bucket=ExpressionWrapper(((position - 1) * steps + spacing) / spacing, output_field=IntegerField()),
+        )
+        .filter(bucket__gt=F('previous_bucket'))
+        .order_by('user', 'time', 'id')
+        .values_list('user', 'time', 'rating')
+    )
+    return {
+        user_id: [[_time(time), round(rating, 1)] for _, time, rating in rows]
+        for user_id, rows in groupby(changes, key=lambda row: row[0])
+    }
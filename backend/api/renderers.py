@@ -0,0 +1,161 @@
+"""Renderers and parsers for the API.
+
+`ORJSONRenderer` and `ORJSONParser` are orjson-backed replacements of DRF's JSON classes. The
+output matches `rest_framework.renderers.JSONRenderer` with the default settings for all valid JSON:
+compact, UTF-8, `Decimal` as a number, ISO 8601 dates and datetimes with `Z` for UTC and
+U+2028/U+2029 escaped. Types orjson does not know about (`Decimal`, `timedelta`, querysets...) go
+through DRF's own encoder. Unlike DRF, which raises `ValueError` on NaN and infinite floats, orjson
+renders them as `null`; checking every float would cost a pass over the data on each response.
+
+`ColumnarJSONRenderer` and `MsgPackRenderer` are compact representations of time-series responses,
+see `to_columnar`.
+"""
+
+import sys
+from array import array
+from datetime import date, datetime
+from decimal import Decimal
+
+import msgpack
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class ORJSONRenderer(JSONRenderer):
+    """Renders JSON with orjson; indented output (browsable API, `; indent=` media type) falls back to DRF."""
+
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    _encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self._encoder.default, option=self.options)
+        except orjson.JSONEncodeError:
+            # Integers beyond 64 bits and other values orjson refuses.
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class ORJSONParser(JSONParser):
+    """Parses JSON request bodies with orjson."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+EPOCH = date(1970, 1, 1)
+
+
+def epoch_day(value):
+    """Days since 1970-01-01 of a date or datetime; `new Date(day * 86400000)` in the browser."""
+    if isinstance(value, datetime):
+        value = value.date()
+    return (value - EPOCH).days
+
+
+def cents(value):
+    """An amount of money as an integer number of grosze (cents)."""
+    return int((Decimal(value) * 100).to_integral_value())
+
+
+COLUMN_TYPES = {
+    'epoch_day': epoch_day,
+    'cents': cents,
+}
+
+
+def to_columnar(data, columns):
+    """Converts the series in `data` to compact columns.
+
+    `columns` maps each series key of `data` to a type of `COLUMN_TYPES`; other keys are copied as they are.
+    The result holds the number of rows, the type of every column and the converted columns.
+    """
+    result = {key: value for key, value in data.items() if key not in columns}
+    result['length'] = len(data[next(iter(columns))]) if columns else 0
+    result['types'] = dict(columns)
+    result['columns'] = {
+        key: [COLUMN_TYPES[kind](value) for value in data[key]]
+        for key, kind in columns.items()
+    }
+    return result
+
+
+INT32_RANGE = (-2 ** 31, 2 ** 31 - 1)
+
+
+def pack(values):
+    """Packs integers into a little-endian typed array buffer; returns the bytes and their dtype.
+
+    Values go into an `int32` array (Int32Array in the browser) when they fit, else into a `float64`
+    one (Float64Array, exact up to 2**53).
+    """
+    fits = all(INT32_RANGE[0] <= value <= INT32_RANGE[1] for value in values)
+    packed = array('i' if fits else 'd', values)
+    if sys.byteorder != 'little':
+        packed.byteswap()
+    return packed.tobytes(), 'int32' if fits else 'float64'
+
+
+class SeriesRendererMixin:
+    """Renders the series of successful responses of views declaring `series_columns` in columnar form."""
+
+    def columnar(self, data, renderer_context):
+        view = (renderer_context or {}).get('view')
+        response = (renderer_context or {}).get('response')
+        columns = getattr(view, 'series_columns', None)
+        if not columns or not isinstance(data, dict) or (response is not None and response.status_code >= 400):
+            return None
+        return to_columnar(data, columns)
+
+
+class ColumnarJSONRenderer(SeriesRendererMixin, ORJSONRenderer):
+    """Series as columns of integers (epoch days, cents); selected with `?format=columnar`."""
+
+    media_type = 'application/vnd.cashboard.columnar+json'
+    format = 'columnar'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        columnar = self.columnar(data, renderer_context)
+        return super().render(data if columnar is None else columnar, accepted_media_type, renderer_context)
+
+
+class MsgPackRenderer(SeriesRendererMixin, BaseRenderer):
+    """MessagePack; series are sent as packed little-endian arrays, `dtypes` gives their element type.
+
+    Selected with `Accept: application/msgpack` or `?format=msgpack`.
+    """
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    _encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        columnar = self.columnar(data, renderer_context)
+        if columnar is not None:
+            packed = {key: pack(values) for key, values in columnar['columns'].items()}
+            columnar['columns'] = {key: buffer for key, (buffer, _) in packed.items()}
+            columnar['dtypes'] = {key: dtype for key, (_, dtype) in packed.items()}
+            data = columnar
+        return msgpack.packb(data, default=self._encoder.default, datetime=False)
@@ -1,9 +1,9 @@
 from django.contrib.auth.models import User
-from .models import Game, PlayerToGame, UserProfile, Action
+from .models import Game, PlayerToGame, UserProfile
 from rest_framework import serializers
 from django.contrib.auth.password_validation import validate_password
-from django.db.models import Sum, F
-from django.db.models.functions import Coalesce
+from django.db.models import F
+from api.compaction import rebuys
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -97,11 +97,15 @@ class PlayerToGameSerializer(serializers.ModelSerializer):
         fields = ['name', 'stack']
 
     def get_stack(self, obj):
-        """Calculates the total stack value based on actions within the game."""
-        actions = Action.objects.filter(player_to_game=obj)
-        return actions.aggregate(
-            total_stack=Coalesce(Sum(F('multiplier') * F('player_to_game__game__buy_in')), 0)
-        )['total_stack']
+        """Calculates the total stack value based on actions within the game.
+
+        Uses the `stack` annotation when the queryset provides one, avoiding a query per player.
+        """
+        if hasattr(obj, 'stack'):
+            return obj.stack
+        return PlayerToGame.objects.filter(pk=obj.pk).annotate(
+            total_stack=rebuys() * F('game__buy_in')
+        ).values_list('total_stack', flat=True).get()
 
 
 class PlayerActionSerializer(serializers.Serializer):
@@ -150,6 +154,10 @@ class UserStatsSerializer(serializers.Serializer):
     """Serializer for user statistics and performance analysis.
     
     - Provides key performance indicators such as earnings, win rate, and hourly rate.
+    - `win_rate_interval`, `hourly_rate_interval`: 95% bootstrap confidence intervals `[low, high]`
+      of the rates (see `api.analytics`), `None` with fewer than two games.
+    - `rating`: Skill rating (see `api.ratings`), `None` before the first rated game.
+    - `rating_history`: `[time, rating]` after each rated game, oldest first.
     """
 
     earn = serializers.DecimalField(max_digits=10, decimal_places=2)
@@ -160,3 +168,52 @@ class UserStatsSerializer(serializers.Serializer):
     average_stake = serializers.DecimalField(max_digits=10, decimal_places=2)
     win_rate = serializers.DecimalField(max_digits=10, decimal_places=2)
     total_buyin = serializers.DecimalField(max_digits=10, decimal_places=2)
+    win_rate_interval = serializers.ListField(child=serializers.DecimalField(max_digits=10, decimal_places=2), allow_null=True)
+    hourly_rate_interval = serializers.ListField(child=serializers.DecimalField(max_digits=10, decimal_places=2), allow_null=True)
+    rating = serializers.FloatField(allow_null=True)
+    rating_history = serializers.ListField(child=serializers.ListField())
+
+
+class GameHistorySerializer(serializers.Serializer):
+    """Serializer for a game in the user's game history (see `api.history`).
+
+    - `duration`: Length of the game in hours.
+    - `result`: The user's profit or loss, `None` if they did not cash out.
+    """
+
+    code = serializers.CharField(source='game_code')
+    date = serializers.DateTimeField(source='game_start')
+    duration = serializers.SerializerMethodField()
+    buy_in = serializers.IntegerField(source='game_buy_in')
+    result = serializers.DecimalField(max_digits=10, decimal_places=2, allow_null=True)
+    players = serializers.IntegerField()
+
+    def get_duration(self, obj):
+        duration = obj['game_duration']
+        return round(duration.total_seconds() / 3600, 2) if duration else None
+
+
+class HeadToHeadSerializer(serializers.Serializer):
+    """Serializer for the user's results against another player (see `api.head_to_head`).
+
+    - `net`: The user's total result in the games played together.
+    - `opponent_net`: The opponent's total result in those games.
+    """
+
+    opponent = serializers.CharField(source='opponent.username')
+    games = serializers.IntegerField()
+    net = serializers.DecimalField(max_digits=14, decimal_places=2)
+    opponent_net = serializers.DecimalField(max_digits=14, decimal_places=2)
+
+
+class LeaderboardSerializer(serializers.Serializer):
+    """Serializer for a player on the leaderboard (see `api.ratings`).
+
+    - `games`: Number of rated games.
+    - `history`: `[time, rating]` after each rated game, oldest first.
+    """
+
+    username = serializers.CharField(source='user.username')
+    rating = serializers.FloatField()
+    games = serializers.IntegerField()
+    history = serializers.ListField(child=serializers.ListField())
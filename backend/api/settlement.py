@@ -0,0 +1,26 @@
+def compute_transfers(balances):
+    """Returns the transfers that settle a game, as `(debtor, creditor, amount)` tuples.
+
+    `balances` is an iterable of `(player, balance)` pairs, where balance is `cash_out - buy_in`
+    and all balances sum to zero. Debtors pay creditors greedily, in the given order, so a game
+    with n players needs at most n - 1 transfers.
+    """
+    balances = list(balances)
+    debtors = [[player, -balance] for player, balance in balances if balance < 0]
+    creditors = [[player, balance] for player, balance in balances if balance > 0]
+    transfers = []
+    d = c = 0
+
+    while d < len(debtors) and c < len(creditors):
+        debtor, creditor = debtors[d], creditors[c]
+        amount = min(debtor[1], creditor[1])
+        debtor[1] -= amount
+        creditor[1] -= amount
+        transfers.append((debtor[0], creditor[0], amount))
+
+        if debtor[1] == 0:
+            d += 1
+        if creditor[1] == 0:
+            c += 1
+
+    return transfers
@@ -0,0 +1,168 @@
+"""Summary documents of ended games and their immutable responses.
+
+Once a game has ended, its players, stacks, results and transfers never change. `EndGameView`
+writes them once into a `GameSummary` document, and the read endpoints of ended games, the summary
+emails (`api.tasks.send_game_summary_email`) and the admin use that document instead of querying
+the game again. Games that ended before summaries existed get theirs on first read.
+
+Responses built from a summary carry a strong ETag derived from the document hash and
+`Cache-Control: private, immutable`, so browsers (and any cache in front of the API that honours
+`private`) keep them for good; a conditional request answers 304 without rendering anything.
+"""
+
+import hashlib
+import json
+from decimal import Decimal
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
+from rest_framework import serializers, status
+from rest_framework.response import Response
+
+from api.compaction import rebuys
+from api.middleware import encoded_etag
+from api.models import Debts, GameSummary, PlayerToGame
+from api.serializers import GameAdditionalDataSerializer, GameDataSerializer
+from api.timeline import game_timeline
+
+
+IMMUTABLE_CACHE_CONTROL = 'private, max-age=31536000, immutable'
+ENCODINGS = ('br', 'gzip')
+
+_datetime = serializers.DateTimeField().to_representation
+
+
+def _money(value):
+    return None if value is None else str(Decimal(value).quantize(Decimal('0.01')))
+
+
+def _result(buy_in, cash_out, duration):
+    if buy_in is None:
+        return {'buy_in': None, 'cash_out': None, 'profit': None, 'profit_per_hour': None}
+    profit = cash_out - buy_in
+    return {
+        'buy_in': _money(buy_in),
+        'cash_out': _money(cash_out),
+        'profit': _money(profit),
+        'profit_per_hour': _money(profit / duration if duration > 0 else 0),
+    }
+
+
+def build_summary(game, transfers=None):
+    """Builds the summary document of an ended game.
+
+    Besides the responses of the ended-game endpoints (`settings`, `table`, the players' stacks and
+    the rebuy `timeline`, taken before the actions are compacted), it holds what the summary emails
+    show: the duration in hours, the pot (sum of the cash-outs), the average cash-out, each
+    player's result and hourly result, and the transfers.
+
+    `transfers` are the settlement transactions of `EndGameView.settle_debts`; without them the
+    game's debts are read.
+    """
+    seats = list(
+        PlayerToGame.objects.filter(game=game)
+        .values('player_id', 'player__username', 'statistics__buy_in', 'statistics__cash_out')
+        .annotate(rebuys=rebuys())
+        .order_by('player__username')
+    )
+    if transfers is None:
+        transfers = [
+            {
+                'sender': debt.sender.username,
+                'receiver': debt.reciver.username,
+                'amount': debt.amount,
+                'phone': getattr(getattr(debt.reciver, 'userprofile', None), 'phone_number', None) or "Brak numeru",
+            }
+            for debt in Debts.objects.filter(game=game).select_related('sender', 'reciver__userprofile').order_by('id')
+        ]
+
+    money_on_table = sum(seat['rebuys'] for seat in seats) * game.buy_in
+    duration = Decimal(game.game_time.total_seconds()) / Decimal(3600) if game.game_time else Decimal(0)
+    results = [seat for seat in seats if seat['statistics__buy_in'] is not None]
+    total_pot = sum(seat['statistics__cash_out'] for seat in results)
+
+    return {
+        'code': game.code,
+        'date': str(game.start_time.date()),
+        'start_time': _datetime(game.start_time),
+        'end_time': _datetime(game.end_time) if game.end_time else None,
+        'duration': _money(duration),
+        'total_pot': _money(total_pot),
+        'avg_stack': _money(total_pot / len(results) if results else 0),
+        'settings': GameAdditionalDataSerializer(game).data,
+        'table': GameDataSerializer({
+            'blinds': game.blind,
+            'game_start_time': game.start_time,
+            'money_on_table': money_on_table,
+            'number_of_players': len(seats),
+            'avg_stack': money_on_table / len(seats) if seats else 0,
+        }).data,
+        'players': [
+            {
+                'id': seat['player_id'],
+                'username': seat['player__username'],
+                'stack': seat['rebuys'] * game.buy_in,
+                **_result(seat['statistics__buy_in'], seat['statistics__cash_out'], duration),
+            }
+            for seat in seats
+        ],
+        'timeline': game_timeline(game),
+        'transfers': [
+            {
+                'sender': transfer['sender'],
+                'receiver': transfer['receiver'],
+                'amount': _money(str(transfer['amount'])),
+                'phone': transfer['phone'],
+            }
+            for transfer in transfers
+        ],
+    }
+
+
+def save_summary(game, transfers=None):
+    """Writes the summary of an ended game; see `build_summary`."""
+    document = json.loads(json.dumps(build_summary(game, transfers), cls=DjangoJSONEncoder))
+    etag = hashlib.sha256(json.dumps(document, sort_keys=True).encode()).hexdigest()
+    return GameSummary.objects.create(code=game.code, game=game, document=document, etag=etag)
+
+
+def create_summary(game):
+    """Writes the summary of an ended game that has none, or returns the one a concurrent request wrote."""
+    try:
+        with transaction.atomic():
+            return save_summary(game)
+    except IntegrityError:
+        return GameSummary.objects.get(code=game.code)
+
+
+def get_summary(game):
+    """Returns the summary of an ended game, writing it first if the game ended without one."""
+    return GameSummary.objects.filter(code=game.code).first() or create_summary(game)
+
+
+aget_summary = sync_to_async(get_summary)
+
+
+def immutable_response(request, summary, data, *variant):
+    """Responds with `data`, a part of `summary`, as an immutable representation.
+
+    `variant` distinguishes the responses built from the same summary (e.g. per user); the ETag
+    also covers the negotiated media type. Responses vary on `Authorization`, so a browser shared
+    by several accounts never serves one account's copy, checked for access or not, to another.
+    """
+    key = ':'.join([summary.etag, request.accepted_media_type, *map(str, variant)])
+    etag = f'"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+    headers = {'Cache-Control': IMMUTABLE_CACHE_CONTROL, 'ETag': etag}
+
+    representations = {etag, *(encoded_etag(etag, encoding) for encoding in ENCODINGS)}
+    for tag in parse_etags(request.headers.get('If-None-Match', '')):
+        if tag in representations:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED, headers={**headers, 'ETag': tag})
+            break
+    else:
+        response = Response(data, headers=headers)
+    patch_vary_headers(response, ('Authorization',))
+    return response
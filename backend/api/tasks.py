@@ -2,6 +2,7 @@ from celery import shared_task
 from django.core.mail import send_mail, EmailMultiAlternatives
 from django.conf import settings
 from django.template.loader import render_to_string
+from api.metrics import SMTP_FAILURES
 
 @shared_task
 def send_notification_email(subject, message, recipient_list):
@@ -15,11 +16,38 @@ def send_notification_email(subject, message, recipient_list):
 
 
 @shared_task
-def send_game_summary_email(recipient_email, game_data, transactions):
+def send_game_summary_email(summary_id, recipient_id, transactions=None):
     """
-    Wysyła podsumowanie zakończonej gry pokerowej na podany adres e-mail.
+    Wysyła graczowi `recipient_id` podsumowanie zakończonej gry pokerowej (dokument `GameSummary`, zob. `api.summaries`).
+
+    Przyjmuje też argumenty zadań zakolejkowanych przed wprowadzeniem podsumowań
+    (`recipient_email, game_data, transactions`); do usunięcia w następnym wydaniu.
     """
-    game_date = game_data.get("game_date", "Nieznana data")
+    if transactions is not None:
+        recipient_email, game_data = summary_id, recipient_id
+        game_date = game_data.get("game_date", "Nieznana data")
+        context = {key: game_data[key] for key in (
+            "game_duration", "buy_in", "cash_out", "total_pot", "avg_stack", "profit", "profit_per_hour",
+        )}
+        context["transactions"] = transactions
+    else:
+        from django.contrib.auth.models import User
+        from api.models import GameSummary
+
+        document = GameSummary.objects.get(pk=summary_id).document
+        player = next(player for player in document["players"] if player["id"] == recipient_id)
+        recipient_email = User.objects.filter(pk=recipient_id).values_list("email", flat=True).get()
+        game_date = document.get("date") or "Nieznana data"
+        context = {
+            "game_duration": document["duration"],
+            "buy_in": player["buy_in"],
+            "cash_out": player["cash_out"],
+            "total_pot": document["total_pot"],
+            "avg_stack": document["avg_stack"],
+            "profit": player["profit"],
+            "profit_per_hour": player["profit_per_hour"],
+            "transactions": [{"game": document["code"], **transfer} for transfer in document["transfers"]],
+        }
     
     formatted_game_date = game_date
     if isinstance(game_date, str) and "-" in game_date:
@@ -29,18 +57,31 @@ def send_game_summary_email(recipient_email, game_data, transactions):
     subject = f"📊 Podsumowanie gry pokerowej – {formatted_game_date}"
     from_email = settings.DEFAULT_FROM_EMAIL
 
-    html_content = render_to_string("emails/game_summary.html", {
-        "game_duration": game_data["game_duration"],
-        "buy_in": game_data["buy_in"],
-        "cash_out": game_data["cash_out"],
-        "total_pot": game_data["total_pot"],
-        "avg_stack": game_data["avg_stack"],
-        "profit": game_data["profit"],
-        "profit_per_hour": game_data["profit_per_hour"],
-        "transactions": transactions
-    })
+    html_content = render_to_string("emails/game_summary.html", context)
 
     email = EmailMultiAlternatives(subject, "Twoje podsumowanie gry pokerowej", from_email, [recipient_email])
     email.attach_alternative(html_content, "text/html")
 
-    email.send()
\ No newline at end of file
+    try:
+        email.send()
+    except OSError:  # smtplib.SMTPException and connection errors
+        SMTP_FAILURES.labels(task=send_game_summary_email.name).inc()
+        raise
+
+
+@shared_task
+def compact_game_actions(game_id):
+    """Folds the actions of an ended game into per-player summaries (see `api.compaction`)."""
+    # Imported here: the worker loads this module before the models are ready.
+    from api.compaction import compact_game
+
+    return compact_game(game_id)
+
+
+@shared_task
+def compact_ended_games():
+    """Compacts ended games left behind (e.g. ended before compaction existed), a batch per run."""
+    from api.compaction import games_to_compact
+
+    for game_id in games_to_compact(settings.ACTION_COMPACTION_BATCH):
+        compact_game_actions.delay(game_id)
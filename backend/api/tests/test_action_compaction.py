@@ -0,0 +1,87 @@
+from datetime import timedelta
+from unittest.mock import patch
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from api.compaction import compact_game
+from api.models import Action, ActionSummary, Game, PlayerToGame
+from api.tasks import compact_ended_games
+
+
+class ActionCompactionTest(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", password="password123")
+        self.user = User.objects.create_user(username="user1", password="password123")
+        self.game = self.create_game("COMPACT1", rebuys={self.admin: 3, self.user: 1})
+
+    def create_game(self, code, rebuys, is_end=True):
+        game = Game.objects.create(code=code, creator=self.admin, buy_in=50, is_end=is_end, end_time=timezone.now())
+        start = timezone.now() - timedelta(hours=3)
+        for player, count in rebuys.items():
+            seat = PlayerToGame.objects.create(player=player, game=game)
+            for index in range(count):
+                action = Action.objects.create(player_to_game=seat)
+                Action.objects.filter(pk=action.pk).update(action_time=start + timedelta(minutes=10 * index))
+        return game
+
+    def read_game(self):
+        self.client.force_authenticate(user=self.admin)
+        players = self.client.get(reverse('player-list', args=[self.game.code])).data['players']
+        game_data = self.client.get(reverse('game-data', args=[self.game.code])).data
+        return sorted((player['name'], player['stack']) for player in players), game_data['money_on_table']
+
+    def test_actions_folded_into_summaries(self):
+        removed = compact_game(self.game.pk)
+
+        self.assertEqual(removed, 4)
+        self.assertFalse(Action.objects.filter(player_to_game__game=self.game).exists())
+        summary = ActionSummary.objects.get(player_to_game__game=self.game, player_to_game__player=self.admin)
+        self.assertEqual((summary.actions, summary.multiplier), (3, 3))
+        self.assertEqual(summary.last_action_time - summary.first_action_time, timedelta(minutes=20))
+        self.game.refresh_from_db()
+        self.assertTrue(self.game.actions_compacted)
+
+    def test_reads_fall_back_to_summaries(self):
+        before = self.read_game()
+
+        compact_game(self.game.pk)
+
+        self.assertEqual(self.read_game(), before)
+        self.assertEqual(before, ([('admin', 150), ('user1', 50)], 200))
+
+    def test_compaction_is_repeatable(self):
+        compact_game(self.game.pk)
+
+        self.assertEqual(compact_game(self.game.pk), 0)
+        self.assertEqual(ActionSummary.objects.filter(player_to_game__game=self.game).count(), 2)
+
+    def test_active_games_are_not_compacted(self):
+        active = self.create_game("ACTIVE12", rebuys={self.user: 2}, is_end=False)
+
+        self.assertEqual(compact_game(active.pk), 0)
+        self.assertEqual(Action.objects.filter(player_to_game__game=active).count(), 2)
+
+    @override_settings(ACTION_COMPACTION_BATCH=1)
+    def test_beat_task_compacts_ended_games_in_batches(self):
+        other = self.create_game("COMPACT2", rebuys={self.user: 2})
+
+        with patch('api.tasks.compact_game_actions.delay', side_effect=compact_game):
+            compact_ended_games()
+            self.assertEqual(Game.objects.filter(pk__in=[self.game.pk, other.pk], actions_compacted=True).count(), 1)
+            compact_ended_games()
+
+        self.assertEqual(Action.objects.filter(player_to_game__game__in=[self.game, other]).count(), 0)
+
+    def test_actions_rejected_once_game_ended(self):
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.post(
+            reverse('player-action', args=[self.game.code]), {"action": "rebuy", "username": "user1"}, format='json'
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data['detail'], "The game has already ended.")
@@ -0,0 +1,99 @@
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+import numpy as np
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import reverse
+from api.analytics import confidence_intervals, game_results
+from api.archive import archive_game
+from api.models import Game, PlayerToGame, Statistics
+
+
+class ConfidenceIntervalsTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="user1", password="password123")
+        self.friend = User.objects.create_user(username="friend", password="password123")
+        self.url = reverse('user-stats')
+        # Three two-hour games: +100, -50 and +25 on buy-ins of 100.
+        self.games = [self.create_game(f"STATS{index:03d}", result) for index, result in enumerate((100, -50, 25))]
+
+    def create_game(self, code, result):
+        game = Game.objects.create(code=code, creator=self.user, buy_in=50, is_end=True)
+        Game.objects.filter(pk=game.pk).update(end_time=game.start_time + timedelta(hours=2), game_time=timedelta(hours=2))
+        for player, cash_out in ((self.user, 100 + result), (self.friend, 100 - result)):
+            seat = PlayerToGame.objects.create(player=player, game=game)
+            Statistics.objects.create(player_to_game=seat, buy_in=Decimal(100), cash_out=Decimal(cash_out))
+        return game
+
+    def get(self):
+        self.client.force_authenticate(user=self.user)
+        return self.client.get(self.url)
+
+    def test_intervals_around_point_estimates(self):
+        values = game_results(self.user)
+
+        intervals = confidence_intervals(values, rng=np.random.default_rng(0))
+
+        self.assertEqual(sorted(values.tolist()), [[100, 50, 2], [100, 125, 2], [100, 200, 2]])
+        low, high = intervals['win_rate']
+        self.assertLess(low, 375 / 300)
+        self.assertGreater(high, 375 / 300)
+        self.assertGreaterEqual(low, 0.5)
+        self.assertLessEqual(high, 2)
+        low, high = intervals['hourly_rate']
+        self.assertLess(low, 75 / 6)
+        self.assertGreater(high, 75 / 6)
+
+    def test_identical_games_have_no_spread(self):
+        values = np.array([[100, 150, 2]] * 10, dtype=float)
+
+        intervals = confidence_intervals(values, resamples=1000)
+
+        np.testing.assert_allclose(intervals['win_rate'], (1.5, 1.5), rtol=1e-5)
+        np.testing.assert_allclose(intervals['hourly_rate'], (25, 25), rtol=1e-5)
+
+    def test_no_intervals_without_enough_games(self):
+        self.assertEqual(confidence_intervals(np.empty((1, 3))), {'win_rate': None, 'hourly_rate': None})
+        self.assertIsNone(confidence_intervals(np.array([[100, 150, 0]] * 3, dtype=float))['hourly_rate'])
+
+    def test_intervals_in_user_stats(self):
+        data = self.get().data
+
+        low, high = map(Decimal, data['win_rate_interval'])
+        self.assertLessEqual(low, Decimal(data['win_rate']))
+        self.assertGreaterEqual(high, Decimal(data['win_rate']))
+        self.assertIsNotNone(data['hourly_rate_interval'])
+
+    def test_archived_games_included(self):
+        archive_game(self.games[0].pk)
+
+        self.assertEqual(len(game_results(self.user)), 3)
+
+    @patch('api.views.compact_game_actions.delay')
+    @patch('api.views.send_game_summary_email.delay')
+    def test_cached_until_next_game_ends(self, *mocks):
+        first = self.get().data
+        Statistics.objects.filter(player_to_game__player=self.user).update(cash_out=Decimal(100))
+        self.assertEqual(self.get().data['win_rate_interval'], first['win_rate_interval'])
+
+        game = Game.objects.create(code="STATS999", creator=self.user, buy_in=50)
+        for player in (self.user, self.friend):
+            PlayerToGame.objects.create(player=player, game=game)
+        self.client.force_authenticate(user=User.objects.create_superuser(username="admin", password="password123"))
+        # No cache entry is dropped: other processes see the new results under a new key.
+        self.client.post(reverse('end-game', args=[game.code]), {"players": [
+            {"player": "user1", "buy_in": 100, "cash_out": 100},
+            {"player": "friend", "buy_in": 100, "cash_out": 100},
+        ]}, format='json')
+
+        self.assertEqual(self.get().data['win_rate_interval'], ['1.00', '1.00'])
+
+    def test_requires_authentication(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -0,0 +1,105 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from api.archive import archive_game, restore_game
+from api.models import (
+    Action, ActionSummary, ArchivedGame, ArchivedResult, ArchivedTotals, Debts, Game, PlayerToGame, Statistics,
+)
+
+
+class ArchiveTest(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", password="password123")
+        self.user = User.objects.create_user(username="user1", password="password123")
+        self.game = self.create_game("ARCHIVE1", days_ago=400, results={self.admin: (100, 160), self.user: (100, 40)})
+
+    def create_game(self, code, days_ago, results, accepted=True):
+        end = timezone.now() - timedelta(days=days_ago)
+        game = Game.objects.create(code=code, creator=self.admin, buy_in=50, is_end=True, end_time=end)
+        Game.objects.filter(pk=game.pk).update(start_time=end - timedelta(hours=3), game_time=timedelta(hours=3))
+        for player, (buy_in, cash_out) in results.items():
+            seat = PlayerToGame.objects.create(player=player, game=game)
+            Action.objects.bulk_create([Action(player_to_game=seat) for _ in range(buy_in // 50)])
+            Statistics.objects.create(player_to_game=seat, buy_in=Decimal(buy_in), cash_out=Decimal(cash_out))
+        Debts.objects.create(game=game, amount=Decimal(60), sender=self.user, reciver=self.admin, is_send=accepted, is_accepted=accepted)
+        return game
+
+    def read_stats(self, user):
+        self.client.force_authenticate(user=user)
+        return self.client.get(reverse('user-stats')).json(), self.client.get(reverse('user-plot-data')).json()
+
+    def test_game_moved_to_archive(self):
+        self.assertTrue(archive_game(self.game.pk))
+
+        self.assertFalse(Game.objects.filter(pk=self.game.pk).exists())
+        self.assertFalse(PlayerToGame.objects.filter(game_id=self.game.pk).exists())
+        self.assertFalse(Debts.objects.filter(game_id=self.game.pk).exists())
+        archived = ArchivedGame.objects.get(code="ARCHIVE1")
+        self.assertEqual(archived.id, self.game.pk)
+        self.assertEqual(archived.debts.count(), 1)
+        result = ArchivedResult.objects.get(game=archived, player=self.admin)
+        self.assertEqual((result.buy_in, result.cash_out, result.actions, result.multiplier), (100, 160, 2, 2))
+
+        totals = ArchivedTotals.objects.get(user=self.user)
+        self.assertEqual((totals.games_played, totals.results, totals.total_buy_in, totals.total_cash_out), (1, 1, 100, 40))
+        self.assertEqual((totals.highest_win, totals.play_time), (Decimal(-60), timedelta(hours=3)))
+
+    def test_statistics_unchanged_by_archiving(self):
+        self.create_game("RECENT01", days_ago=1, results={self.admin: (50, 20), self.user: (50, 80)})
+        before = self.read_stats(self.user)
+
+        archive_game(self.game.pk)
+
+        self.assertEqual(self.read_stats(self.user), before)
+        self.assertEqual(before[0]['games_played'], 2)
+        self.assertEqual(before[0]['earn'], '-30.00')
+
+    def test_game_with_open_debts_not_archived(self):
+        game = self.create_game("OPENDEBT", days_ago=400, results={self.admin: (50, 50), self.user: (50, 50)}, accepted=False)
+
+        self.assertFalse(archive_game(game.pk))
+        self.assertTrue(Game.objects.filter(pk=game.pk).exists())
+
+    def test_restore_game(self):
+        self.game.refresh_from_db()
+        archive_game(self.game.pk)
+
+        self.assertTrue(restore_game("ARCHIVE1"))
+
+        game = Game.objects.get(pk=self.game.pk)
+        self.assertEqual((game.code, game.start_time, game.is_end, game.actions_compacted), ("ARCHIVE1", self.game.start_time, True, True))
+        self.assertEqual(Statistics.objects.filter(player_to_game__game=game).count(), 2)
+        self.assertEqual(ActionSummary.objects.get(player_to_game__game=game, player_to_game__player=self.admin).multiplier, 2)
+        self.assertEqual(Debts.objects.filter(game=game, is_accepted=True).count(), 1)
+        self.assertFalse(ArchivedGame.objects.exists())
+        self.assertFalse(ArchivedTotals.objects.exists())
+
+    def test_command_archives_old_games_and_restores_them(self):
+        recent = self.create_game("RECENT01", days_ago=1, results={self.admin: (50, 50)})
+
+        call_command('archive_games', '--older-than', '180', stdout=StringIO())
+
+        self.assertEqual(list(ArchivedGame.objects.values_list('code', flat=True)), ["ARCHIVE1"])
+        self.assertTrue(Game.objects.filter(pk=recent.pk).exists())
+
+        call_command('archive_games', '--restore', 'ARCHIVE1', stdout=StringIO())
+        self.assertTrue(Game.objects.filter(code="ARCHIVE1").exists())
+
+        with self.assertRaises(CommandError):
+            call_command('archive_games', '--restore', 'MISSING1', stdout=StringIO())
+
+    def test_archived_game_not_found_in_game_views(self):
+        archive_game(self.game.pk)
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.get(reverse('player-list', args=["ARCHIVE1"]))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
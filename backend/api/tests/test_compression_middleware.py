@@ -0,0 +1,58 @@
+import brotli
+import gzip
+import json
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.timezone import now, timedelta
+from api.middleware import accepted_encodings
+from api.models import Game, PlayerToGame, Statistics
+
+
+@override_settings(COMPRESSION_MIN_SIZE=1024)
+class CompressionMiddlewareTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="user1", password="password123")
+        games = Game.objects.bulk_create([Game(code=f"GAME{i:04d}", creator=self.user) for i in range(100)])
+        seats = PlayerToGame.objects.bulk_create([PlayerToGame(player=self.user, game=game) for game in games])
+        Statistics.objects.bulk_create([
+            Statistics(player_to_game=seat, buy_in=100, cash_out=100 + i, cash_out_time=now() - timedelta(days=i))
+            for i, seat in enumerate(seats)
+        ])
+        self.client.force_authenticate(user=self.user)
+        self.url = reverse('user-plot-data')
+
+    def test_brotli_preferred(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, deflate, br')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(len(json.loads(brotli.decompress(response.content))['labels']), 100)
+
+    def test_gzip(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, br;q=0')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))['labels']), 100)
+
+    def test_not_accepted(self):
+        response = self.client.get(self.url)
+
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(len(response.json()['labels']), 100)
+
+    def test_small_response_not_compressed(self):
+        response = self.client.get(reverse('user-detail'), HTTP_ACCEPT_ENCODING='gzip, br')
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_accepted_encodings(self):
+        self.assertEqual(accepted_encodings('gzip, deflate, br'), {'gzip', 'deflate', 'br'})
+        self.assertEqual(accepted_encodings('br;q=0, gzip;q=0.8'), {'gzip'})
+        self.assertEqual(accepted_encodings(''), set())
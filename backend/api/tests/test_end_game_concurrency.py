@@ -0,0 +1,90 @@
+import threading
+from django.contrib.auth.models import User
+from django.db import IntegrityError, connection, transaction
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from api.models import Debts, Game, PlayerToGame, Statistics
+
+
+class StatisticsConstraintTest(TestCase):
+
+    def test_one_cash_out_per_seat(self):
+        admin = User.objects.create_superuser(username="admin", password="password123")
+        game = Game.objects.create(code="UNIQUE12", creator=admin)
+        seat = PlayerToGame.objects.create(player=admin, game=game)
+        Statistics.objects.create(player_to_game=seat, buy_in=100, cash_out=100)
+
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Statistics.objects.create(player_to_game=seat, buy_in=100, cash_out=100)
+
+
+@skipUnlessDBFeature('has_select_for_update')
+class EndGameConcurrencyTest(TransactionTestCase):
+    """Parallel end-game requests on real connections (PostgreSQL)."""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", password="password123")
+        self.players = [User.objects.create_user(username=f"player{i}", password="password123") for i in range(4)]
+        self.players_data = [
+            {"player": player.username, "buy_in": 100, "cash_out": 100 + (i % 2 * 2 - 1) * 50}
+            for i, player in enumerate(self.players)
+        ]
+
+    def create_game(self, code):
+        game = Game.objects.create(code=code, creator=self.admin)
+        PlayerToGame.objects.bulk_create(PlayerToGame(player=player, game=game) for player in self.players)
+        return game
+
+    def end_game(self, code, results, barrier=None):
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+        try:
+            if barrier is not None:
+                barrier.wait()
+            response = client.post(reverse('end-game', args=[code]), {"players": self.players_data}, format='json')
+            results.append(response.status_code)
+        finally:
+            connection.close()
+
+    def test_parallel_requests_settle_once(self):
+        game = self.create_game("PARALLEL")
+        results = []
+        barrier = threading.Barrier(5)
+        threads = [threading.Thread(target=self.end_game, args=(game.code, results, barrier)) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sorted(results), [status.HTTP_200_OK] + [status.HTTP_409_CONFLICT] * 4)
+        self.assertEqual(Statistics.objects.filter(player_to_game__game=game).count(), len(self.players))
+        self.assertEqual(Debts.objects.filter(game=game).count(), 2)
+
+    def test_other_games_are_not_blocked(self):
+        locked, other = self.create_game("LOCKED12"), self.create_game("OTHER123")
+        holding, release = threading.Event(), threading.Event()
+        outcome = {}
+
+        def hold_lock():
+            try:
+                with transaction.atomic():
+                    Game.objects.select_for_update().get(pk=locked.pk)
+                    holding.set()
+                    outcome['timed_out'] = not release.wait(10)
+            finally:
+                connection.close()
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        holding.wait(10)
+        results = []
+        worker = threading.Thread(target=self.end_game, args=(other.code, results))
+        worker.start()
+        worker.join()
+        release.set()
+        holder.join()
+
+        self.assertEqual(results, [status.HTTP_200_OK])
+        self.assertFalse(outcome['timed_out'], "Ending another game waited for the lock.")
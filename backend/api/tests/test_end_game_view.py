@@ -1,3 +1,4 @@
+from unittest.mock import patch
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth.models import User
@@ -221,6 +222,45 @@ class EndGameViewTestCase(APITestCase):
         self.assertIsNotNone(game.game_time, "Game time should be calculated.")
         self.assertGreater(game.game_time.total_seconds(), 0, "Game time should be greater than zero.")
 
+    def test_game_ended_twice(self):
+        """Ensure ending an ended game is rejected without settling it again."""
+        players_data = [
+            {"player": "player1", "buy_in": 100, "cash_out": 200},
+            {"player": "player2", "buy_in": 200, "cash_out": 100},
+        ]
+        self.authenticate(self.admin_user)
+        game = self.create_game_with_players("GAME_TWC", [p["player"] for p in players_data])
+        url = f'{self.base_url}{game.code}/end-game/'
+
+        self.assertEqual(self.client.post(url, {"players": players_data}, format='json').status_code, status.HTTP_200_OK)
+        with patch('api.views.send_game_summary_email') as task, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, {"players": players_data}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["detail"], "The game has already ended.")
+        self.assertEqual(Statistics.objects.filter(player_to_game__game=game).count(), 2)
+        self.assertEqual(Debts.objects.filter(game=game).count(), 1)
+        task.delay.assert_not_called()
+
+    def test_emails_sent_on_commit(self):
+        """Ensure summary emails are queued once the settlement is committed."""
+        players_data = [
+            {"player": "player1", "buy_in": 100, "cash_out": 200},
+            {"player": "player2", "buy_in": 200, "cash_out": 100},
+        ]
+        self.authenticate(self.admin_user)
+        game = self.create_game_with_players("GAME_EML", [p["player"] for p in players_data])
+
+        with patch('api.views.send_game_summary_email') as task:
+            with self.captureOnCommitCallbacks() as callbacks:
+                response = self.client.post(f'{self.base_url}{game.code}/end-game/', {"players": players_data}, format='json')
+            task.delay.assert_not_called()
+            for callback in callbacks:
+                callback()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(task.delay.call_count, 2)
+
     def test_missing_player_in_game(self):
         """Ensure the endpoint handles players not in the game."""
         players_data = [
@@ -0,0 +1,55 @@
+import re
+from unittest.mock import patch
+from django.contrib.auth.models import User
+from django.db import NotSupportedError, connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from api import codes
+from api.models import Game
+
+
+class GameCodeTest(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="admin", password="password123")
+
+    def test_codes_are_distinct_and_well_formed(self):
+        generated = [codes.code_for(number) for number in range(10000)]
+
+        self.assertEqual(len(set(generated)), len(generated))
+        for code in generated:
+            self.assertRegex(code, r'^[A-Z]{8}$')
+
+    def test_codes_do_not_reveal_order(self):
+        first, second = codes.code_for(41), codes.code_for(42)
+
+        self.assertGreater(sum(a != b for a, b in zip(first, second)), 2)
+
+    def test_codes_depend_on_key(self):
+        with override_settings(GAME_CODE_KEY='one'):
+            one = [codes.code_for(number) for number in range(100)]
+        with override_settings(GAME_CODE_KEY='two'):
+            two = [codes.code_for(number) for number in range(100)]
+
+        self.assertNotEqual(one, two)
+        with override_settings(GAME_CODE_KEY='one'):
+            self.assertEqual(one, [codes.code_for(number) for number in range(100)])
+
+    def test_last_number_of_code_space(self):
+        self.assertRegex(codes.code_for(codes.CODE_SPACE - 1), r'^[A-Z]{8}$')
+        with self.assertRaises(ValueError):
+            codes.permute(codes.CODE_SPACE, 'key')
+
+    def test_game_creation_does_not_check_codes(self):
+        with CaptureQueriesContext(connection) as queries:
+            games = [Game.objects.create(creator=self.user) for _ in range(codes.BLOCK_SIZE + 1)]
+
+        self.assertEqual(len({game.code for game in games}), len(games))
+        self.assertFalse([q['sql'] for q in queries if re.match(r'SELECT .* FROM "api_game"', q['sql'])])
+        counter_queries = [q for q in queries if codes.SEQUENCE_NAME in q['sql']]
+        self.assertLessEqual(len(counter_queries), 2)
+
+    def test_counter_requires_postgresql(self):
+        with patch.object(connection, 'vendor', 'sqlite'):
+            with self.assertRaises(NotSupportedError):
+                codes.reserve_block()
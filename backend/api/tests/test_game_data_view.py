@@ -4,7 +4,7 @@ from rest_framework_simplejwt.tokens import AccessToken
 from django.contrib.auth.models import User
 from api.models import Game, PlayerToGame, Action
 from django.urls import reverse
-from unittest.mock import patch
+from unittest.mock import patch, AsyncMock
 
 class GameDataViewTest(APITestCase):
 
@@ -66,7 +66,7 @@ class GameDataViewTest(APITestCase):
 
     @patch('api.models.Action.objects.filter')
     def test_get_game_data_no_actions(self, mock_filter):
-        mock_filter.return_value.aggregate.return_value = {'total': 0}
+        mock_filter.return_value.aaggregate = AsyncMock(return_value={'total': 0})
         self.authenticate(self.user1)
 
         response = self.client.get(self.url)
@@ -0,0 +1,77 @@
+import math
+import re
+from django.contrib.auth.models import User, update_last_login
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from api.models import Game, get_default_creator
+
+
+@override_settings(GAME_DEFAULT_CREATOR_USERNAME='karski')
+class GameDefaultCreatorTest(TestCase):
+
+    def setUp(self):
+        self.creator = User.objects.create_user(username="karski", password="password123")
+
+    def user_queries(self, queries):
+        return [query['sql'] for query in queries if re.search(r'FROM "auth_user"', query['sql'])]
+
+    def test_bulk_create_runs_no_per_row_queries(self):
+        get_default_creator()
+        games = [Game() for _ in range(1000)]
+        batch_size = connection.ops.bulk_batch_size([field for field in Game._meta.concrete_fields if not field.primary_key], games)
+
+        with CaptureQueriesContext(connection) as queries:
+            Game.objects.bulk_create(games)
+
+        inserts = [query for query in queries if query['sql'].startswith('INSERT')]
+        self.assertEqual(len(inserts), math.ceil(1000 / batch_size))
+        self.assertEqual(len(queries), len(inserts))
+        self.assertEqual(Game.objects.filter(creator=self.creator).count(), 1000)
+
+    def test_default_creator_is_looked_up_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            games = [Game() for _ in range(100)]
+
+        self.assertEqual(len(self.user_queries(queries)), 1)
+        self.assertTrue(all(game.creator_id == self.creator.id for game in games))
+
+    def test_explicit_creator_skips_lookup(self):
+        other = User.objects.create_user(username="other", password="password123")
+
+        with CaptureQueriesContext(connection) as queries:
+            game = Game(creator=other)
+
+        self.assertEqual(self.user_queries(queries), [])
+        self.assertEqual(game.creator_id, other.id)
+
+    def test_deleted_creator_is_forgotten(self):
+        self.assertEqual(get_default_creator(), self.creator.id)
+
+        self.creator.delete()
+
+        self.assertIsNone(get_default_creator())
+
+    def test_logins_keep_default_creator(self):
+        get_default_creator()
+        update_last_login(None, self.creator)
+        User.objects.create_user(username="other", password="password123")
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(get_default_creator(), self.creator.id)
+
+        self.assertEqual(self.user_queries(queries), [])
+
+    @override_settings(GAME_DEFAULT_CREATOR_USERNAME='other')
+    def test_missing_creator_is_looked_up_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.assertIsNone(get_default_creator())
+            self.assertIsNone(get_default_creator())
+
+        self.assertEqual(len(self.user_queries(queries)), 1)
+        other = User.objects.create_user(username="other", password="password123")
+        self.assertEqual(get_default_creator(), other.id)
+
+    @override_settings(GAME_DEFAULT_CREATOR_USERNAME='')
+    def test_no_default_creator(self):
+        self.assertIsNone(get_default_creator())
@@ -0,0 +1,97 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from api.models import Game, PlayerToGame
+
+
+class GameAccessCacheTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_superuser(username="admin", password="password123")
+        self.user = User.objects.create_user(username="user1", password="password123")
+        self.game = Game.objects.create(code="PERMS123", creator=self.admin)
+        PlayerToGame.objects.create(player=self.admin, game=self.game)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        return response, len(queries)
+
+    def test_repeated_polls_are_served_from_cache(self):
+        PlayerToGame.objects.create(player=self.user, game=self.game)
+        self.client.force_authenticate(user=self.user)
+        url = reverse('game-data', args=[self.game.code])
+
+        first, first_queries = self.count_queries(url)
+        second, second_queries = self.count_queries(url)
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(second_queries, first_queries - 1)
+
+    def test_membership_is_cached_per_user(self):
+        url = reverse('game-data', args=[self.game.code])
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data['detail'], "You do not have access to this game.")
+
+    def test_joining_invalidates_membership(self):
+        self.client.force_authenticate(user=self.user)
+        url = reverse('check-player-in-game', args=[self.game.code])
+        self.assertFalse(self.client.get(url).data['is_in_game'])
+
+        response = self.client.post(reverse('join-game'), {"room_code": self.game.code}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        self.assertTrue(self.client.get(url).data['is_in_game'])
+
+    def test_ending_game_invalidates_game(self):
+        PlayerToGame.objects.create(player=self.user, game=self.game)
+        self.client.force_authenticate(user=self.user)
+        url = reverse('check-player-in-game', args=[self.game.code])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+        self.game.is_end = True
+        self.game.save()
+
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_410_GONE)
+
+    def test_writes_do_not_trust_cached_game(self):
+        PlayerToGame.objects.create(player=self.user, game=self.game)
+        self.client.force_authenticate(user=self.user)
+        self.client.get(reverse('game-data', args=[self.game.code]))
+        # Ended in another process: this one keeps the cached game until it expires.
+        Game.objects.filter(pk=self.game.pk).update(is_end=True)
+
+        rebuy = self.client.post(reverse('player-action', args=[self.game.code]), {"action": "rebuy", "username": "user1"}, format='json')
+        self.client.force_authenticate(user=User.objects.create_user(username="user2", password="password123"))
+        join = self.client.post(reverse('join-game'), {"room_code": self.game.code}, format='json')
+
+        self.assertEqual(rebuy.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(join.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_unknown_game(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(reverse('game-data', args=["UNKNOWN1"]))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['detail'], "Game not found")
+
+    def test_admin_permission_checked_before_game(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(reverse('end-game', args=["UNKNOWN1"]), {"players": []}, format='json')
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data['detail'], "Only superusers can end the game.")
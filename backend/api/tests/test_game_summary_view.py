@@ -0,0 +1,136 @@
+from unittest.mock import patch
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core import mail
+from django.urls import reverse
+from api.archive import archive_game
+from api.models import Action, Debts, Game, GameSummary, PlayerToGame
+from api.tasks import send_game_summary_email
+
+
+@patch('api.views.compact_game_actions.delay')
+@patch('api.views.send_game_summary_email.delay')
+class GameSummaryViewTest(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", password="password123")
+        self.user = User.objects.create_user(username="user1", password="password123")
+        self.outsider = User.objects.create_user(username="outsider", password="password123")
+        self.game = Game.objects.create(code="SUMMARY1", creator=self.admin, buy_in=50, start_time="2024-01-01T18:00:00Z")
+        for player, rebuys in ((self.admin, 2), (self.user, 1)):
+            seat = PlayerToGame.objects.create(player=player, game=self.game)
+            Action.objects.bulk_create([Action(player_to_game=seat) for _ in range(rebuys)])
+        self.url = reverse('game-summary', args=[self.game.code])
+
+    def end_game(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(reverse('end-game', args=[self.game.code]), {"players": [
+            {"player": "admin", "buy_in": 100, "cash_out": 30},
+            {"player": "user1", "buy_in": 50, "cash_out": 120},
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_summary_written_when_game_ends(self, *mocks):
+        self.end_game()
+
+        document = GameSummary.objects.get(game=self.game).document
+        self.assertEqual(document['table']['money_on_table'], 150)
+        self.assertEqual(
+            [(player['username'], player['stack'], player['profit']) for player in document['players']],
+            [("admin", 100, "-70.00"), ("user1", 50, "70.00")],
+        )
+        self.assertEqual(document['transfers'], [{"sender": "admin", "receiver": "user1", "amount": "70.00", "phone": "Brak numeru"}])
+
+    def test_emails_sent_from_summary(self, send_email, compact):
+        User.objects.filter(pk=self.user.pk).update(email="user1@example.com")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.end_game()
+
+        summary = GameSummary.objects.get(game=self.game)
+        send_email.assert_called_once_with(summary.pk, self.user.pk)
+        send_game_summary_email(summary.pk, self.user.pk)
+        self.assertEqual(mail.outbox[0].to, ["user1@example.com"])
+        html = mail.outbox[0].alternatives[0][0]
+        self.assertIn("70.00 zł", html)
+        self.assertIn("SUMMARY1", html)
+
+    def test_emails_queued_before_summaries_still_sent(self, *mocks):
+        game_data = {
+            "game_date": "2024-05-01", "game_duration": 2.5, "buy_in": "100.00", "cash_out": "170.00",
+            "total_pot": "200.00", "avg_stack": "100.00", "profit": "70.00", "profit_per_hour": "28.00",
+        }
+        transactions = [{"game": "SUMMARY1", "sender": "admin", "receiver": "user1", "amount": "70.00", "phone": "Brak numeru"}]
+
+        send_game_summary_email("user1@example.com", game_data, transactions)
+
+        self.assertEqual(mail.outbox[0].to, ["user1@example.com"])
+        self.assertIn("01.05.2024", mail.outbox[0].subject)
+        self.assertIn("SUMMARY1", mail.outbox[0].alternatives[0][0])
+
+    def test_summary_is_immutable(self, *mocks):
+        self.end_game()
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['code'], "SUMMARY1")
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertTrue(response['ETag'].startswith('"'))
+        self.assertIn('Authorization', response['Vary'])
+
+        for etag in (response['ETag'], response['ETag'][:-1] + '-gzip"'):
+            cached = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+            self.assertIn('Authorization', cached['Vary'])
+
+    def test_ended_game_reads_served_from_summary(self, *mocks):
+        self.end_game()
+        self.client.force_authenticate(user=self.user)
+        Action.objects.filter(player_to_game__game=self.game).delete()
+
+        players = self.client.get(reverse('player-list', args=[self.game.code]))
+        game_data = self.client.get(reverse('game-data', args=[self.game.code]))
+
+        self.assertEqual(players.data['players'], [{'name': "user1", 'stack': 50}])
+        self.assertEqual(game_data.data['money_on_table'], 150)
+        self.assertIn('immutable', game_data['Cache-Control'])
+        self.assertNotEqual(players['ETag'], game_data['ETag'])
+
+    def test_summary_built_for_games_ended_without_one(self, *mocks):
+        Game.objects.filter(pk=self.game.pk).update(is_end=True)
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['table']['number_of_players'], 2)
+        self.assertTrue(GameSummary.objects.filter(game=self.game).exists())
+
+    def test_summary_of_archived_game(self, *mocks):
+        self.end_game()
+        Debts.objects.update(is_send=True, is_accepted=True)
+        archive_game(self.game.pk)
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['code'], "SUMMARY1")
+
+    def test_summary_forbidden_to_other_players(self, *mocks):
+        self.end_game()
+        self.client.force_authenticate(user=self.outsider)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_summary_of_active_game_not_found(self, *mocks):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
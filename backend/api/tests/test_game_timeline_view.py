@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from unittest.mock import patch
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.urls import reverse
+from api.compaction import compact_game
+from api.models import Action, Game, PlayerToGame
+from api.timeline import downsample
+
+
+START = datetime(2024, 5, 1, 18, tzinfo=dt_timezone.utc)
+
+
+class GameTimelineViewTest(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", password="password123")
+        self.user = User.objects.create_user(username="user1", password="password123")
+        self.outsider = User.objects.create_user(username="outsider", password="password123")
+        self.game = Game.objects.create(code="TIMELINE", creator=self.admin, buy_in=50)
+        seats = {player: PlayerToGame.objects.create(player=player, game=self.game) for player in (self.admin, self.user)}
+        # admin at 0 and 20 minutes, user1 at 10 and 30 minutes.
+        for minute, player in ((0, self.admin), (10, self.user), (20, self.admin), (30, self.user)):
+            action = Action.objects.create(player_to_game=seats[player])
+            Action.objects.filter(pk=action.pk).update(action_time=START + timedelta(minutes=minute))
+        self.url = reverse('game-timeline', args=[self.game.code])
+
+    def get(self, user, **params):
+        self.client.force_authenticate(user=user)
+        return self.client.get(self.url, params)
+
+    def test_cumulative_buy_ins(self):
+        response = self.get(self.user)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['players'], [
+            {'name': "admin", 'points': [["2024-05-01T18:00:00Z", 50], ["2024-05-01T18:20:00Z", 100]]},
+            {'name': "user1", 'points': [["2024-05-01T18:10:00Z", 50], ["2024-05-01T18:30:00Z", 100]]},
+        ])
+        self.assertEqual([amount for _, amount in response.data['table']], [50, 100, 150, 200])
+
+    @patch('api.views.compact_game_actions.delay')
+    @patch('api.views.send_game_summary_email.delay')
+    def test_ended_game_served_from_summary_after_compaction(self, *mocks):
+        before = self.get(self.user).data
+        self.client.force_authenticate(user=self.admin)
+        self.client.post(reverse('end-game', args=[self.game.code]), {"players": [
+            {"player": "admin", "buy_in": 100, "cash_out": 100},
+            {"player": "user1", "buy_in": 100, "cash_out": 100},
+        ]}, format='json')
+        compact_game(self.game.pk)
+
+        response = self.get(self.user)
+
+        self.assertEqual(response.data, before)
+        self.assertIn('immutable', response['Cache-Control'])
+
+    def test_compaction_keeps_timeline_of_games_ended_without_summary(self):
+        before = self.get(self.user).data
+        self.game.is_end = True
+        self.game.save()
+
+        compact_game(self.game.pk)
+
+        self.assertFalse(Action.objects.filter(player_to_game__game=self.game).exists())
+        self.assertEqual(self.get(self.user).data, before)
+
+    def test_max_points(self):
+        response = self.get(self.user, max_points=3)
+
+        self.assertEqual([amount for _, amount in response.data['table']], [50, 150, 200])
+
+    def test_downsample_keeps_last_point(self):
+        points = list(range(10))
+
+        self.assertEqual(downsample(points, 4), [0, 3, 6, 9])
+        self.assertEqual(downsample(points, 1), [9])
+        self.assertEqual(downsample(points, 20), points)
+
+    def test_invalid_max_points(self):
+        response = self.get(self.user, max_points=0)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_forbidden_to_other_users(self):
+        response = self.get(self.outsider)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,61 @@
+from io import StringIO
+from collections import defaultdict
+from django.core.management import call_command
+from django.contrib.auth.models import User
+from django.db.models import F, Sum
+from django.test import TestCase
+from api.models import Action, Debts, Game, PlayerToGame, Statistics, UserProfile
+
+
+class GenerateLoadDataCommandTest(TestCase):
+
+    def generate(self, *args):
+        call_command(
+            'generate_load_data', '--users', '12', '--games', '30', '--batch-size', '7', '--seed', '42', *args,
+            stdout=StringIO(),
+        )
+
+    def snapshot(self):
+        return list(
+            Statistics.objects.order_by('player_to_game__game__code', 'player_to_game__player__username').values_list(
+                'player_to_game__game__code', 'player_to_game__player__username', 'buy_in', 'cash_out'
+            )
+        )
+
+    def test_generates_consistent_games(self):
+        self.generate()
+
+        self.assertEqual(User.objects.filter(username__startswith='load_').count(), 12)
+        self.assertEqual(UserProfile.objects.count(), 12)
+        self.assertEqual(Game.objects.filter(is_end=True).count(), 30)
+        self.assertEqual(Statistics.objects.count(), PlayerToGame.objects.count())
+
+        # Every game is zero-sum and its debts settle every balance.
+        for game in Game.objects.all():
+            stats = Statistics.objects.filter(player_to_game__game=game)
+            self.assertEqual(stats.aggregate(total=Sum(F('cash_out') - F('buy_in')))['total'], 0)
+
+            balances = defaultdict(int)
+            for stat in stats.select_related('player_to_game'):
+                balances[stat.player_to_game.player_id] += stat.cash_out - stat.buy_in
+            for debt in Debts.objects.filter(game=game):
+                balances[debt.sender_id] += debt.amount
+                balances[debt.reciver_id] -= debt.amount
+            self.assertTrue(all(balance == 0 for balance in balances.values()))
+
+        # Buy-ins match the recorded rebuys.
+        for stat in Statistics.objects.select_related('player_to_game__game')[:20]:
+            rebuys = Action.objects.filter(player_to_game=stat.player_to_game).aggregate(total=Sum('multiplier'))['total']
+            self.assertEqual(stat.buy_in, rebuys * stat.player_to_game.game.buy_in)
+
+        # Historical timestamps are kept instead of auto_now_add ones.
+        self.assertGreater(Game.objects.dates('start_time', 'day').count(), 1)
+
+    def test_same_seed_is_reproducible(self):
+        self.generate()
+        first = self.snapshot()
+
+        self.generate('--clear')
+
+        self.assertEqual(self.snapshot(), first)
+        self.assertEqual(Game.objects.count(), 30)
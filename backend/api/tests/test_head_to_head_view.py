@@ -0,0 +1,76 @@
+from decimal import Decimal
+from unittest.mock import patch
+import numpy as np
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.urls import reverse
+from api.head_to_head import pair_totals, rebuild
+from api.models import Game, HeadToHead, PlayerToGame
+
+
+@patch('api.views.compact_game_actions.delay')
+@patch('api.views.send_game_summary_email.delay')
+class HeadToHeadViewTest(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", password="password123")
+        self.user = User.objects.create_user(username="user1", password="password123")
+        self.friend = User.objects.create_user(username="friend", password="password123")
+        self.url = reverse('user-head-to-head')
+
+    def end_game(self, code, results):
+        game = Game.objects.create(code=code, creator=self.admin, buy_in=50)
+        for username in results:
+            PlayerToGame.objects.create(player=User.objects.get(username=username), game=game)
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(reverse('end-game', args=[code]), {"players": [
+            {"player": username, "buy_in": 100, "cash_out": 100 + result} for username, result in results.items()
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def get(self, **params):
+        self.client.force_authenticate(user=self.user)
+        return self.client.get(self.url, params)
+
+    def test_updated_when_games_end(self, *mocks):
+        self.end_game("H2H00001", {"user1": 30, "friend": -20, "admin": -10})
+        self.end_game("H2H00002", {"user1": -5.5, "friend": 5.5})
+
+        response = self.get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['opponents'], [
+            {'opponent': "friend", 'games': 2, 'net': '24.50', 'opponent_net': '-14.50'},
+            {'opponent': "admin", 'games': 1, 'net': '30.00', 'opponent_net': '-10.00'},
+        ])
+        self.assertEqual([row['opponent'] for row in self.get(min_games=2).data['opponents']], ["friend"])
+
+    def test_rebuild_matches_incremental_results(self, *mocks):
+        self.end_game("H2H00001", {"user1": 30, "friend": -20, "admin": -10})
+        self.end_game("H2H00002", {"user1": -5.5, "friend": 5.5})
+        self.end_game("H2H00003", {"friend": 12, "admin": -12})
+        incremental = set(HeadToHead.objects.values_list('user', 'opponent', 'games', 'net', 'opponent_net'))
+
+        self.assertEqual(rebuild(chunk_size=2), len(incremental))
+        self.assertEqual(set(HeadToHead.objects.values_list('user', 'opponent', 'games', 'net', 'opponent_net')), incremental)
+        self.assertIn((self.friend.pk, self.admin.pk, 2, Decimal('-8.00'), Decimal('-22.00')), incremental)
+
+    def test_pair_totals(self, *mocks):
+        results = np.array([[300, -200, -100], [-550, 550, 0]])
+        played = np.array([[True, True, True], [True, True, False]])
+
+        games, net = pair_totals(results, played)
+
+        self.assertEqual(games.tolist(), [[0, 2, 1], [2, 0, 1], [1, 1, 0]])
+        self.assertEqual(net.tolist(), [[0, -250, 300], [350, 0, -200], [-100, -100, 0]])
+
+    def test_invalid_min_games(self, *mocks):
+        response = self.get(min_games=0)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_requires_authentication(self, *mocks):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
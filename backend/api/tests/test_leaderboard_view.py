@@ -0,0 +1,114 @@
+from datetime import timedelta
+from unittest.mock import patch
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+from api.models import Game, PlayerRating, PlayerToGame, RatingChange
+from api.ratings import INITIAL_RATING, rate_game, rating_histories, rebuild
+
+
+@patch('api.views.compact_game_actions.delay')
+@patch('api.views.send_game_summary_email.delay')
+class LeaderboardViewTest(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username="admin", password="password123")
+        self.user = User.objects.create_user(username="user1", password="password123")
+        self.friend = User.objects.create_user(username="friend", password="password123")
+        self.url = reverse('leaderboard')
+
+    def end_game(self, code, results, buy_in=50):
+        game = Game.objects.create(code=code, creator=self.admin, buy_in=buy_in)
+        for username in results:
+            PlayerToGame.objects.create(player=User.objects.get(username=username), game=game)
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post(reverse('end-game', args=[code]), {"players": [
+            {"player": username, "buy_in": 200, "cash_out": 200 + result} for username, result in results.items()
+        ]}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def get(self, url=None, **params):
+        self.client.force_authenticate(user=self.user)
+        return self.client.get(url or self.url, params)
+
+    def test_ratings_updated_when_game_ends(self, *mocks):
+        self.end_game("RATING01", {"user1": 50, "friend": -50})
+
+        self.assertAlmostEqual(PlayerRating.objects.get(user=self.user).rating, 1507.39, places=2)
+        self.assertAlmostEqual(PlayerRating.objects.get(user=self.friend).rating, 1492.61, places=2)
+        self.assertEqual(RatingChange.objects.filter(game_id=Game.objects.get(code="RATING01").pk).count(), 2)
+
+    def test_results_normalized_by_buy_in(self, *mocks):
+        self.end_game("RATING01", {"user1": 50, "friend": -50}, buy_in=50)
+        self.end_game("RATING02", {"admin": 50, "friend": -50}, buy_in=10)
+
+        self.assertGreater(PlayerRating.objects.get(user=self.admin).rating, PlayerRating.objects.get(user=self.user).rating)
+
+    def test_leaderboard(self, *mocks):
+        self.end_game("RATING01", {"user1": 50, "friend": -50})
+        self.end_game("RATING02", {"user1": 20, "friend": -10, "admin": -10})
+
+        response = self.get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        players = response.data['players']
+        self.assertEqual([player['username'] for player in players], ["user1", "admin", "friend"])
+        self.assertEqual([player['games'] for player in players], [2, 1, 2])
+        self.assertEqual(len(players[0]['history']), 2)
+        self.assertEqual(players[0]['history'][-1][1], round(players[0]['rating'], 1))
+        self.assertEqual([player['username'] for player in self.get(min_games=2, limit=1).data['players']], ["user1"])
+
+    def test_rating_in_user_stats(self, *mocks):
+        self.assertIsNone(self.get(reverse('user-stats')).data['rating'])
+
+        self.end_game("RATING01", {"user1": 50, "friend": -50})
+        data = self.get(reverse('user-stats')).data
+
+        self.assertAlmostEqual(data['rating'], 1507.394, places=3)
+        self.assertEqual([rating for _, rating in data['rating_history']], [1507.4])
+
+    def test_rebuild_replays_history(self, *mocks):
+        self.end_game("RATING01", {"user1": 50, "friend": -50})
+        self.end_game("RATING02", {"user1": 20, "friend": -10, "admin": -10})
+        self.end_game("RATING03", {"admin": 35, "friend": -35})
+        incremental = {rating.user_id: (rating.rating, rating.games) for rating in PlayerRating.objects.all()}
+
+        self.assertEqual(rebuild(), 3)
+
+        for rating in PlayerRating.objects.all():
+            self.assertAlmostEqual(rating.rating, incremental[rating.user_id][0])
+            self.assertEqual(rating.games, incremental[rating.user_id][1])
+        self.assertEqual(RatingChange.objects.count(), 7)
+
+    def test_histories_downsampled_in_database(self, *mocks):
+        start = timezone.now()
+        RatingChange.objects.bulk_create([
+            RatingChange(user=self.user, game_id=index, time=start + timedelta(days=index), rating=1500 + index, change=1)
+            for index in range(10)
+        ] + [RatingChange(user=self.friend, game_id=0, time=start, rating=1490, change=-10)])
+
+        histories = rating_histories([self.user.pk, self.friend.pk], max_points=4)
+
+        self.assertEqual([rating for _, rating in histories[self.user.pk]], [1500, 1503, 1506, 1509])
+        self.assertEqual([rating for _, rating in histories[self.friend.pk]], [1490])
+        self.assertEqual(len(rating_histories([self.user.pk], max_points=20)[self.user.pk]), 10)
+
+    def test_rate_game_against_the_field(self, *mocks):
+        ratings = rate_game({1: INITIAL_RATING, 2: INITIAL_RATING, 3: 1700.0}, {1: 0, 2: 0, 3: 0}, 50)
+
+        self.assertAlmostEqual(ratings[1], ratings[2])
+        self.assertGreater(ratings[1], INITIAL_RATING)
+        self.assertLess(ratings[3], 1700.0)
+
+    def test_invalid_parameters(self, *mocks):
+        response = self.get(limit=1000, min_games=0)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data), {'limit', 'min_games'})
+
+    def test_requires_authentication(self, *mocks):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
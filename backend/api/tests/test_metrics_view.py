@@ -0,0 +1,97 @@
+from unittest.mock import patch
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.core import mail
+from django.test import override_settings
+from django.urls import reverse
+from api.metrics import REQUESTS, SMTP_FAILURES, record_cache
+from api.models import Game, PlayerToGame
+from api.summaries import get_summary
+from api.tasks import send_game_summary_email
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_TOKEN='', CELERY_BROKER_URL='memory://')
+class MetricsViewTest(APITestCase):
+
+    def setUp(self):
+        self.superuser = User.objects.create_superuser(username="admin", password="password123")
+        self.user = User.objects.create_user(username="user1", password="password123", email="player@example.com")
+        self.game = Game.objects.create(code="METRIC12", creator=self.superuser)
+        PlayerToGame.objects.create(player=self.user, game=self.game)
+        self.url = reverse('metrics')
+
+    def summary(self):
+        Game.objects.filter(pk=self.game.pk).update(is_end=True)
+        self.game.refresh_from_db()
+        return get_summary(self.game)
+
+    def requests_count(self, view, status_code):
+        return REQUESTS.labels(view=view, method='GET', status=status_code)._value.get()
+
+    def test_counts_requests_per_view(self):
+        self.client.force_authenticate(user=self.user)
+        before = self.requests_count('game-data', 200)
+
+        self.client.get(reverse('game-data', args=[self.game.code]))
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertEqual(self.requests_count('game-data', 200), before + 1)
+        body = response.content.decode()
+        self.assertIn('cashboard_http_requests_total{method="GET",status="200",view="game-data"}', body)
+        self.assertIn('cashboard_http_request_duration_seconds_bucket{le="0.005",view="game-data"}', body)
+        self.assertIn('cashboard_http_request_db_queries_count{view="game-data"}', body)
+
+    def test_scrapes_are_not_counted(self):
+        self.client.get(self.url)
+
+        response = self.client.get(self.url)
+
+        self.assertNotIn('view="metrics"', response.content.decode())
+
+    def test_cache_lookups(self):
+        record_cache('test-cache', hit=True)
+        record_cache('test-cache', hit=False)
+
+        body = self.client.get(self.url).content.decode()
+
+        self.assertIn('cashboard_cache_requests_total{cache="test-cache",result="hit"}', body)
+        self.assertIn('cashboard_cache_requests_total{cache="test-cache",result="miss"}', body)
+
+    def test_celery_task_metrics(self):
+        # Runs the task in this process, sending the signals a worker would.
+        result = send_game_summary_email.apply(args=(self.summary().pk, self.user.pk))
+
+        self.assertTrue(result.successful())
+        self.assertEqual(len(mail.outbox), 1)
+        body = self.client.get(self.url).content.decode()
+        self.assertIn(
+            'cashboard_celery_tasks_total{state="SUCCESS",task="api.tasks.send_game_summary_email"}', body,
+        )
+        self.assertIn('cashboard_celery_task_duration_seconds_count{task="api.tasks.send_game_summary_email"}', body)
+
+    def test_smtp_failures_are_counted(self):
+        failures = SMTP_FAILURES.labels(task='api.tasks.send_game_summary_email')
+        before = failures._value.get()
+
+        with patch('api.tasks.EmailMultiAlternatives.send', side_effect=ConnectionRefusedError):
+            with self.assertRaises(ConnectionRefusedError):
+                send_game_summary_email(self.summary().pk, self.user.pk)
+
+        self.assertEqual(failures._value.get(), before + 1)
+
+    @override_settings(METRICS_TOKEN='scrape-secret')
+    def test_token_required(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+        response = self.client.get(self.url, HTTP_AUTHORIZATION='Bearer scrape-secret')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_disabled(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,209 @@
+import os
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+from api.codes import SEQUENCE_NAME
+from api.models import Action, Debts, Game, PlayerToGame, Statistics, UserProfile
+
+
+# Maximum number of queries per URL name. Every endpoint is measured at each data scale and must
+# stay within its budget and issue the same number of queries regardless of the scale.
+QUERY_BUDGETS = {
+    'check_superuser': 0,
+    'user-detail': 0,
+    'register': 6,
+    'get_token': 3,
+    'refresh': 0,
+    'create-game': 4,
+    'join-game': 2,
+    'player-list': 2,
+    'player-action': 3,
+    'check-player-in-game': 1,
+    'game-data': 3,
+    'game-additional-data': 1,
+    'end-game': 17,
+    'game-summary': 6,
+    'game-timeline': 2,
+    'user-stats': 7,
+    'leaderboard': 2,
+    'user-games': 1,
+    'user-head-to-head': 1,
+    'debt-settlement': 2,
+    'send-debt': 2,
+    'accept-debt': 2,
+    'user-plot-data': 1,
+    'request-timings': 0,
+}
+
+# Scale factors: number of players in the active game, and of ended games and debts in the user's history.
+SCALES = (1, 10, 100)
+
+# Set QUERY_BUDGET_REPORT=1 to print the measured counts.
+REPORT = os.environ.get('QUERY_BUDGET_REPORT') == '1'
+
+
+class QueryBudgetTest(APITestCase):
+
+    measured = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if REPORT and cls.measured:
+            print("\nQueries per URL name at scales " + " / ".join(f"{scale}x" for scale in SCALES))
+            for name, counts in sorted(cls.measured.items()):
+                print(f"  {name:<22} budget {QUERY_BUDGETS[name]:>3}   " + " / ".join(str(counts[scale]) for scale in SCALES))
+
+    def build(self, scale):
+        """Creates an active game with `scale` extra players and `scale` ended games in the user's history."""
+        self.admin = User.objects.create_superuser(username="admin", password="password123")
+        self.user = User.objects.create_user(username="player", password="password123", email="player@example.com")
+        User.objects.bulk_create([User(username=f"other{i}", email=f"other{i}@example.com") for i in range(scale + 1)])
+        others = list(User.objects.filter(username__startswith="other").order_by('id'))
+        UserProfile.objects.bulk_create([UserProfile(user=user, phone_number="500600700") for user in [self.user, *others]])
+
+        self.active_game = Game.objects.create(code="ACTIVE01", buy_in=50, creator=self.admin)
+        seats = PlayerToGame.objects.bulk_create(
+            [PlayerToGame(player=player, game=self.active_game) for player in [self.admin, self.user, *others[:scale]]]
+        )
+        Action.objects.bulk_create([Action(player_to_game=seat, multiplier=1) for seat in seats for _ in range(2)])
+
+        now = timezone.now()
+        games = Game.objects.bulk_create([
+            Game(code=f"ENDED{i:03d}", buy_in=50, is_end=True, end_time=now + timedelta(hours=3), game_time=timedelta(hours=3), creator=self.admin)
+            for i in range(scale)
+        ])
+        history = PlayerToGame.objects.bulk_create([
+            PlayerToGame(player=player, game=game) for game in games for player in (self.user, others[0], others[1])
+        ])
+        Statistics.objects.bulk_create([
+            Statistics(player_to_game=seat, buy_in=Decimal(100), cash_out=Decimal(100 + (i % 3 - 1) * 40))
+            for i, seat in enumerate(history)
+        ])
+        debts = Debts.objects.bulk_create(
+            [Debts(game=game, amount=Decimal(40), sender=self.user, reciver=others[1]) for game in games]
+            + [Debts(game=game, amount=Decimal(40), sender=others[0], reciver=self.user, is_send=True) for game in games]
+        )
+        self.outgoing_debt, self.incoming_debt = debts[0], debts[-1]
+        self.ended_game = games[0]
+        self.table = [self.admin, self.user, *others[:scale]]
+
+    # Requests per URL name: (user, method, url, data)
+
+    def request_check_superuser(self):
+        return self.user, 'get', reverse('check_superuser'), None
+
+    def request_user_detail(self):
+        return self.user, 'get', reverse('user-detail'), None
+
+    def request_register(self):
+        return None, 'post', reverse('register'), {
+            "username": "newuser", "password": "Str0ngPassw0rd!", "email": "new@example.com",
+            "first_name": "New", "last_name": "User", "phone_number": "123456789",
+        }
+
+    def request_get_token(self):
+        return None, 'post', reverse('get_token'), {"username": "player", "password": "password123"}
+
+    def request_refresh(self):
+        return None, 'post', reverse('refresh'), {"refresh": str(RefreshToken.for_user(self.user))}
+
+    def request_create_game(self):
+        return self.admin, 'post', reverse('create-game'), {"buy_in": 50, "blind": "0.50"}
+
+    def request_join_game(self):
+        newcomer = User.objects.create_user(username="newcomer", password="password123")
+        return newcomer, 'post', reverse('join-game'), {"room_code": self.active_game.code}
+
+    def request_player_list(self):
+        return self.admin, 'get', reverse('player-list', args=[self.active_game.code]), None
+
+    def request_player_action(self):
+        return self.user, 'post', reverse('player-action', args=[self.active_game.code]), {"action": "rebuy", "username": "player"}
+
+    def request_check_player_in_game(self):
+        return self.user, 'get', reverse('check-player-in-game', args=[self.active_game.code]), None
+
+    def request_game_data(self):
+        return self.user, 'get', reverse('game-data', args=[self.active_game.code]), None
+
+    def request_game_additional_data(self):
+        return self.user, 'get', reverse('game-additional-data', args=[self.active_game.code]), None
+
+    def request_game_timeline(self):
+        return self.user, 'get', reverse('game-timeline', args=[self.active_game.code]), None
+
+    def request_end_game(self):
+        players = [{"player": player.username, "buy_in": 100, "cash_out": 100} for player in self.table]
+        players[0]["cash_out"], players[1]["cash_out"] = 150, 50
+        return self.admin, 'post', reverse('end-game', args=[self.active_game.code]), {"players": players}
+
+    def request_game_summary(self):
+        return self.user, 'get', reverse('game-summary', args=[self.ended_game.code]), None
+
+    def request_user_stats(self):
+        return self.user, 'get', reverse('user-stats'), None
+
+    def request_leaderboard(self):
+        return self.user, 'get', reverse('leaderboard'), None
+
+    def request_user_games(self):
+        return self.user, 'get', reverse('user-games'), None
+
+    def request_user_head_to_head(self):
+        return self.user, 'get', reverse('user-head-to-head'), None
+
+    def request_debt_settlement(self):
+        return self.user, 'get', reverse('debt-settlement'), None
+
+    def request_send_debt(self):
+        return self.user, 'post', reverse('send-debt', args=[self.outgoing_debt.id]), None
+
+    def request_accept_debt(self):
+        return self.user, 'post', reverse('accept-debt', args=[self.incoming_debt.id]), None
+
+    def request_user_plot_data(self):
+        return self.user, 'get', reverse('user-plot-data'), None
+
+    def request_request_timings(self):
+        return self.admin, 'get', reverse('request-timings'), None
+
+    def measure(self, name):
+        counts = {}
+        for scale in SCALES:
+            cache.clear()
+            with transaction.atomic():
+                self.build(scale)
+                user, method, url, data = getattr(self, f"request_{name.replace('-', '_')}")()
+                self.client.force_authenticate(user=user)
+
+                with CaptureQueriesContext(connection) as queries:
+                    response = getattr(self.client, method)(url, data, format='json')
+
+                self.assertLess(response.status_code, 400, f"{name} at {scale}x: {response.data}")
+                # Game code blocks are reserved once per hundred games, whichever request needs one, and the
+                # savepoints of the views' atomic blocks are transactions of their own outside this test.
+                counts[scale] = len([
+                    query for query in queries
+                    if SEQUENCE_NAME not in query['sql'] and not query['sql'].startswith(('SAVEPOINT', 'RELEASE SAVEPOINT'))
+                ])
+                transaction.set_rollback(True)
+        return counts
+
+    def check_budget(self, name):
+        counts = self.measure(name)
+        self.measured[name] = counts
+
+        self.assertLessEqual(max(counts.values()), QUERY_BUDGETS[name], f"{name} exceeds its query budget: {counts}")
+        self.assertEqual(len(set(counts.values())), 1, f"{name} query count grows with data size: {counts}")
+
+
+for _name in QUERY_BUDGETS:
+    setattr(QueryBudgetTest, f"test_{_name.replace('-', '_')}", lambda self, name=_name: self.check_budget(name))
@@ -0,0 +1,63 @@
+from decimal import Decimal
+from django.contrib.auth.models import User
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase
+from api.models import Action, Debts, Game, PlayerToGame, Statistics
+
+
+class QueryPlanTest(TestCase):
+    """Checks that the hot queries are planned on the indexes added for them.
+
+    Statistics are refreshed first and, as the tables are tiny, PostgreSQL is told to avoid
+    sequential scans when it has a choice.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        # A history shaped like production: many games and seats, debts mostly settled.
+        cls.user = User.objects.create_user(username="player", password="password123")
+        others = User.objects.bulk_create([User(username=f"other{i}") for i in range(20)])
+        games = Game.objects.bulk_create([Game(code=f"PLANS{i:03d}", creator=cls.user) for i in range(100)])
+        seats = PlayerToGame.objects.bulk_create([
+            PlayerToGame(player=player, game=game) for game in games for player in (cls.user, *others[:4])
+        ])
+        Action.objects.bulk_create([Action(player_to_game=seat) for seat in seats for _ in range(3)])
+        Statistics.objects.bulk_create([Statistics(player_to_game=seat, buy_in=Decimal(100), cash_out=Decimal(100)) for seat in seats])
+        Debts.objects.bulk_create([
+            Debts(game=game, amount=Decimal(50), sender=sender, reciver=receiver, is_send=True, is_accepted=index > 1)
+            for index, game in enumerate(games) for sender, receiver in ((cls.user, others[0]), (others[1], cls.user))
+        ] + [Debts(game=games[0], amount=Decimal(50), sender=cls.user, reciver=others[2])])
+        cls.seat = seats[0]
+
+    def assertUsesIndex(self, queryset, index_name):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, f"{index_name} is not used by:\n{plan}")
+
+    def test_statistics_by_player_in_cash_out_order(self):
+        queryset = Statistics.objects.filter(player_to_game__player=self.user).order_by('cash_out_time')
+
+        self.assertUsesIndex(queryset, 'stats_unique_player_to_game')
+
+    def test_last_action_of_player(self):
+        queryset = Action.objects.filter(player_to_game=self.seat).order_by('-action_time')[:1]
+
+        self.assertUsesIndex(queryset, 'action_player_time_idx')
+
+    def test_rebuys_of_player(self):
+        queryset = Action.objects.filter(player_to_game=self.seat).values('player_to_game').annotate(total=Sum('multiplier'))
+
+        self.assertUsesIndex(queryset, 'action_player_time_idx')
+
+    def test_open_outgoing_debts(self):
+        queryset = Debts.objects.filter(sender=self.user, is_send=False, is_accepted=False)
+
+        self.assertUsesIndex(queryset, 'debts_open_outgoing_idx')
+
+    def test_open_incoming_debts(self):
+        queryset = Debts.objects.filter(reciver=self.user, is_send=True, is_accepted=False)
+
+        self.assertUsesIndex(queryset, 'debts_open_incoming_idx')
@@ -0,0 +1,51 @@
+import io
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from django.test import SimpleTestCase
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from api.renderers import ORJSONParser, ORJSONRenderer
+
+
+class ORJSONRendererTest(SimpleTestCase):
+
+    def test_matches_drf_output(self):
+        data = {
+            'amount': Decimal('12.50'),
+            'labels': [date(2024, 1, 2), datetime(2024, 1, 2, 20, 30, 15, 123456, tzinfo=timezone.utc)],
+            'game_time': timedelta(hours=3, minutes=15),
+            'id': uuid.UUID('12345678-1234-5678-1234-567812345678'),
+            'name': 'Łukasz ',
+            3: [1, 2.5, None, True],
+        }
+
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_non_finite_floats_render_as_null(self):
+        data = {'rates': [float('nan'), float('inf'), -float('inf'), 1.5]}
+
+        self.assertEqual(ORJSONRenderer().render(data), b'{"rates":[null,null,null,1.5]}')
+        with self.assertRaises(ValueError):
+            JSONRenderer().render(data)
+
+    def test_none_renders_empty_body(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+    def test_indent_falls_back_to_drf(self):
+        rendered = ORJSONRenderer().render({'a': 1}, 'application/json; indent=2')
+
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+
+class ORJSONParserTest(SimpleTestCase):
+
+    def test_matches_drf_parser(self):
+        body = b'{"players": [{"player": "user1", "buy_in": 100, "cash_out": 150.5}]}'
+
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+
+    def test_invalid_json(self):
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"players": '))
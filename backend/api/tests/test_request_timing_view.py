@@ -0,0 +1,62 @@
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from api.middleware import timing_histogram
+from api.models import Game, PlayerToGame
+
+
+@override_settings(REQUEST_TIMING=True)
+class RequestTimingViewTest(APITestCase):
+
+    def setUp(self):
+        self.superuser = User.objects.create_superuser(username="admin", password="password123")
+        self.user = User.objects.create_user(username="user1", password="password123")
+        self.game = Game.objects.create(code="TIMING12", creator=self.superuser)
+        PlayerToGame.objects.create(player=self.user, game=self.game)
+        self.url = reverse('request-timings')
+        timing_histogram.clear()
+
+    def test_server_timing_header(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(reverse('game-data', args=[self.game.code]))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        header = response['Server-Timing']
+        self.assertRegex(header, r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+        self.assertIn('serialize;dur=', header)
+        self.assertIn('total;dur=', header)
+
+    def test_logs_structured_line(self):
+        self.client.force_authenticate(user=self.user)
+
+        with self.assertLogs('api.timing', level='INFO') as logs:
+            self.client.get(reverse('game-data', args=[self.game.code]))
+
+        self.assertIn('"url_name": "game-data"', logs.output[0])
+        self.assertIn('"status": 200', logs.output[0])
+
+    def test_superuser_reads_histogram(self):
+        self.client.force_authenticate(user=self.user)
+        self.client.get(reverse('game-data', args=[self.game.code]))
+        self.client.get(reverse('game-data', args=[self.game.code]))
+
+        self.client.force_authenticate(user=self.superuser)
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['enabled'])
+        stats = response.data['endpoints']['game-data']
+        self.assertEqual(stats['count'], 2)
+        self.assertGreater(stats['queries_avg'], 0)
+        self.assertEqual(sum(stats['histogram'].values()), 2)
+
+    def test_non_superuser_forbidden(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(response.data['detail'], "Only superusers can view request timings.")
@@ -0,0 +1,88 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from rest_framework.test import APITestCase
+from rest_framework import status
+from django.contrib.auth.models import User
+from django.urls import reverse
+from api.archive import archive_game
+from api.models import Game, PlayerToGame, Statistics
+
+
+class UserGamesViewTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(username="user1", password="password123")
+        self.friend = User.objects.create_user(username="friend", password="password123")
+        self.other = User.objects.create_user(username="other", password="password123")
+        self.url = reverse('user-games')
+        # Five ended games on consecutive days, the friend plays in the even ones.
+        self.games = [
+            self.create_game(f"HIST{day:04d}", datetime(2024, 3, day + 1, 18, tzinfo=dt_timezone.utc), with_friend=day % 2 == 0)
+            for day in range(5)
+        ]
+        Game.objects.create(code="ACTIVE01", creator=self.user)
+        PlayerToGame.objects.create(player=self.user, game=Game.objects.get(code="ACTIVE01"))
+
+    def create_game(self, code, start, with_friend):
+        game = Game.objects.create(code=code, creator=self.user, buy_in=50, is_end=True)
+        Game.objects.filter(pk=game.pk).update(start_time=start, end_time=start + timedelta(hours=3), game_time=timedelta(hours=3))
+        game.refresh_from_db()
+        for player, result in ((self.user, 20), (self.friend if with_friend else self.other, -20)):
+            seat = PlayerToGame.objects.create(player=player, game=game)
+            Statistics.objects.create(player_to_game=seat, buy_in=Decimal(100), cash_out=Decimal(100 + result))
+        return game
+
+    def get(self, **params):
+        self.client.force_authenticate(user=self.user)
+        return self.client.get(self.url, params)
+
+    def codes(self, response):
+        return [game['code'] for game in response.data['games']]
+
+    def test_lists_ended_games_newest_first(self):
+        response = self.get()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.codes(response), ["HIST0004", "HIST0003", "HIST0002", "HIST0001", "HIST0000"])
+        game = response.data['games'][0]
+        self.assertEqual((game['duration'], game['buy_in'], game['result'], game['players']), (3.0, 50, '20.00', 2))
+        self.assertIsNone(response.data['next'])
+
+    def test_cursor_pagination(self):
+        first = self.get(limit=2)
+        second = self.get(limit=2, before=first.data['next'])
+        last = self.get(limit=2, before=second.data['next'])
+
+        self.assertEqual(self.codes(first) + self.codes(second) + self.codes(last), [f"HIST{day:04d}" for day in range(4, -1, -1)])
+        self.assertIsNone(last.data['next'])
+
+    def test_games_with_same_start_time_are_paginated_by_id(self):
+        Game.objects.filter(code__startswith="HIST").update(start_time=datetime(2024, 3, 1, 18, tzinfo=dt_timezone.utc))
+
+        first = self.get(limit=3)
+        second = self.get(limit=3, before=first.data['next'])
+
+        self.assertEqual(sorted(self.codes(first) + self.codes(second)), [f"HIST{day:04d}" for day in range(5)])
+
+    def test_filters(self):
+        self.assertEqual(self.codes(self.get(**{'from': '2024-03-02', 'to': '2024-03-03'})), ["HIST0002", "HIST0001"])
+        self.assertEqual(self.codes(self.get(**{'with': 'friend'})), ["HIST0004", "HIST0002", "HIST0000"])
+
+    def test_archived_games_included(self):
+        archive_game(self.games[2].pk)
+
+        response = self.get(**{'with': 'friend'})
+
+        self.assertEqual(self.codes(response), ["HIST0004", "HIST0002", "HIST0000"])
+        self.assertEqual(response.data['games'][1]['players'], 2)
+
+    def test_invalid_parameters(self):
+        response = self.get(before="not-a-cursor", to="2024-02-30", limit=1000)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data), {'before', 'to', 'limit'})
+
+    def test_requires_authentication(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
@@ -1,3 +1,6 @@
+import struct
+from datetime import date
+import msgpack
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.contrib.auth.models import User
@@ -11,29 +14,26 @@ class UserPlotDataViewTest(APITestCase):
         # Tworzenie użytkownika
         self.user = User.objects.create_user(username="user1", password="password123")
 
-        # Tworzenie gry
-        self.game = Game.objects.create(
-            code="GAME1234",
-            buy_in=100,
-            blind=5,
-            creator=self.user
-        )
-
-        # Tworzenie gracza w grze
-        self.player_to_game = PlayerToGame.objects.create(
-            player=self.user,
-            game=self.game
-        )
+        # Tworzenie gier, w każdej gracz wypłaca się raz
+        self.games = [
+            Game.objects.create(
+                code=f"GAME123{i}",
+                buy_in=100,
+                blind=5,
+                creator=self.user
+            )
+            for i in range(5)
+        ]
 
         # Tworzenie danych statystyk
         self.stats = [
             Statistics.objects.create(
-                player_to_game=self.player_to_game,
+                player_to_game=PlayerToGame.objects.create(player=self.user, game=game),
                 cash_out_time=now() - timedelta(days=i),
                 cash_out=200 + (i * 10),
                 buy_in=100 + (i * 5)
             )
-            for i in range(5)
+            for i, game in enumerate(self.games)
         ]
 
         # Endpoint widoku
@@ -83,3 +83,36 @@ class UserPlotDataViewTest(APITestCase):
         self.assertEqual(response.data['labels'], [])
         self.assertEqual(response.data['single_game_results'], [])
         self.assertEqual(response.data['cumulative_results'], [])
+
+    def test_get_user_plot_data_columnar(self):
+        self.authenticate()
+
+        response = self.client.get(self.url, {'format': 'columnar'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/vnd.cashboard.columnar+json')
+
+        data = response.json()
+        epoch_day = (self.stats[0].cash_out_time.date() - date(1970, 1, 1)).days
+        self.assertEqual(data['length'], 5)
+        self.assertEqual(data['types'], {'labels': 'epoch_day', 'single_game_results': 'cents', 'cumulative_results': 'cents'})
+        self.assertEqual(data['columns']['labels'], [epoch_day] * 5)
+        self.assertEqual(data['columns']['single_game_results'], [10000, 10500, 11000, 11500, 12000])
+        self.assertEqual(data['columns']['cumulative_results'], [10000, 20500, 31500, 43000, 55000])
+
+    def test_get_user_plot_data_msgpack(self):
+        self.authenticate()
+
+        response = self.client.get(self.url, HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+
+        data = msgpack.unpackb(response.content)
+        self.assertEqual(data['length'], 5)
+        self.assertEqual(data['dtypes']['cumulative_results'], 'int32')
+        self.assertEqual(list(struct.unpack('<5i', data['columns']['cumulative_results'])), [10000, 20500, 31500, 43000, 55000])
+
+    def test_get_user_plot_data_columnar_error(self):
+        response = self.client.get(self.url, {'format': 'columnar'})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertIn('detail', response.json())
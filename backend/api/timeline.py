@@ -0,0 +1,67 @@
+"""Rebuy timeline of a game: each player's cumulative buy-ins and the money on the table over time.
+
+Both series come out of a single query with window functions over the game's actions, ordered by
+`action_time`. An ended game's timeline is written into its summary document (see
+`api.summaries`) before its actions are compacted, and served from there. Games compacted before
+timelines existed only have each player's total at their last action (see `api.compaction`).
+"""
+
+from django.db.models import F, Sum, Window
+from rest_framework import serializers
+
+from api.models import Action, ActionSummary
+
+
+_time = serializers.DateTimeField().to_representation
+
+
+def game_timeline(game):
+    """Returns `{'players': [{'name', 'points'}], 'table': points}` with `[time, amount]` points in PLN."""
+    order = [F('action_time').asc(), F('id').asc()]
+    rows = (
+        Action.objects.filter(player_to_game__game=game)
+        .annotate(
+            player_total=Window(Sum('multiplier'), partition_by=[F('player_to_game')], order_by=order),
+            table_total=Window(Sum('multiplier'), order_by=order),
+        )
+        .order_by('action_time', 'id')
+        .values_list('action_time', 'player_to_game__player__username', 'player_total', 'table_total')
+    )
+    rows = list(rows)
+    if not rows and game.actions_compacted:
+        order = [F('last_action_time').asc(), F('id').asc()]
+        rows = list(
+            ActionSummary.objects.filter(player_to_game__game=game)
+            .annotate(table_total=Window(Sum('multiplier'), order_by=order))
+            .order_by('last_action_time', 'id')
+            .values_list('last_action_time', 'player_to_game__player__username', 'multiplier', 'table_total')
+        )
+
+    players = {}
+    table = []
+    for action_time, username, player_total, table_total in rows:
+        time = _time(action_time)
+        players.setdefault(username, []).append([time, player_total * game.buy_in])
+        table.append([time, table_total * game.buy_in])
+
+    return {
+        'players': [{'name': name, 'points': points} for name, points in sorted(players.items())],
+        'table': table,
+    }
+
+
+def downsample(points, max_points):
+    """Keeps at most `max_points` evenly spaced points, always including the last one (the final total)."""
+    if max_points is None or len(points) <= max_points:
+        return points
+    if max_points == 1:
+        return points[-1:]
+    step = (len(points) - 1) / (max_points - 1)
+    return [points[index] for index in sorted({round(position * step) for position in range(max_points)})]
+
+
+def downsample_timeline(timeline, max_points):
+    return {
+        'players': [{'name': player['name'], 'points': downsample(player['points'], max_points)} for player in timeline['players']],
+        'table': downsample(timeline['table'], max_points),
+    }
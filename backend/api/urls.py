@@ -1,7 +1,7 @@
 from django.urls import path
 from .views import CreateUserView
 from django.urls import path
-from .views import CheckSuperuserStatusView, CreateUserView, MyTokenObtainPairView, GameCreateView, JoinGameView, PlayerListView, PlayerActionView, CheckPlayerInGameView, GameDataView, GameAdditionalDataView, EndGameView, UserDetailView, UserStatsView, DebtSettlementView, SendDebtView, AcceptDebtView, UserPlotDataView
+from .views import CheckSuperuserStatusView, CreateUserView, MyTokenObtainPairView, GameCreateView, JoinGameView, PlayerListView, PlayerActionView, CheckPlayerInGameView, GameDataView, GameAdditionalDataView, GameSummaryView, GameTimelineView, EndGameView, UserDetailView, UserStatsView, LeaderboardView, UserGamesView, UserHeadToHeadView, DebtSettlementView, SendDebtView, AcceptDebtView, UserPlotDataView, RequestTimingStatsView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
 urlpatterns = [
@@ -18,10 +18,16 @@ urlpatterns = [
     path('games/<str:game_code>/data/', GameDataView.as_view(), name='game-data'),
     path('games/<str:game_code>/additional-data/', GameAdditionalDataView.as_view(), name='game-additional-data'),
     path('games/<str:game_code>/end-game/', EndGameView.as_view(), name='end-game'),
+    path('games/<str:game_code>/summary/', GameSummaryView.as_view(), name='game-summary'),
+    path('games/<str:game_code>/timeline/', GameTimelineView.as_view(), name='game-timeline'),
     path('user/stats/', UserStatsView.as_view(), name='user-stats'),
+    path('user/games/', UserGamesView.as_view(), name='user-games'),
+    path('leaderboard/', LeaderboardView.as_view(), name='leaderboard'),
+    path('user/head-to-head/', UserHeadToHeadView.as_view(), name='user-head-to-head'),
     path('debts/', DebtSettlementView.as_view(), name='debt-settlement'),
     path('debts/send/<int:debt_id>/', SendDebtView.as_view(), name='send-debt'),
     path('debts/accept/<int:debt_id>/', AcceptDebtView.as_view(), name='accept-debt'),
     path('user/plot-data/', UserPlotDataView.as_view(), name='user-plot-data'),
+    path('debug/timings/', RequestTimingStatsView.as_view(), name='request-timings'),
 ]
 
@@ -1,4 +1,7 @@
 from django.shortcuts import render, get_object_or_404
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from django.contrib.auth.models import User
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
@@ -7,17 +10,36 @@ from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework.exceptions import PermissionDenied, NotFound, ValidationError
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from adrf.views import APIView as AsyncAPIView
 from django.utils import timezone
-from django.db.models import Sum, F, DurationField, Avg, ExpressionWrapper, Max
+from django.utils.dateparse import parse_date
+from django.db.models import Count, Sum, F, DurationField, ExpressionWrapper, Max
 from django.db import transaction
 from decimal import Decimal
 from datetime import datetime, timedelta
 from collections import defaultdict
-from api.tasks import send_game_summary_email
-from .models import Game, PlayerToGame, Action, Statistics, Debts
+from functools import partial
+from api.tasks import compact_game_actions, send_game_summary_email
+from api.middleware import timing_histogram
+from api.metrics import build_registry
+from api.permissions import GameMixin, IsGameAdmin, IsGameMember
+from api.renderers import ColumnarJSONRenderer, MsgPackRenderer
+from api.compaction import rebuys
+from api.settlement import compute_transfers
+from api.summaries import aget_summary, create_summary, get_summary, immutable_response, save_summary
+from api.history import decode_cursor, encode_cursor, game_history
+from api.timeline import downsample_timeline, game_timeline
+from api.head_to_head import record_game
+from api.ratings import rating_histories, update_ratings
+from api.analytics import user_intervals
+from django.conf import settings
+from django.core.cache import cache
+from .models import Game, GameSummary, HeadToHead, PlayerRating, PlayerToGame, Action, ArchivedResult, ArchivedTotals, Statistics, Debts
 from .serializers import (
     UserSerializer, GameSerializer, PlayerToGameSerializer, PlayerActionSerializer, 
-    GameDataSerializer, GameAdditionalDataSerializer, PlayerDataSerializer, UserStatsSerializer
+    GameDataSerializer, GameAdditionalDataSerializer, PlayerDataSerializer, UserStatsSerializer, GameHistorySerializer,
+    HeadToHeadSerializer, LeaderboardSerializer,
 )
 
 
@@ -88,51 +110,61 @@ class GameCreateView(generics.CreateAPIView):
         return Response({"code": self.game_code}, status=status.HTTP_201_CREATED)
 
 
-class JoinGameView(APIView):
+class JoinGameView(GameMixin, APIView):
     """Allows authenticated users to join a game using a room code."""
     permission_classes = [IsAuthenticated]
+    game_not_found_message = "The game with the specified code was not found."
 
     def post(self, request, *args, **kwargs):
         room_code = request.data.get('room_code')
         if not room_code:
             raise ValidationError({"room_code": "This field is required."})
 
-        try:
-            game = Game.objects.get(code=room_code)
-        except Game.DoesNotExist:
-            raise NotFound("The game with the specified code was not found.")
+        game, is_member = self.get_game_access(room_code)
 
         if game.is_end:
             raise PermissionDenied("Cannot join a game that has already ended.")
 
-        if PlayerToGame.objects.filter(player=request.user, game=game).exists():
+        if is_member:
             return Response({"detail": "Already attached to this game."}, status=status.HTTP_400_BAD_REQUEST)
 
         PlayerToGame.objects.create(player=request.user, game=game)
         return Response({"detail": "Included in the game!"}, status=status.HTTP_200_OK)
 
 
-class PlayerListView(generics.ListAPIView):
+class PlayerListView(GameMixin, AsyncAPIView):
     """Retrieves a list of players in a given game session."""
     permission_classes = [IsAuthenticated]
     serializer_class = PlayerToGameSerializer
+    game_not_found_message = "No Game matches the given query."
 
-    def get(self, request, game_code, *args, **kwargs):
-        game = get_object_or_404(Game, code=game_code)
+    async def get(self, request, game_code, *args, **kwargs):
+        game = self.game
 
-        if request.user.is_superuser:
-            players = PlayerToGame.objects.filter(game=game)
-        else:
-            players = PlayerToGame.objects.filter(game=game, player=request.user)
+        if game.is_end:
+            summary = await aget_summary(game)
+            players = [
+                {'name': player['username'], 'stack': player['stack']}
+                for player in summary.document['players']
+                if request.user.is_superuser or player['id'] == request.user.id
+            ]
+            variant = 'all' if request.user.is_superuser else request.user.id
+            return immutable_response(request, summary, {'players': players, 'buy_in': game.buy_in}, 'players', variant)
+
+        players = PlayerToGame.objects.filter(game=game).select_related('player').annotate(
+            stack=rebuys() * F('game__buy_in')
+        )
+        if not request.user.is_superuser:
+            players = players.filter(player=request.user)
 
-        serializer = self.serializer_class(players, many=True)
+        serializer = self.serializer_class([player async for player in players], many=True)
         return Response({
             'players': serializer.data,
             'buy_in': game.buy_in
         })
 
 
-class PlayerActionView(APIView):
+class PlayerActionView(GameMixin, APIView):
     """Handles player actions such as 'rebuy' and 'back' within a game."""
 
     permission_classes = [IsAuthenticated]
@@ -144,20 +176,18 @@ class PlayerActionView(APIView):
         player_username = serializer.validated_data['username']
         user = request.user
 
+        # The actions of ended games are final (and compacted, see api.compaction).
+        if self.game.is_end:
+            return Response({"detail": "The game has already ended."}, status=status.HTTP_409_CONFLICT)
+
         # Manual validation of action type
         if action_type not in ['rebuy', 'back']:
             return Response({"detail": "Unknown action type."}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Find the game
-        try:
-            game = Game.objects.get(code=game_code)
-        except Game.DoesNotExist:
-            raise NotFound("Game not found.")
-
         # Find the player in the game
         try:
-            player_to_game = PlayerToGame.objects.select_related('player', 'game').get(
-                player__username=player_username, game=game
+            player_to_game = PlayerToGame.objects.select_related('player').get(
+                player__username=player_username, game=self.game
             )
         except PlayerToGame.DoesNotExist:
             raise NotFound(f"Player '{player_username}' is not associated with this game.")
@@ -183,7 +213,7 @@ class PlayerActionView(APIView):
             return Response({"detail": f"The last rebuy was undone for {player_to_game.player.username}!"}, status=status.HTTP_200_OK)
         return Response({"detail": f"Player {player_to_game.player.username} has no actions to undo."}, status=status.HTTP_400_BAD_REQUEST)
     
-class CheckPlayerInGameView(APIView):
+class CheckPlayerInGameView(GameMixin, AsyncAPIView):
     """API View to check if a player is part of a game and whether the game is still active.
     
     - If the game does not exist, returns a `404 Not Found` response.
@@ -193,7 +223,7 @@ class CheckPlayerInGameView(APIView):
 
     permission_classes = [IsAuthenticated]  # Only authenticated users can access this endpoint.
 
-    def get(self, request, game_code):
+    async def get(self, request, game_code):
         """Handles GET requests to check the player's participation in a game.
         
         Returns:
@@ -202,12 +232,7 @@ class CheckPlayerInGameView(APIView):
         - `game_code`: The unique identifier for the game.
         """
 
-        try:
-            game = Game.objects.get(code=game_code)
-        except Game.DoesNotExist:
-            raise NotFound("Game not found.")
-
-        if game.is_end:
+        if self.game.is_end:
             return Response(
                 {
                     'is_in_game': False,  
@@ -217,11 +242,9 @@ class CheckPlayerInGameView(APIView):
                 status=status.HTTP_410_GONE 
             )
 
-        is_in_game = PlayerToGame.objects.filter(player=request.user, game=game).exists()
-
         return Response(
             {
-                'is_in_game': is_in_game,  
+                'is_in_game': self.is_game_member,
                 'is_game_ended': False, 
                 'game_code': game_code,
             },
@@ -229,29 +252,27 @@ class CheckPlayerInGameView(APIView):
         )
 
 
-class GameDataView(APIView):
-    """Provides statistics and financial data related to a specific game session."""
-    permission_classes = [IsAuthenticated]
+class GameDataView(GameMixin, AsyncAPIView):
+    """Provides statistics and financial data related to a specific game session (players only)."""
+    permission_classes = [IsAuthenticated, IsGameMember]
+    game_not_found_message = "Game not found"
+    game_access_denied_message = "You do not have access to this game."
 
-    def get(self, request, game_code):
-        try:
-            # Retrieve the game by its code
-            game = Game.objects.get(code=game_code)
-        except Game.DoesNotExist:
-            return Response({"detail": "Game not found"}, status=status.HTTP_404_NOT_FOUND)
-
-        # Check if the user is assigned to the game
-        if not PlayerToGame.objects.filter(player=request.user, game=game).exists():
-            # Raise 403 Forbidden if the user is not assigned to the game
-            raise PermissionDenied("You do not have access to this game.")
+    async def get(self, request, game_code):
+        game = self.game
+
+        if game.is_end:
+            summary = await aget_summary(game)
+            return immutable_response(request, summary, summary.document['table'], 'table')
 
         # Calculate the total money on the table from player actions
-        total_money_on_table = Action.objects.filter(player_to_game__game=game).aggregate(
+        total_money_on_table = (await Action.objects.filter(player_to_game__game=game).aaggregate(
             total=Sum(F('multiplier') * F('player_to_game__game__buy_in'))
-        )['total'] or 0  # Default to 0 if there are no actions
+        ))['total']
+        total_money_on_table = total_money_on_table or 0  # Default to 0 if there are no actions
 
         # Count the number of players in the game
-        number_of_players = PlayerToGame.objects.filter(game=game).count()
+        number_of_players = await PlayerToGame.objects.filter(game=game).acount()
 
         # Calculate the average stack
         avg_stack = total_money_on_table / number_of_players if number_of_players > 0 else 0
@@ -270,31 +291,87 @@ class GameDataView(APIView):
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class GameAdditionalDataView(APIView):
-    """Retrieves additional data related to a specific game session."""
+class GameAdditionalDataView(GameMixin, APIView):
+    """Retrieves additional data related to a specific game session (players only)."""
 
-    permission_classes = [IsAuthenticated]
+    permission_classes = [IsAuthenticated, IsGameMember]
+    game_not_found_exception = PermissionDenied
+    game_not_found_message = game_access_denied_message = "You do not have access to this game or the game does not exist."
 
     def get(self, request, game_code):
-        try:
-            game = Game.objects.filter(code=game_code, players__player=request.user).distinct().get()
-        except Game.DoesNotExist:
-            raise PermissionDenied("You do not have access to this game or the game does not exist.")
+        if self.game.is_end:
+            summary = get_summary(self.game)
+            return immutable_response(request, summary, summary.document['settings'], 'settings')
 
-        serializer = GameAdditionalDataSerializer(game)
+        serializer = GameAdditionalDataSerializer(self.game)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
-class EndGameView(APIView):
-    """Handles the process of ending a game, calculating statistics, settling debts, and sending summary emails."""
+class GameTimelineView(GameMixin, APIView):
+    """Retrieves each player's cumulative buy-ins and the money on the table over time (players only).
+
+    `?max_points=N` keeps at most N evenly spaced points per series (see `api.timeline.downsample`).
+    Ended games are served from their summary as immutable responses.
+    """
+
+    permission_classes = [IsAuthenticated, IsGameMember]
+    game_not_found_message = "Game not found"
+    game_access_denied_message = "You do not have access to this game."
+
+    def get(self, request, game_code):
+        max_points = request.query_params.get('max_points')
+        if max_points is not None:
+            try:
+                max_points = int(max_points)
+            except ValueError:
+                max_points = 0
+            if max_points < 1:
+                raise ValidationError({"max_points": "Enter a positive number."})
+
+        game = self.game
+        if not game.is_end:
+            timeline = downsample_timeline(game_timeline(game), max_points)
+            return Response({'buy_in': game.buy_in, **timeline})
+
+        summary = get_summary(game)
+        timeline = summary.document.get('timeline')
+        if timeline is None:
+            # Summaries written before timelines existed; the game's actions are final, so is its timeline.
+            timeline = cache.get_or_set(f'game-timeline:{game.pk}', partial(game_timeline, game), None)
+        timeline = downsample_timeline(timeline, max_points)
+        return immutable_response(request, summary, {'buy_in': game.buy_in, **timeline}, 'timeline', max_points)
+
+
+class GameSummaryView(APIView):
+    """Retrieves the full summary of an ended game, archived or not (its players and superusers only).
+
+    The summary never changes, so it is sent with a strong ETag and `Cache-Control: immutable`.
+    """
 
     permission_classes = [IsAuthenticated]
 
-    def post(self, request, game_code, *args, **kwargs):
-        if not request.user.is_superuser:
-            raise PermissionDenied("Only superusers can end the game.")
+    def get(self, request, game_code):
+        summary = GameSummary.objects.filter(code=game_code).first()
+        if summary is None:
+            game = Game.objects.filter(code=game_code, is_end=True).first()
+            if game is None:
+                raise NotFound("No ended game matches the given code.")
+            summary = create_summary(game)
+
+        if not request.user.is_superuser and all(player['id'] != request.user.id for player in summary.document['players']):
+            raise PermissionDenied("You do not have access to this game.")
+
+        return immutable_response(request, summary, summary.document, 'summary')
 
-        game = get_object_or_404(Game, code=game_code)
+
+class EndGameView(GameMixin, APIView):
+    """Handles the process of ending a game, calculating statistics, settling debts, and sending summary emails."""
+
+    permission_classes = [IsAuthenticated, IsGameAdmin]
+    game_admin_message = "Only superusers can end the game."
+    game_not_found_message = "No Game matches the given query."
+
+    def post(self, request, game_code, *args, **kwargs):
         serializer = PlayerDataSerializer(data=request.data.get('players', []), many=True)
         serializer.is_valid(raise_exception=True)
 
@@ -303,8 +380,11 @@ class EndGameView(APIView):
         if not players_data:
             return Response({"detail": "No player data provided."}, status=status.HTTP_400_BAD_REQUEST)
 
-        players = User.objects.filter(username__in=[p['player'] for p in players_data])
-        if players.count() != len(players_data):
+        players = {
+            user.username: user
+            for user in User.objects.filter(username__in=[p['player'] for p in players_data]).select_related('userprofile')
+        }
+        if len(players) != len(players_data):
             return Response({"detail": "Some players do not exist."}, status=status.HTTP_404_NOT_FOUND)
 
         total_balance = sum(player.get('cash_out', 0) - player.get('buy_in', 0) for player in players_data)
@@ -314,101 +394,85 @@ class EndGameView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        for player_data in players_data:
-            player = players.get(username=player_data['player'])
-            player_to_game = PlayerToGame.objects.filter(player=player, game=game).first()
-
-            if not player_to_game:
-                return Response({"detail": f"Player {player.username} is not part of this game."}, status=status.HTTP_404_NOT_FOUND)
-
-            Statistics.objects.create(
-                player_to_game=player_to_game,
-                buy_in=Decimal(player_data['buy_in']),
-                cash_out=Decimal(player_data['cash_out']),
-                cash_out_time=timezone.now()
-            )
-
-        transactions = self.settle_debts(players_data, game)
-
-        game.is_end = True
-        game.end_time = timezone.now()
-        game.game_time = game.end_time - game.start_time
-        game.save()
-
-        for player_data in players_data:
-            player = players.get(username=player_data['player'])
-            if player.email:  
-                game_duration = Decimal(game.game_time.total_seconds()) / Decimal(3600) if game.game_time else Decimal(0)
-
-                buy_in = Decimal(player_data["buy_in"])
-                cash_out = Decimal(player_data["cash_out"])
-
-                total_pot = sum(Decimal(p["cash_out"]) for p in players_data)
-
-                avg_stack = Decimal(total_pot) / Decimal(len(players_data)) if len(players_data) > 0 else Decimal(0)
+        with transaction.atomic():
+            # Concurrent requests ending the same game wait here; the later ones see it ended.
+            game = Game.objects.select_for_update().get(pk=self.game.pk)
+            if game.is_end:
+                return Response({"detail": "The game has already ended."}, status=status.HTTP_409_CONFLICT)
+
+            player_to_games = {
+                player_to_game.player_id: player_to_game
+                for player_to_game in PlayerToGame.objects.filter(game=game, player__in=players.values())
+            }
+            statistics = []
+            for player_data in players_data:
+                player = players[player_data['player']]
+                player_to_game = player_to_games.get(player.id)
+
+                if not player_to_game:
+                    return Response({"detail": f"Player {player.username} is not part of this game."}, status=status.HTTP_404_NOT_FOUND)
+
+                statistics.append(Statistics(
+                    player_to_game=player_to_game,
+                    buy_in=Decimal(player_data['buy_in']),
+                    cash_out=Decimal(player_data['cash_out']),
+                    cash_out_time=timezone.now()
+                ))
+            Statistics.objects.bulk_create(statistics)
+            results = {
+                players[player_data['player']].id: player_data['cash_out'] - player_data['buy_in']
+                for player_data in players_data
+            }
+            record_game(results)
 
-                profit = cash_out - buy_in
+            transactions = self.settle_debts(players_data, game, players)
 
-                profit_per_hour = profit / game_duration if game_duration > 0 else Decimal(0)
+            game.is_end = True
+            game.end_time = timezone.now()
+            game.game_time = game.end_time - game.start_time
+            game.save()
+            update_ratings(game, results)
+            summary = save_summary(game, transactions)
 
-                game_data = {
-                    "game_date": str(game.start_time.date()),  
-                    "game_duration": round(game_duration, 2),
-                    "buy_in": buy_in,
-                    "cash_out": cash_out,
-                    "total_pot": total_pot,
-                    "avg_stack": round(avg_stack, 2),
-                    "profit": profit,
-                    "profit_per_hour": round(profit_per_hour, 2),
-                }
+            for player_data in players_data:
+                player = players[player_data['player']]
+                if player.email:
+                    # Only once the settlement is committed, so a failed request sends nothing.
+                    transaction.on_commit(partial(send_game_summary_email.delay, summary.pk, player.id))
 
-                send_game_summary_email.delay(player.email, game_data, transactions)
+            transaction.on_commit(partial(compact_game_actions.delay, game.pk))
 
         return Response({"detail": "The game has been successfully ended and emails have been sent."}, status=status.HTTP_200_OK)
 
-    def settle_debts(self, players_data, game):
-        players = []
-
-        for player_data in players_data:
-            player_name = player_data.get('player')
-            buy_in = player_data.get('buy_in', 0)
-            cash_out = player_data.get('cash_out', 0)
-            balance = cash_out - buy_in
-
-            players.append({
-                'username': player_name,
-                'balance': balance
-            })
+    def settle_debts(self, players_data, game, players):
+        """Creates the debts settling the game and returns them as transactions for the game summary.
 
-        debtors = [p for p in players if p['balance'] < 0]
-        creditors = [p for p in players if p['balance'] > 0]
+        `players` maps usernames to `User` objects (with profiles selected), so no per-transfer queries are made.
+        """
+        balances = [
+            (player_data.get('player'), player_data.get('cash_out', 0) - player_data.get('buy_in', 0))
+            for player_data in players_data
+        ]
 
+        debts = []
         transactions = []
 
-        while debtors and creditors:
-            debtor = debtors[0]
-            creditor = creditors[0]
-
-            transaction_amount = min(-debtor['balance'], creditor['balance'])
-
-            debtor['balance'] += transaction_amount
-            creditor['balance'] -= transaction_amount
-
-            debtor_user = User.objects.get(username=debtor['username'])
-            creditor_user = User.objects.get(username=creditor['username'])
+        for debtor_name, creditor_name, transaction_amount in compute_transfers(balances):
+            debtor_user = players[debtor_name]
+            creditor_user = players[creditor_name]
 
             try:
                 creditor_phone = creditor_user.userprofile.phone_number
             except AttributeError:
                 creditor_phone = "Brak numeru"
 
-            Debts.objects.create(
+            debts.append(Debts(
                 game=game,
                 amount=Decimal(transaction_amount),
                 sender=debtor_user,
                 reciver=creditor_user,
                 is_send=False
-            )
+            ))
 
             transactions.append({
                 "game": game.code,
@@ -418,11 +482,7 @@ class EndGameView(APIView):
                 "phone": creditor_phone 
             })
 
-            if debtor['balance'] == 0:
-                debtors.pop(0)
-            if creditor['balance'] == 0:
-                creditors.pop(0)
-
+        Debts.objects.bulk_create(debts)
         return transactions
 
 
@@ -435,11 +495,11 @@ class UserStatsView(APIView):
     def get(self, request):
         user = request.user
         stats = Statistics.objects.filter(player_to_game__player=user).aggregate(
-            total_earn=Sum(F('cash_out') - F('buy_in')),
             highest_win=Max(F('cash_out') - F('buy_in')),
             total_buy_in=Sum('buy_in'),
             total_cash_out=Sum('cash_out'),
-            average_stake=Avg('buy_in'),
+            results=Count('id'),
+            last_result=Max('id'),
         )
 
         games = Game.objects.filter(players__player=user).annotate(
@@ -447,15 +507,29 @@ class UserStatsView(APIView):
         )
 
         total_play_time = games.aggregate(total_time=Sum('duration'))['total_time'] or timedelta()
-        total_hours_played = Decimal(total_play_time.total_seconds() / 3600)
-        total_earn = stats['total_earn'] or Decimal(0)
-        highest_win = stats['highest_win'] or Decimal(0)
         total_buy_in = stats['total_buy_in'] or Decimal(0)
         total_cash_out = stats['total_cash_out'] or Decimal(0)
-        average_stake = stats['average_stake'] or Decimal(0)
+        highest_win = stats['highest_win']
+        results = stats['results']
+        games_played = PlayerToGame.objects.filter(player=user).count()
+
+        # Games moved to the archive tier are counted through their precomputed totals (see api.archive).
+        archived = ArchivedTotals.objects.filter(user=user).first()
+        if archived:
+            total_play_time += archived.play_time
+            total_buy_in += archived.total_buy_in
+            total_cash_out += archived.total_cash_out
+            if archived.highest_win is not None:
+                highest_win = archived.highest_win if highest_win is None else max(highest_win, archived.highest_win)
+            results += archived.results
+            games_played += archived.games_played
+
+        total_hours_played = Decimal(total_play_time.total_seconds() / 3600)
+        total_earn = total_cash_out - total_buy_in
+        highest_win = highest_win or Decimal(0)
+        average_stake = (total_buy_in / results) if results else Decimal(0)
         win_rate = (total_cash_out / total_buy_in) if total_buy_in else Decimal(0)
         hourly_rate = (total_earn / total_hours_played) if total_hours_played else Decimal(0)
-        games_played = PlayerToGame.objects.filter(player=user).count()
 
         data = {
             'earn': round(total_earn, 2),
@@ -468,12 +542,142 @@ class UserStatsView(APIView):
             'total_buyin': round(total_buy_in, 2),
         }
 
+        # The number of results, live and archived, and the latest live one change when one of the user's games ends.
+        intervals = user_intervals(user, f"{results}:{stats['last_result']}")
+        for name, interval in intervals.items():
+            data[f'{name}_interval'] = [round(bound, 2) for bound in interval] if interval else None
+
+        data['rating'] = PlayerRating.objects.filter(user=user).values_list('rating', flat=True).first()
+        data['rating_history'] = rating_histories([user.pk]).get(user.pk, [])
+
         serializer = UserStatsSerializer(data)
         return Response(serializer.data)
 
 
 
-class DebtSettlementView(APIView):
+class LeaderboardView(APIView):
+    """Lists the players with the highest skill ratings (see `api.ratings`) with their rating histories.
+
+    Query parameters:
+    - `limit`: Number of players (default `LEADERBOARD_SIZE`, at most `LEADERBOARD_MAX_SIZE`).
+    - `min_games`: Only players with at least this many rated games (default 1).
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        errors = {}
+
+        try:
+            limit = int(params.get('limit', settings.LEADERBOARD_SIZE))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= settings.LEADERBOARD_MAX_SIZE:
+            errors['limit'] = f"Enter a number between 1 and {settings.LEADERBOARD_MAX_SIZE}."
+
+        try:
+            min_games = int(params.get('min_games', 1))
+        except ValueError:
+            min_games = 0
+        if min_games < 1:
+            errors['min_games'] = "Enter a positive number."
+
+        if errors:
+            raise ValidationError(errors)
+
+        ratings = list(
+            PlayerRating.objects.filter(games__gte=min_games)
+            .select_related('user')
+            .order_by('-rating', 'user__username')[:limit]
+        )
+        histories = rating_histories([rating.user_id for rating in ratings])
+        for rating in ratings:
+            rating.history = histories.get(rating.user_id, [])
+
+        return Response({'players': LeaderboardSerializer(ratings, many=True).data})
+
+
+class UserGamesView(APIView):
+    """Lists the ended games of the authenticated user, newest first, live and archived.
+
+    Query parameters:
+    - `before`: Cursor of the next page, as returned in `next`.
+    - `from`, `to`: Only games started on or between these dates (`YYYY-MM-DD`).
+    - `with`: Only games played together with the user with this username.
+    - `limit`: Games per page (default `GAME_HISTORY_PAGE_SIZE`, at most `GAME_HISTORY_MAX_PAGE_SIZE`).
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = request.query_params
+        errors = {}
+
+        before = None
+        if params.get('before'):
+            try:
+                before = decode_cursor(params['before'])
+            except ValueError:
+                errors['before'] = "Invalid cursor."
+
+        dates = {}
+        for name in ('from', 'to'):
+            value = params.get(name)
+            try:
+                dates[name] = parse_date(value) if value else None
+            except ValueError:  # Well formed but invalid, e.g. 2024-02-30
+                dates[name] = None
+            if value and dates[name] is None:
+                errors[name] = "Enter a date in the YYYY-MM-DD format."
+
+        try:
+            limit = int(params.get('limit', settings.GAME_HISTORY_PAGE_SIZE))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= settings.GAME_HISTORY_MAX_PAGE_SIZE:
+            errors['limit'] = f"Enter a number between 1 and {settings.GAME_HISTORY_MAX_PAGE_SIZE}."
+
+        if errors:
+            raise ValidationError(errors)
+
+        # One game more than the page tells whether there is a next page.
+        games = game_history(request.user, limit + 1, before, dates['from'], dates['to'], params.get('with'))
+        page = games[:limit]
+        next_cursor = encode_cursor(page[-1]['game_start'], page[-1]['game_id']) if len(games) > limit else None
+
+        return Response({
+            'games': GameHistorySerializer(page, many=True).data,
+            'next': next_cursor,
+        })
+
+
+class UserHeadToHeadView(APIView):
+    """Lists the authenticated user's results against each player they played with, most games together first.
+
+    Query parameters:
+    - `min_games`: Only players with at least this many games together (default 1).
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            min_games = int(request.query_params.get('min_games', 1))
+        except ValueError:
+            min_games = 0
+        if min_games < 1:
+            raise ValidationError({'min_games': "Enter a positive number."})
+
+        rows = (
+            HeadToHead.objects.filter(user=request.user, games__gte=min_games)
+            .select_related('opponent')
+            .order_by('-games', 'opponent__username')
+        )
+        return Response({'opponents': HeadToHeadSerializer(rows, many=True).data})
+
+
+class DebtSettlementView(AsyncAPIView):
     """Retrieves the list of outstanding debts for the authenticated user.
     
     This includes:
@@ -483,7 +687,7 @@ class DebtSettlementView(APIView):
 
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
+    async def get(self, request):
         user = request.user
 
         # Retrieve debts where the user is the sender (not yet sent)
@@ -510,7 +714,7 @@ class DebtSettlementView(APIView):
                 'type': 'outgoing',
                 'game_date': debt['game__start_time'].strftime('%d-%m-%Y') if debt['game__start_time'] else None
             }
-            for debt in outgoing_debts
+            async for debt in outgoing_debts
         ]
 
         incoming = [
@@ -523,7 +727,7 @@ class DebtSettlementView(APIView):
                 'type': 'incoming',
                 'game_date': debt['game__start_time'].strftime('%d-%m-%Y') if debt['game__start_time'] else None
             }
-            for debt in incoming_debts
+            async for debt in incoming_debts
         ]
 
         return Response(outgoing + incoming)
@@ -570,15 +774,23 @@ class UserPlotDataView(APIView):
     - Labels: Dates of game results.
     - Single game results: Profit/loss for each game.
     - Cumulative results: Accumulated earnings over time.
+
+    With `?format=columnar` or `Accept: application/msgpack`, dates are sent as epoch days and
+    results as integer grosze (see `api.renderers.to_columnar`).
     """
 
     permission_classes = [IsAuthenticated]
+    renderer_classes = [*api_settings.DEFAULT_RENDERER_CLASSES, ColumnarJSONRenderer, MsgPackRenderer]
+    series_columns = {'labels': 'epoch_day', 'single_game_results': 'cents', 'cumulative_results': 'cents'}
 
     def get(self, request):
         user = request.user
 
-        # Retrieve statistics for the user, ordered by cash-out time
-        stats = Statistics.objects.filter(player_to_game__player=user).order_by('cash_out_time')
+        # Retrieve the user's live and archived results, ordered by cash-out time
+        stats = Statistics.objects.filter(player_to_game__player=user).values_list('cash_out_time', 'buy_in', 'cash_out').union(
+            ArchivedResult.objects.filter(player=user, cash_out_time__isnull=False).values_list('cash_out_time', 'buy_in', 'cash_out'),
+            all=True,
+        ).order_by('cash_out_time')
 
         # Data for visualization
         labels = []
@@ -587,9 +799,9 @@ class UserPlotDataView(APIView):
         cumulative_sum = 0  # To track total cumulative earnings
 
         # Process each game record
-        for stat in stats:
-            date = stat.cash_out_time.date()
-            result = stat.cash_out - stat.buy_in  # Profit or loss
+        for cash_out_time, buy_in, cash_out in stats:
+            date = cash_out_time.date()
+            result = cash_out - buy_in  # Profit or loss
 
             labels.append(date)
             single_game_results.append(result)
@@ -603,3 +815,37 @@ class UserPlotDataView(APIView):
             'single_game_results': single_game_results,
             'cumulative_results': cumulative_results,
         })
+
+
+class RequestTimingStatsView(APIView):
+    """Returns the rolling per-endpoint timing histograms of this worker process (superusers only).
+
+    Data is collected by `RequestTimingMiddleware` when `REQUEST_TIMING` is enabled.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if not request.user.is_superuser:
+            raise PermissionDenied("Only superusers can view request timings.")
+
+        return Response({
+            'enabled': settings.REQUEST_TIMING,
+            'window': timing_histogram.window,
+            'endpoints': timing_histogram.snapshot(),
+        })
+
+
+def metrics_view(request):
+    """Exposes the Prometheus metrics of the API and the Celery workers in the text format.
+
+    Available when `METRICS_ENABLED` is set; with `METRICS_TOKEN`, the scraper must send it as a bearer token.
+    """
+    if not settings.METRICS_ENABLED:
+        raise Http404()
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not constant_time_compare(request.headers.get('Authorization', ''), expected):
+            return HttpResponse("Invalid metrics token.", status=401, content_type='text/plain')
+
+    return HttpResponse(generate_latest(build_registry()), content_type=CONTENT_TYPE_LATEST)
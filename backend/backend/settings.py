@@ -12,6 +12,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 
 from pathlib import Path
 from datetime import timedelta
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 import os
 
@@ -26,6 +27,15 @@ load_dotenv()
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = os.getenv("SECRET_KEY")
 
+# Key of the game code permutation (api/codes.py); never change it once games exist, so it is not
+# derived from SECRET_KEY, which may be rotated
+GAME_CODE_KEY = os.getenv("GAME_CODE_KEY")
+if not GAME_CODE_KEY:
+    raise ImproperlyConfigured("The GAME_CODE_KEY environment variable must be set.")
+
+# Creator of games created without one (imports, scripts); empty for none
+GAME_DEFAULT_CREATOR_USERNAME = os.getenv("GAME_DEFAULT_CREATOR_USERNAME", "karski")
+
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = True
 
@@ -46,6 +56,15 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    "DEFAULT_RENDERER_CLASSES": [
+        "api.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "api.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
 }
 
 SIMPLE_JWT = {
@@ -69,7 +88,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.middleware.RequestTimingMiddleware',
+    'api.middleware.PrometheusMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -79,6 +101,31 @@ MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware'
 ]
 
+# Per-request query count and timing (Server-Timing header, `api.timing` log, superuser endpoint)
+REQUEST_TIMING = os.getenv('REQUEST_TIMING', 'False') == 'True'
+
+# Prometheus metrics at /metrics; set PROMETHEUS_MULTIPROC_DIR to aggregate several worker processes
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'False') == 'True'
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+# Multiprocess directories /metrics aggregates (colon-separated), by default PROMETHEUS_MULTIPROC_DIR
+METRICS_COLLECT_DIRS = [path for path in os.getenv('METRICS_COLLECT_DIRS', '').split(':') if path]
+
+# Responses of at least this many bytes are compressed with brotli or gzip
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', 1024))
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'api.timing': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
 ROOT_URLCONF = 'backend.urls'
 
 TEMPLATES = [
@@ -103,6 +150,16 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# Connection reuse:
+# - DB_CONN_MAX_AGE keeps each worker's connection open between requests (seconds, 0 closes it
+#   after every request); CONN_HEALTH_CHECKS replaces connections that went away in the meantime.
+# - DB_POOL=True uses psycopg 3's connection pool instead (mutually exclusive with CONN_MAX_AGE).
+#   DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE / DB_POOL_TIMEOUT size the pool of each worker process.
+# - DB_PGBOUNCER=True makes the settings safe behind PgBouncer in transaction pooling mode:
+#   server-side cursors are disabled (prepared statements are already off with psycopg 3).
+DB_POOL = os.getenv('DB_POOL', 'False') == 'True'
+DB_PGBOUNCER = os.getenv('DB_PGBOUNCER', 'False') == 'True'
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.postgresql',
@@ -111,9 +168,42 @@ DATABASES = {
         'PASSWORD': os.getenv('POSTGRES_PASSWORD'),
         'HOST': os.getenv('POSTGRES_HOST', 'localhost'),
         'PORT': os.getenv('POSTGRES_PORT', '5432'),
+        'CONN_MAX_AGE': 0 if DB_POOL else int(os.getenv('DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+        'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER,
+        'OPTIONS': {},
+    }
+}
+
+if DB_POOL:
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 10)),
+        'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+    }
+
+# Redis (CACHE_URL=redis://redis:6379/1) shares the cache between workers; the default is per process
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('CACHE_URL'),
+    } if os.getenv('CACHE_URL') else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
+# Seconds a game and its players' membership are served from the cache to polling requests
+GAME_ACCESS_CACHE_TTL = int(os.getenv('GAME_ACCESS_CACHE_TTL', 5))
+
+
+# Games per page of the game history (/api/user/games/), by default and at most
+GAME_HISTORY_PAGE_SIZE = int(os.getenv('GAME_HISTORY_PAGE_SIZE', 20))
+GAME_HISTORY_MAX_PAGE_SIZE = 100
+
+# Players on the leaderboard (/api/leaderboard/), by default and at most
+LEADERBOARD_SIZE = int(os.getenv('LEADERBOARD_SIZE', 20))
+LEADERBOARD_MAX_SIZE = 100
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -171,3 +261,13 @@ EMAIL_HOST_PASSWORD = os.getenv('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'CashBoard <info@toughspot.pl>')
 
 CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
+
+# Ended games whose actions were not compacted after EndGameView are picked up by celery beat,
+# ACTION_COMPACTION_BATCH games per run.
+ACTION_COMPACTION_BATCH = int(os.getenv('ACTION_COMPACTION_BATCH', 100))
+CELERY_BEAT_SCHEDULE = {
+    'compact-ended-games': {
+        'task': 'api.tasks.compact_ended_games',
+        'schedule': timedelta(hours=1),
+    },
+}
@@ -0,0 +1,44 @@
+"""Time of the bootstrap confidence intervals of UserStatsView (see `api.analytics`) for a
+player with --games games, with the intervals of the last run.
+
+The games are generated in memory, so no database is needed.
+
+Usage:
+    python -m benchmarks.bootstrap [--games 1000] [--resamples 10000] [--repeat 50]
+"""
+
+import argparse
+
+from benchmarks.common import print_table, setup_django, summarize, timed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--resamples', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    setup_django()
+    import numpy as np
+    from api.analytics import confidence_intervals
+
+    rng = np.random.default_rng(args.seed)
+    buy_ins = 50 * rng.integers(1, 6, args.games)
+    values = np.column_stack([
+        buy_ins,
+        np.maximum(buy_ins + rng.normal(0, 100, args.games).round(2), 0),
+        rng.uniform(2, 6, args.games),
+    ])
+
+    intervals = {}
+    samples = timed(lambda: intervals.update(confidence_intervals(values, args.resamples, rng=rng)), args.repeat)
+    row = {'games': args.games, 'resamples': args.resamples, **summarize(samples)}
+    for name, (low, high) in intervals.items():
+        row[name] = f'{low:.2f} .. {high:.2f}'
+    print_table([row], list(row))
+
+
+if __name__ == '__main__':
+    main()
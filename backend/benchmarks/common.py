@@ -0,0 +1,56 @@
+"""Shared helpers for the scripts in this package.
+
+Benchmarks are run from the `backend` directory as modules, e.g.
+`python -m benchmarks.db_connections`, against the database configured in `backend/.env`.
+"""
+
+import os
+import statistics
+import time
+
+
+def setup_django():
+    """Configures Django for a standalone script using the project settings."""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+    import django
+    django.setup()
+
+
+def percentile(samples, pct):
+    """Returns the `pct` percentile (0-100) of `samples` using linear interpolation."""
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(samples):
+    """Summarizes latency samples given in seconds as milliseconds."""
+    return {
+        'count': len(samples),
+        'mean_ms': round(statistics.fmean(samples) * 1000, 3) if samples else 0.0,
+        'p50_ms': round(percentile(samples, 50) * 1000, 3),
+        'p95_ms': round(percentile(samples, 95) * 1000, 3),
+        'p99_ms': round(percentile(samples, 99) * 1000, 3),
+    }
+
+
+def timed(func, repeat):
+    """Calls `func` `repeat` times and returns the duration of each call in seconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def print_table(rows, columns):
+    """Prints a list of dicts as an aligned plain-text table."""
+    widths = {c: max(len(c), *(len(str(row[c])) for row in rows)) for c in columns}
+    print('  '.join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print('  '.join(str(row[c]).ljust(widths[c]) for c in columns))
@@ -0,0 +1,107 @@
+"""Concurrency load test for the async read endpoints, to compare WSGI and ASGI serving modes.
+
+Start the server in one mode (SERVER_MODE=wsgi or asgi, see gunicorn.conf.py), then run:
+    python -m benchmarks.concurrency --label wsgi --username U --password P --game CODE --output wsgi.json
+and repeat for the other mode, passing `--compare wsgi.json` to print both side by side.
+
+For each concurrency level, N clients loop over the hot read endpoints (game data, player list,
+check-player, debts) for `--duration` seconds. The concurrency limit is the highest level whose
+p95 latency stays under `--slo-ms` with no errors.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+
+from benchmarks.common import print_table, summarize
+
+
+ENDPOINTS = (
+    '/api/games/{game}/data/',
+    '/api/games/{game}/players/',
+    '/api/games/{game}/check-player/',
+    '/api/debts/',
+)
+
+
+async def client_loop(client, paths, deadline, samples, errors):
+    index = 0
+    while time.perf_counter() < deadline:
+        path = paths[index % len(paths)]
+        index += 1
+        start = time.perf_counter()
+        try:
+            response = await client.get(path)
+            ok = response.status_code < 500
+        except httpx.HTTPError:
+            ok = False
+        if ok:
+            samples.append(time.perf_counter() - start)
+        else:
+            errors.append(path)
+
+
+async def run_level(base_url, token, paths, concurrency, duration):
+    samples, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    headers = {'Authorization': f'Bearer {token}'}
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(client_loop(client, paths, deadline, samples, errors) for _ in range(concurrency)))
+    return {
+        'concurrency': concurrency,
+        'throughput_rps': round(len(samples) / duration, 1),
+        'errors': len(errors),
+        **summarize(samples),
+    }
+
+
+def concurrency_limit(levels, slo_ms):
+    passing = [level['concurrency'] for level in levels if level['errors'] == 0 and level['p95_ms'] <= slo_ms]
+    return max(passing, default=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--username', required=True)
+    parser.add_argument('--password', required=True)
+    parser.add_argument('--game', required=True, help="Code of a game the user takes part in.")
+    parser.add_argument('--levels', default='1,4,16,32,64,128')
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per concurrency level.")
+    parser.add_argument('--slo-ms', type=float, default=250.0)
+    parser.add_argument('--label', default='server')
+    parser.add_argument('--output', help="Write results as JSON to this file.")
+    parser.add_argument('--compare', help="JSON results of a previous run to print alongside.")
+    args = parser.parse_args()
+
+    token = httpx.post(
+        f'{args.base_url}/api/token/', json={'username': args.username, 'password': args.password}
+    ).raise_for_status().json()['access']
+    paths = [endpoint.format(game=args.game) for endpoint in ENDPOINTS]
+
+    levels = [
+        asyncio.run(run_level(args.base_url, token, paths, int(level), args.duration))
+        for level in args.levels.split(',')
+    ]
+    result = {'label': args.label, 'slo_ms': args.slo_ms, 'levels': levels,
+              'concurrency_limit': concurrency_limit(levels, args.slo_ms)}
+
+    runs = [result]
+    if args.compare:
+        with open(args.compare) as f:
+            runs.insert(0, json.load(f))
+    for run in runs:
+        print(f"\n{run['label']}: concurrency limit {run['concurrency_limit']} (p95 <= {run['slo_ms']} ms)")
+        print_table(run['levels'], ['concurrency', 'throughput_rps', 'errors', 'p50_ms', 'p95_ms', 'p99_ms'])
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
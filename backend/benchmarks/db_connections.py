@@ -0,0 +1,78 @@
+"""Per-request latency with and without database connection reuse.
+
+Sends the same authenticated request through Django's full request cycle with:
+- `per-request`: CONN_MAX_AGE=0, a new PostgreSQL connection for every request (the old default),
+- `persistent`: CONN_MAX_AGE>0 with health checks, one connection reused by the worker,
+- `pool`: psycopg 3 connection pool (only when psycopg_pool is installed).
+
+Usage:
+    python -m benchmarks.db_connections [--requests 500] [--url /api/check-superuser/]
+"""
+
+import argparse
+
+from benchmarks.common import print_table, setup_django, summarize, timed
+
+
+MODES = {
+    'per-request': {'CONN_MAX_AGE': 0, 'pool': None},
+    'persistent': {'CONN_MAX_AGE': 600, 'pool': None},
+    'pool': {'CONN_MAX_AGE': 0, 'pool': {'min_size': 1, 'max_size': 4}},
+}
+
+
+def configure(connection, mode):
+    """Reconfigures the default connection in place for the given mode."""
+    connection.close()
+    connection.close_pool()
+    connection.settings_dict['CONN_MAX_AGE'] = MODES[mode]['CONN_MAX_AGE']
+    connection.settings_dict['CONN_HEALTH_CHECKS'] = True
+    options = connection.settings_dict.setdefault('OPTIONS', {})
+    options.pop('pool', None)
+    if MODES[mode]['pool']:
+        options['pool'] = MODES[mode]['pool']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--url', default='/api/check-superuser/')
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth.models import User
+    from django.db import connection
+    from django.test import Client, override_settings
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    try:
+        import psycopg_pool  # noqa: F401
+        modes = list(MODES)
+    except ImportError:
+        modes = ['per-request', 'persistent']
+
+    user, _ = User.objects.get_or_create(username='benchmark-db-connections')
+    client = Client(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+    original = dict(connection.settings_dict, OPTIONS=dict(connection.settings_dict.get('OPTIONS', {})))
+    rows = []
+
+    try:
+        with override_settings(ALLOWED_HOSTS=['testserver']):
+            for mode in modes:
+                configure(connection, mode)
+                timed(lambda: client.get(args.url), args.warmup)
+                rows.append({'mode': mode, **summarize(timed(lambda: client.get(args.url), args.requests))})
+    finally:
+        configure(connection, 'per-request')
+        connection.settings_dict.update(original)
+        user.delete()
+
+    print_table(rows, ['mode', 'count', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms'])
+    baseline = rows[0]['mean_ms']
+    for row in rows[1:]:
+        print(f"{row['mode']}: {baseline / row['mean_ms']:.1f}x faster than per-request on average")
+
+
+if __name__ == '__main__':
+    main()
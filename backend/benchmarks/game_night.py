@@ -0,0 +1,235 @@
+"""Game-night load scenario against a running server seeded with `manage.py generate_load_data`.
+
+Phases:
+1. The superuser (`<prefix>000000`) creates a game and `--players` load users log in and join it.
+2. For `--poll-seconds`, every player polls game data, the player list and check-player each
+   `--poll-interval` seconds while the superuser records rebuys.
+3. The superuser ends the game.
+4. Every player opens their stats, plot data and debts at the same time.
+
+Latency percentiles are reported per endpoint; query counts are read from the `Server-Timing`
+header, so run the server with REQUEST_TIMING=True to get them. Results are saved as JSON and
+can be compared with an earlier run:
+    python -m benchmarks.game_night --output before.json
+    python -m benchmarks.game_night --output after.json --compare before.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import re
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+from benchmarks.common import print_table, summarize
+
+
+RESULT_FORMAT = 1
+QUERIES_PATTERN = re.compile(r'desc="(\d+) queries"')
+
+
+class Recorder:
+    """Collects latency and query-count samples per endpoint name."""
+
+    def __init__(self):
+        self.latencies = {}
+        self.queries = {}
+        self.errors = {}
+
+    async def request(self, client, method, name, url, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[name] = self.errors.get(name, 0) + 1
+            return None
+        elapsed = time.perf_counter() - start
+
+        if response.status_code >= 400:
+            self.errors[name] = self.errors.get(name, 0) + 1
+        else:
+            self.latencies.setdefault(name, []).append(elapsed)
+            match = QUERIES_PATTERN.search(response.headers.get('Server-Timing', ''))
+            if match:
+                self.queries.setdefault(name, []).append(int(match.group(1)))
+        return response
+
+    def results(self):
+        names = sorted(set(self.latencies) | set(self.errors))
+        results = {}
+        for name in names:
+            queries = self.queries.get(name, [])
+            results[name] = {
+                **summarize(self.latencies.get(name, [])),
+                'errors': self.errors.get(name, 0),
+                'queries_avg': round(sum(queries) / len(queries), 2) if queries else None,
+                'queries_max': max(queries) if queries else None,
+            }
+        return results
+
+
+async def login(client, recorder, username, password):
+    response = await recorder.request(client, 'POST', 'token', '/api/token/', json={'username': username, 'password': password})
+    if response is None or response.status_code != 200:
+        raise SystemExit(f"Cannot log in as {username}; seed the server with generate_load_data first.")
+    return {'Authorization': f"Bearer {response.json()['access']}"}
+
+
+async def player_polling(client, recorder, headers, code, deadline, interval):
+    while time.perf_counter() < deadline:
+        await asyncio.gather(
+            recorder.request(client, 'GET', 'game-data', f'/api/games/{code}/data/', headers=headers),
+            recorder.request(client, 'GET', 'player-list', f'/api/games/{code}/players/', headers=headers),
+            recorder.request(client, 'GET', 'check-player-in-game', f'/api/games/{code}/check-player/', headers=headers),
+        )
+        await asyncio.sleep(interval)
+
+
+async def admin_rebuys(client, recorder, headers, code, usernames, deadline, rng, interval):
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(rng.uniform(0, 2 * interval))
+        await recorder.request(
+            client, 'POST', 'player-action', f'/api/games/{code}/action/',
+            headers=headers, json={'action': 'rebuy', 'username': rng.choice(usernames)},
+        )
+
+
+def end_game_payload(players, rng):
+    """Builds a zero-sum end-game payload from the players' current stacks."""
+    pot = sum(player['stack'] for player in players)
+    weights = [rng.random() for _ in players]
+    cash_outs = [int(pot * weight / sum(weights)) for weight in weights]
+    cash_outs[0] += pot - sum(cash_outs)
+    return {'players': [
+        {'player': player['name'], 'buy_in': player['stack'], 'cash_out': cash_out}
+        for player, cash_out in zip(players, cash_outs)
+    ]}
+
+
+async def run_scenario(args):
+    rng = random.Random(args.seed)
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.players * 3 + 5)
+
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60) as client:
+        admin = await login(client, recorder, f'{args.prefix}000000', args.password)
+        usernames = [f'{args.prefix}{index:06d}' for index in range(1, args.players + 1)]
+        players = await asyncio.gather(*(login(client, recorder, name, args.password) for name in usernames))
+
+        response = await recorder.request(client, 'POST', 'create-game', '/api/games/create/', headers=admin, json={'buy_in': 50, 'blind': '0.50'})
+        code = response.json()['code']
+        await asyncio.gather(*(
+            recorder.request(client, 'POST', 'join-game', '/api/games/join/', headers=headers, json={'room_code': code})
+            for headers in players
+        ))
+        for name in usernames:
+            await recorder.request(client, 'POST', 'player-action', f'/api/games/{code}/action/', headers=admin, json={'action': 'rebuy', 'username': name})
+
+        deadline = time.perf_counter() + args.poll_seconds
+        await asyncio.gather(
+            admin_rebuys(client, recorder, admin, code, usernames, deadline, rng, args.poll_interval),
+            *(player_polling(client, recorder, headers, code, deadline, args.poll_interval) for headers in players),
+        )
+
+        response = await recorder.request(client, 'GET', 'player-list', f'/api/games/{code}/players/', headers=admin)
+        table = [player for player in response.json()['players'] if player['name'] in usernames]
+        response = await recorder.request(client, 'POST', 'end-game', f'/api/games/{code}/end-game/', headers=admin, json=end_game_payload(table, rng))
+        if response is None or response.status_code != 200:
+            raise SystemExit(f"Ending the game failed: {response.text if response is not None else 'no response'}")
+
+        await asyncio.gather(*(
+            asyncio.gather(
+                recorder.request(client, 'GET', 'user-stats', '/api/user/stats/', headers=headers),
+                recorder.request(client, 'GET', 'user-plot-data', '/api/user/plot-data/', headers=headers),
+                recorder.request(client, 'GET', 'debt-settlement', '/api/debts/', headers=headers),
+            )
+            for headers in players
+        ))
+
+    return recorder.results()
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous, current, threshold):
+    """Prints the p95 change per endpoint; returns the endpoints that regressed beyond `threshold` percent."""
+    rows, regressions = [], []
+    for name, stats in current['endpoints'].items():
+        before = previous['endpoints'].get(name)
+        if not before or not before['p95_ms']:
+            continue
+        change = (stats['p95_ms'] - before['p95_ms']) / before['p95_ms'] * 100
+        queries_before, queries_after = before.get('queries_max'), stats.get('queries_max')
+        regressed = change > threshold or (queries_before is not None and queries_after is not None and queries_after > queries_before)
+        if regressed:
+            regressions.append(name)
+        rows.append({
+            'endpoint': name,
+            'p95_before': before['p95_ms'],
+            'p95_after': stats['p95_ms'],
+            'change_pct': f'{change:+.1f}',
+            'queries': f'{queries_before} -> {queries_after}',
+            'regressed': 'YES' if regressed else '',
+        })
+    print(f"\nCompared with {previous.get('label')} ({previous.get('git_revision')}):")
+    if rows:
+        print_table(rows, ['endpoint', 'p95_before', 'p95_after', 'change_pct', 'queries', 'regressed'])
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--prefix', default='load_', help="Username prefix used by generate_load_data.")
+    parser.add_argument('--password', default='load-password')
+    parser.add_argument('--players', type=int, default=9)
+    parser.add_argument('--poll-seconds', type=float, default=30)
+    parser.add_argument('--poll-interval', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--label', default='run')
+    parser.add_argument('--output', help="Write results as JSON to this file.")
+    parser.add_argument('--compare', help="JSON results of a previous run.")
+    parser.add_argument('--threshold', type=float, default=20.0, help="p95 increase (%%) reported as a regression.")
+    args = parser.parse_args()
+
+    endpoints = asyncio.run(run_scenario(args))
+    result = {
+        'format': RESULT_FORMAT,
+        'label': args.label,
+        'git_revision': git_revision(),
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'config': {key: getattr(args, key) for key in ('players', 'poll_seconds', 'poll_interval', 'seed')},
+        'endpoints': endpoints,
+    }
+
+    print_table(
+        [{'endpoint': name, **stats} for name, stats in endpoints.items()],
+        ['endpoint', 'count', 'errors', 'p50_ms', 'p95_ms', 'p99_ms', 'queries_avg', 'queries_max'],
+    )
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        if previous.get('format') != RESULT_FORMAT:
+            raise SystemExit("The results to compare were written in a different format.")
+        if compare(previous, result, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+"""Serialization time of representative API payloads: DRF's JSONRenderer against ORJSONRenderer,
+JSONParser against ORJSONParser, and the size and time of gzip and brotli compression.
+
+The payloads are built in memory with the same shapes and types the views return, so no
+database is needed:
+- `plot-data`: UserPlotDataView of a player with --games games (dates and Decimals),
+- `debts`: DebtSettlementView with --debts entries per direction,
+- `player-list`: PlayerListView of a 10-player table,
+- `end-game` (parsing only): the request body of EndGameView for 10 players.
+
+`plot-data` is also rendered in the columnar JSON and msgpack formats of UserPlotDataView, with
+the time to decode each representation (a stand-in for the client's parse time).
+
+Usage:
+    python -m benchmarks.serialization [--games 1000] [--debts 200] [--repeat 200]
+"""
+
+import argparse
+import brotli
+import gzip
+import io
+import random
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+
+from benchmarks.common import print_table, setup_django, summarize, timed
+
+
+def build_payloads(games, debts, rng):
+    start = date(2022, 1, 1)
+    results = [Decimal(rng.randrange(-30000, 30000)) / 100 for _ in range(games)]
+    cumulative, total = [], Decimal(0)
+    for result in results:
+        total += result
+        cumulative.append(total)
+    plot_data = {
+        'labels': [start + timedelta(days=3 * index) for index in range(games)],
+        'single_game_results': results,
+        'cumulative_results': cumulative,
+    }
+
+    def debt(index, key):
+        return {
+            'id': index,
+            key: f'player{index % 40}',
+            'phone_number': '500600700',
+            'amount': Decimal(rng.randrange(100, 50000)) / 100,
+            'date': datetime(2024, 1, 1, 21, tzinfo=timezone.utc) + timedelta(days=index),
+            'is_send': index % 2 == 0,
+            'is_accepted': index % 4 == 0,
+        }
+
+    debt_data = {
+        'debts_to_pay': [debt(index, 'receiver') for index in range(debts)],
+        'debts_to_receive': [debt(index, 'sender') for index in range(debts)],
+    }
+    player_list = {
+        'players': [
+            {'name': f'player{index}', 'stack': 50 * rng.randint(1, 6), 'is_active': True, 'is_admin': index == 0}
+            for index in range(10)
+        ],
+        'game_info': {'buy_in': 50, 'blind': Decimal('0.50'), 'total_pot': 1500},
+    }
+    end_game = {'players': [{'player': f'player{index}', 'buy_in': 100, 'cash_out': 100 + index} for index in range(10)]}
+    return {'plot-data': plot_data, 'debts': debt_data, 'player-list': player_list}, end_game
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--games', type=int, default=1000)
+    parser.add_argument('--debts', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    import msgpack
+    import orjson
+    from api.renderers import ColumnarJSONRenderer, MsgPackRenderer, ORJSONParser, ORJSONRenderer
+    from api.views import UserPlotDataView
+
+    payloads, end_game = build_payloads(args.games, args.debts, random.Random(args.seed))
+    renderers = {'drf-json': JSONRenderer(), 'orjson': ORJSONRenderer()}
+    rows = []
+
+    for name, data in payloads.items():
+        body = renderers['drf-json'].render(data)
+        for label, renderer in renderers.items():
+            samples = timed(lambda: renderer.render(data), args.repeat)
+            rows.append({'payload': name, 'step': f'render {label}', 'bytes': len(body), **summarize(samples)})
+
+        compressors = {
+            'gzip': lambda: gzip.compress(body, compresslevel=settings.COMPRESSION_GZIP_LEVEL, mtime=0),
+            'brotli': lambda: brotli.compress(body, quality=settings.COMPRESSION_BROTLI_QUALITY),
+        }
+        for label, compress in compressors.items():
+            size = len(compress())
+            rows.append({'payload': name, 'step': f'compress {label}', 'bytes': size, **summarize(timed(compress, args.repeat))})
+
+    context = {'view': UserPlotDataView()}
+    formats = {
+        'json': (ORJSONRenderer(), orjson.loads),
+        'columnar': (ColumnarJSONRenderer(), orjson.loads),
+        'msgpack': (MsgPackRenderer(), msgpack.unpackb),
+    }
+    for label, (renderer, decode) in formats.items():
+        body = renderer.render(payloads['plot-data'], renderer_context=context)
+        samples = timed(lambda: renderer.render(payloads['plot-data'], renderer_context=context), args.repeat)
+        rows.append({'payload': 'plot-data', 'step': f'render {label}', 'bytes': len(body), **summarize(samples)})
+        samples = timed(lambda: decode(body), args.repeat)
+        rows.append({'payload': 'plot-data', 'step': f'decode {label}', 'bytes': len(body), **summarize(samples)})
+
+    body = renderers['drf-json'].render(end_game)
+    for label, json_parser in {'drf-json': JSONParser(), 'orjson': ORJSONParser()}.items():
+        samples = timed(lambda: json_parser.parse(io.BytesIO(body)), args.repeat)
+        rows.append({'payload': 'end-game', 'step': f'parse {label}', 'bytes': len(body), **summarize(samples)})
+
+    print_table(rows, ['payload', 'step', 'bytes', 'mean_ms', 'p50_ms', 'p95_ms'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""Gunicorn configuration for both serving modes.
+
+SERVER_MODE=wsgi (default) runs `backend.wsgi` on sync workers.
+SERVER_MODE=asgi runs `backend.asgi` on uvicorn workers, so the async views
+(game data, player list, check-player, debts) no longer hold a worker while waiting on I/O.
+Under ASGI, prefer DB_POOL=True: persistent connections are not shared between async requests.
+"""
+
+import os
+
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', 3))
+
+if os.getenv('SERVER_MODE', 'wsgi') == 'asgi':
+    wsgi_app = 'backend.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+else:
+    wsgi_app = 'backend.wsgi:application'
+
+
+def on_starting(server):
+    """Clears the Prometheus samples left by a previous run from the backend's own directory."""
+    metrics_dir = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    if metrics_dir:
+        os.makedirs(metrics_dir, exist_ok=True)
+        for name in os.listdir(metrics_dir):
+            os.remove(os.path.join(metrics_dir, name))
+
+
+def child_exit(server, worker):
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Episode, UserEpisode
+from .models import Episode, EpisodeStats, UserEpisode
 
 @admin.register(Episode)
 class EpisodeAdmin(admin.ModelAdmin):
@@ -14,3 +14,10 @@ class UserEpisodeAdmin(admin.ModelAdmin):
     list_filter = ('watched', 'watched_date')
     search_fields = ('user__username', 'episode__title_en', 'episode__title_pl')
     ordering = ('user', 'episode')
+
+
+@admin.register(EpisodeStats)
+class EpisodeStatsAdmin(admin.ModelAdmin):
+    list_display = ('episode', 'watched_count', 'rating_count', 'average_rating')
+    ordering = ('episode__number',)
+    readonly_fields = [field.name for field in EpisodeStats._meta.fields]
@@ -0,0 +1,207 @@
+import csv
+import json
+import sys
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from op.models import Episode
+
+
+IMPORT_FIELDS = ('number', 'title_pl', 'title_en', 'release_date', 'is_filler', 'description', 'comment')
+REQUIRED_FIELDS = ('number', 'title_pl', 'title_en', 'release_date')
+BOOLEAN_VALUES = {'1': True, 'true': True, 'yes': True, 'y': True, '0': False, 'false': False, 'no': False, 'n': False}
+
+
+def iter_csv(stream):
+    """Yields one dict per CSV row, using the header line as keys."""
+    yield from csv.DictReader(stream)
+
+
+def iter_json_lines(stream):
+    """Yields one object per non-empty line of a JSON Lines stream."""
+    for line in stream:
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def iter_json_array(stream, chunk_size=64 * 1024):
+    """Yields the objects of a top-level JSON array without loading the whole document."""
+    decoder = json.JSONDecoder()
+    buffer = ''
+    started = False
+    eof = False
+
+    while True:
+        buffer = buffer.lstrip()
+        if not started:
+            if buffer:
+                if buffer[0] != '[':
+                    raise CommandError("JSON input must be an array of episode objects.")
+                buffer = buffer[1:]
+                started = True
+                continue
+        elif buffer.startswith(','):
+            buffer = buffer[1:]
+            continue
+        elif buffer.startswith(']'):
+            return
+        elif buffer:
+            try:
+                obj, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise CommandError("Malformed JSON input.")
+            else:
+                yield obj
+                buffer = buffer[end:]
+                continue
+
+        if eof:
+            raise CommandError("Unexpected end of JSON input.")
+        chunk = stream.read(chunk_size)
+        eof = not chunk
+        buffer += chunk
+
+
+READERS = {
+    'csv': iter_csv,
+    'json': iter_json_array,
+    'jsonl': iter_json_lines,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports episodes from a CSV, JSON or JSON Lines file and upserts them by episode number. "
+        "Existing comments are kept unless --overwrite-comment is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Input file, or '-' to read from stdin.")
+        parser.add_argument('--format', choices=sorted(READERS), help="Input format (defaults to the file extension).")
+        parser.add_argument('--batch-size', type=int, default=500, help="Number of rows upserted per query.")
+        parser.add_argument('--dry-run', action='store_true', help="Only report what would change.")
+        parser.add_argument('--overwrite-comment', action='store_true', help="Replace existing comments with imported ones.")
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be a positive number.")
+
+        input_format = options['format'] or self.guess_format(options['path'])
+        self.dry_run = options['dry_run']
+        self.overwrite_comment = options['overwrite_comment']
+        self.totals = {'created': 0, 'updated': 0, 'unchanged': 0}
+
+        stream = sys.stdin if options['path'] == '-' else open(options['path'], newline='', encoding='utf-8')
+        try:
+            rows = (self.clean_row(row, index) for index, row in enumerate(READERS[input_format](stream), start=1))
+            while True:
+                batch = list(islice(rows, options['batch_size']))
+                if not batch:
+                    break
+                self.process_batch(batch)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        created, updated, unchanged = self.totals['created'], self.totals['updated'], self.totals['unchanged']
+        if self.dry_run:
+            summary = f"Dry run: would create {created}, update {updated}, leave unchanged {unchanged} episodes."
+        else:
+            summary = f"Created {created}, updated {updated}, left unchanged {unchanged} episodes."
+        self.stdout.write(self.style.SUCCESS(summary))
+
+    def guess_format(self, path):
+        extension = path.rsplit('.', 1)[-1].lower()
+        if extension not in READERS:
+            raise CommandError("Cannot infer the input format, use --format.")
+        return extension
+
+    def clean_row(self, row, index):
+        """Converts raw input values to model values, keeping only the known columns present in the row."""
+        if not isinstance(row, dict):
+            raise CommandError(f"Row {index}: expected an object, got {type(row).__name__}.")
+
+        cleaned = {}
+        for name in IMPORT_FIELDS:
+            if name not in row:
+                continue
+            value = row[name]
+            field = Episode._meta.get_field(name)
+            if value in ('', None) and name not in REQUIRED_FIELDS:
+                value = None if field.null else field.get_default()
+            elif isinstance(value, str) and field.get_internal_type() == 'BooleanField':
+                value = BOOLEAN_VALUES.get(value.strip().lower(), value)
+            try:
+                cleaned[name] = field.to_python(value)
+            except ValidationError as e:
+                raise CommandError(f"Row {index}: invalid {name!r}: {' '.join(e.messages)}")
+
+        missing = [name for name in REQUIRED_FIELDS if cleaned.get(name) in ('', None)]
+        if missing:
+            raise CommandError(f"Row {index}: missing required field(s): {', '.join(missing)}.")
+        return cleaned
+
+    def process_batch(self, batch):
+        # A single upsert cannot touch a row twice: the last row of a number wins.
+        rows = {}
+        for row in batch:
+            if row['number'] in rows:
+                self.stderr.write(self.style.WARNING(f"Episode {row['number']} appears more than once, keeping the last row."))
+            rows[row['number']] = row
+        batch = list(rows.values())
+
+        existing = Episode.objects.in_bulk([row['number'] for row in batch], field_name='number')
+        changed = []
+
+        for row in batch:
+            episode = existing.get(row['number'])
+            if episode is None:
+                self.totals['created'] += 1
+                changed.append(row)
+                if self.dry_run:
+                    self.stdout.write(f"+ {row['number']}: {row['title_en']}")
+                continue
+
+            diff = {
+                name: (getattr(episode, name), value)
+                for name, value in row.items()
+                if name != 'number' and (name != 'comment' or self.overwrite_comment)
+                and getattr(episode, name) != value
+            }
+            if not diff:
+                self.totals['unchanged'] += 1
+                continue
+
+            self.totals['updated'] += 1
+            changed.append(row)
+            if self.dry_run:
+                self.stdout.write(f"~ {row['number']}: " + ", ".join(
+                    f"{name} {old!r} -> {new!r}" for name, (old, new) in diff.items()
+                ))
+
+        if changed and not self.dry_run:
+            self.upsert(changed)
+
+    def upsert(self, rows):
+        """Upserts rows grouped by the columns they carry, so absent columns never overwrite stored values."""
+        groups = {}
+        for row in rows:
+            groups.setdefault(frozenset(row), []).append(row)
+
+        with transaction.atomic():
+            for columns, group in groups.items():
+                update_fields = sorted(columns - {'number'})
+                if not self.overwrite_comment and 'comment' in update_fields:
+                    update_fields.remove('comment')
+
+                Episode.objects.bulk_create(
+                    [Episode(**row) for row in group],
+                    update_conflicts=True,
+                    unique_fields=['number'],
+                    update_fields=update_fields,
+                )
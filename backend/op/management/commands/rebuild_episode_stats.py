@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from op.models import EpisodeStats
+
+
+class Command(BaseCommand):
+    help = "Recomputes the per-episode rating and watch summary from all users' episode entries."
+
+    def handle(self, *args, **options):
+        count = EpisodeStats.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt stats for {count} episodes."))
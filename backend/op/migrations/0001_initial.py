@@ -0,0 +1,75 @@
+# Generated by Django 5.1.1 on 2026-10-19 17:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Episode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField(help_text='Episode number.', unique=True)),
+                ('title_pl', models.CharField(help_text='Episode title in Polish.', max_length=255)),
+                ('title_en', models.CharField(help_text='Episode title in English.', max_length=255)),
+                ('release_date', models.DateField(help_text='Episode release date.')),
+                ('is_filler', models.BooleanField(default=False, help_text='Is this episode a filler?')),
+                ('description', models.TextField(blank=True, help_text='Short description of the episode.')),
+                ('comment', models.TextField(blank=True, help_text='User comment about the episode.', null=True)),
+            ],
+            options={
+                'verbose_name': 'Episode',
+                'verbose_name_plural': 'Episodes',
+                'ordering': ['number'],
+            },
+        ),
+        migrations.CreateModel(
+            name='EpisodeStats',
+            fields=[
+                ('episode', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='op.episode')),
+                ('watched_count', models.PositiveIntegerField(default=0, help_text='Number of users who watched the episode.')),
+                ('rating_count', models.PositiveIntegerField(default=0, help_text='Number of ratings.')),
+                ('rating_sum', models.PositiveIntegerField(default=0, help_text='Sum of all ratings.')),
+                ('votes_1', models.PositiveIntegerField(default=0)),
+                ('votes_2', models.PositiveIntegerField(default=0)),
+                ('votes_3', models.PositiveIntegerField(default=0)),
+                ('votes_4', models.PositiveIntegerField(default=0)),
+                ('votes_5', models.PositiveIntegerField(default=0)),
+                ('votes_6', models.PositiveIntegerField(default=0)),
+                ('votes_7', models.PositiveIntegerField(default=0)),
+                ('votes_8', models.PositiveIntegerField(default=0)),
+                ('votes_9', models.PositiveIntegerField(default=0)),
+                ('votes_10', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Episode Stats',
+                'verbose_name_plural': 'Episode Stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='UserEpisode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('watched', models.BooleanField(default=False, help_text='Has the user watched this episode?')),
+                ('watched_date', models.DateField(blank=True, help_text='Date when the user watched the episode.', null=True)),
+                ('rating', models.IntegerField(blank=True, choices=[(1, 1), (2, 2), (3, 3), (4, 4), (5, 5), (6, 6), (7, 7), (8, 8), (9, 9), (10, 10)], help_text='User rating (1-10).', null=True)),
+                ('note', models.TextField(blank=True, help_text="User's personal notes about the episode.")),
+                ('episode', models.ForeignKey(help_text='Watched episode.', on_delete=django.db.models.deletion.CASCADE, to='op.episode')),
+                ('user', models.ForeignKey(help_text='User who watched the episode.', on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'User Episode',
+                'verbose_name_plural': 'User Episodes',
+                'unique_together': {('user', 'episode')},
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.1 on 2026-10-19 17:12
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('op', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Create the composite index before dropping the foreign key index it replaces.
+        migrations.AddIndex(
+            model_name='userepisode',
+            index=models.Index(fields=['user', 'watched', 'watched_date'], name='userepisode_watched_idx'),
+        ),
+        migrations.AlterField(
+            model_name='userepisode',
+            name='user',
+            field=models.ForeignKey(db_index=False, help_text='User who watched the episode.', on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
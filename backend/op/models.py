@@ -1,4 +1,7 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
 from django.contrib.auth.models import User
 
 class Episode(models.Model):
@@ -22,11 +25,95 @@ class Episode(models.Model):
     def __str__(self):
         return f"Episode {self.number}: {self.title_en}"
 
+class EpisodeStats(models.Model):
+    """
+    Materialized per-episode rating and watch counters.
+
+    Rows are updated incrementally by `UserEpisode.save()` and on every `UserEpisode` deletion,
+    cascades and queryset deletes included, so listings never aggregate over all users'
+    `UserEpisode` rows. Use `rebuild()` after bulk updates that bypass `save()`.
+    """
+    episode = models.OneToOneField(Episode, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    watched_count = models.PositiveIntegerField(default=0, help_text="Number of users who watched the episode.")
+    rating_count = models.PositiveIntegerField(default=0, help_text="Number of ratings.")
+    rating_sum = models.PositiveIntegerField(default=0, help_text="Sum of all ratings.")
+    votes_1 = models.PositiveIntegerField(default=0)
+    votes_2 = models.PositiveIntegerField(default=0)
+    votes_3 = models.PositiveIntegerField(default=0)
+    votes_4 = models.PositiveIntegerField(default=0)
+    votes_5 = models.PositiveIntegerField(default=0)
+    votes_6 = models.PositiveIntegerField(default=0)
+    votes_7 = models.PositiveIntegerField(default=0)
+    votes_8 = models.PositiveIntegerField(default=0)
+    votes_9 = models.PositiveIntegerField(default=0)
+    votes_10 = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Episode Stats"
+        verbose_name_plural = "Episode Stats"
+
+    def __str__(self):
+        return f"Stats for episode {self.episode_id}"
+
+    @property
+    def average_rating(self):
+        return round(self.rating_sum / self.rating_count, 2) if self.rating_count else None
+
+    @property
+    def histogram(self):
+        """Number of votes for each rating from 1 to 10."""
+        return [getattr(self, f'votes_{rating}') for rating in range(1, 11)]
+
+    @classmethod
+    def apply_change(cls, episode_id, old_state, new_state):
+        """Applies the difference between two `(watched, rating)` states of one user's episode entry."""
+        old_watched, old_rating = old_state or (False, None)
+        new_watched, new_rating = new_state or (False, None)
+        deltas = {}
+
+        if old_watched != new_watched:
+            deltas['watched_count'] = 1 if new_watched else -1
+        if old_rating != new_rating:
+            if old_rating is not None:
+                deltas['rating_count'] = deltas.get('rating_count', 0) - 1
+                deltas['rating_sum'] = deltas.get('rating_sum', 0) - old_rating
+                deltas[f'votes_{old_rating}'] = -1
+            if new_rating is not None:
+                deltas['rating_count'] = deltas.get('rating_count', 0) + 1
+                deltas['rating_sum'] = deltas.get('rating_sum', 0) + new_rating
+                deltas[f'votes_{new_rating}'] = 1
+
+        updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+        if not updates:
+            return
+        # Removals from missing stats (e.g. of an episode being deleted) have nothing to update.
+        if not cls.objects.filter(episode_id=episode_id).update(**updates) and new_state is not None:
+            cls.objects.get_or_create(episode_id=episode_id)
+            cls.objects.filter(episode_id=episode_id).update(**updates)
+
+    @classmethod
+    def rebuild(cls):
+        """Recomputes every row from `UserEpisode`; returns the number of episodes with stats."""
+        stats = {}
+        for episode_id, watched, rating in UserEpisode.objects.values_list('episode_id', 'watched', 'rating').iterator():
+            row = stats.setdefault(episode_id, cls(episode_id=episode_id))
+            row.watched_count += watched
+            if rating is not None:
+                row.rating_count += 1
+                row.rating_sum += rating
+                setattr(row, f'votes_{rating}', getattr(row, f'votes_{rating}') + 1)
+
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(stats.values(), batch_size=500)
+        return len(stats)
+
+
 class UserEpisode(models.Model):
     """
     Model representing the relationship between a user and an episode.
     """
-    user = models.ForeignKey(User, on_delete=models.CASCADE, help_text="User who watched the episode.")
+    user = models.ForeignKey(User, on_delete=models.CASCADE, db_index=False, help_text="User who watched the episode.")
     episode = models.ForeignKey(Episode, on_delete=models.CASCADE, help_text="Watched episode.")
     watched = models.BooleanField(default=False, help_text="Has the user watched this episode?")
     watched_date = models.DateField(null=True, blank=True, help_text="Date when the user watched the episode.")
@@ -35,8 +122,39 @@ class UserEpisode(models.Model):
 
     class Meta:
         unique_together = ('user', 'episode')  # Zapobiega dodaniu duplikatów
+        indexes = [
+            # A user's watched episodes in date order; also the index of the `user` foreign key.
+            models.Index(fields=['user', 'watched', 'watched_date'], name='userepisode_watched_idx'),
+        ]
         verbose_name = "User Episode"
         verbose_name_plural = "User Episodes"
 
     def __str__(self):
-        return f"{self.user.username} - Episode {self.episode.number} ({'Watched' if self.watched else 'Not Watched'})"
\ No newline at end of file
+        return f"{self.user.username} - Episode {self.episode.number} ({'Watched' if self.watched else 'Not Watched'})"
+
+    def stats_state(self):
+        return (self.watched, self.rating)
+
+    def save(self, *args, **kwargs):
+        """Saves the entry and applies the change to the episode's `EpisodeStats`.
+
+        The stored state is read again with the row locked, so concurrent saves of the same
+        entry apply their changes one after the other.
+        """
+        with transaction.atomic():
+            old_state = None
+            if not self._state.adding:
+                old_state = UserEpisode.objects.select_for_update().filter(pk=self.pk).values_list('watched', 'rating').first()
+            super().save(*args, **kwargs)
+            EpisodeStats.apply_change(self.episode_id, old_state, self.stats_state())
+
+
+@receiver(pre_delete, sender=UserEpisode, dispatch_uid='op.lock_deleted_user_episode')
+def lock_deleted_user_episode(instance, **kwargs):
+    # Deletions run in a transaction: the locked state is the one the deletion removes.
+    instance._stats_state = UserEpisode.objects.select_for_update().filter(pk=instance.pk).values_list('watched', 'rating').first()
+
+
+@receiver(post_delete, sender=UserEpisode, dispatch_uid='op.remove_deleted_user_episode')
+def remove_deleted_user_episode(instance, **kwargs):
+    EpisodeStats.apply_change(instance.episode_id, instance.__dict__.pop('_stats_state', None), None)
@@ -1,3 +1,189 @@
+import json
+import os
+import tempfile
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
 from django.test import TestCase
+from django.urls import reverse
+
+from .models import Episode, EpisodeStats, UserEpisode
+
+
+class ImportEpisodesCommandTest(TestCase):
+
+    def setUp(self):
+        self.existing = Episode.objects.create(
+            number=1,
+            title_pl="Jestem Luffy!",
+            title_en="I'm Luffy!",
+            release_date=date(1999, 10, 20),
+            comment="Classic opening.",
+        )
+
+    def write_file(self, suffix, content):
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(handle, 'w', encoding='utf-8') as f:
+            f.write(content)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def run_import(self, path, *args):
+        out = StringIO()
+        call_command('import_episodes', path, *args, stdout=out, stderr=out)
+        return out.getvalue()
+
+    def test_csv_upsert_creates_and_updates(self):
+        path = self.write_file('.csv', (
+            "number,title_pl,title_en,release_date,is_filler,comment\n"
+            "1,Jestem Luffy!,I'm Luffy! (remastered),1999-10-20,false,Overwritten?\n"
+            "2,Wielki szermierz,The Great Swordsman,1999-11-17,false,\n"
+        ))
+
+        self.run_import(path, '--batch-size', '1')
+
+        self.assertEqual(Episode.objects.count(), 2)
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.title_en, "I'm Luffy! (remastered)")
+        self.assertEqual(self.existing.comment, "Classic opening.")
+        self.assertEqual(Episode.objects.get(number=2).release_date, date(1999, 11, 17))
+
+    def test_duplicate_numbers_keep_last_row(self):
+        path = self.write_file('.csv', (
+            "number,title_pl,title_en,release_date\n"
+            "2,Wielki szermierz,The Great Swordsman,1999-11-17\n"
+            "2,Wielki szermierz,The Great Swordsman Appears,1999-11-17\n"
+        ))
+
+        output = self.run_import(path)
+
+        self.assertIn("Episode 2 appears more than once, keeping the last row.", output)
+        self.assertIn("Created 1, updated 0, left unchanged 0 episodes.", output)
+        self.assertEqual(Episode.objects.get(number=2).title_en, "The Great Swordsman Appears")
+
+    def test_overwrite_comment(self):
+        path = self.write_file('.jsonl', json.dumps({
+            "number": 1, "title_pl": "Jestem Luffy!", "title_en": "I'm Luffy!",
+            "release_date": "1999-10-20", "comment": "New comment.",
+        }) + "\n")
+
+        self.run_import(path, '--overwrite-comment')
+
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.comment, "New comment.")
+
+    def test_json_array_dry_run_reports_diff_without_writing(self):
+        path = self.write_file('.json', json.dumps([
+            {"number": 1, "title_pl": "Jestem Luffy!", "title_en": "Luffy", "release_date": "1999-10-20"},
+            {"number": 3, "title_pl": "Morgan", "title_en": "Morgan vs. Luffy", "release_date": "1999-11-24"},
+        ]))
+
+        output = self.run_import(path, '--dry-run')
+
+        self.assertIn("~ 1: title_en \"I'm Luffy!\" -> 'Luffy'", output)
+        self.assertIn("+ 3: Morgan vs. Luffy", output)
+        self.assertIn("would create 1, update 1, leave unchanged 0", output)
+        self.assertEqual(Episode.objects.count(), 1)
+        self.existing.refresh_from_db()
+        self.assertEqual(self.existing.title_en, "I'm Luffy!")
+
+    def test_missing_required_field(self):
+        path = self.write_file('.csv', "number,title_pl\n5,Tylko tytuł\n")
+
+        with self.assertRaisesMessage(CommandError, "Row 1: missing required field(s): title_en, release_date."):
+            self.run_import(path)
+
+
+class EpisodeStatsTest(TestCase):
+
+    def setUp(self):
+        self.user1 = User.objects.create_user(username="user1", password="password123")
+        self.user2 = User.objects.create_user(username="user2", password="password123")
+        self.episode1 = Episode.objects.create(number=1, title_pl="Pierwszy", title_en="First", release_date=date(1999, 10, 20))
+        self.episode2 = Episode.objects.create(number=2, title_pl="Drugi", title_en="Second", release_date=date(1999, 11, 17))
+
+    def test_stats_follow_rating_changes(self):
+        entry = UserEpisode.objects.create(user=self.user1, episode=self.episode1, watched=True, rating=8)
+        UserEpisode.objects.create(user=self.user2, episode=self.episode1, rating=6)
+
+        stats = EpisodeStats.objects.get(episode=self.episode1)
+        self.assertEqual((stats.watched_count, stats.rating_count, stats.rating_sum), (1, 2, 14))
+        self.assertEqual(stats.average_rating, 7)
+
+        entry = UserEpisode.objects.get(pk=entry.pk)
+        entry.rating = 10
+        entry.save()
+        stats.refresh_from_db()
+        self.assertEqual(stats.histogram, [0, 0, 0, 0, 0, 1, 0, 0, 0, 1])
+
+        entry.delete()
+        stats.refresh_from_db()
+        self.assertEqual((stats.watched_count, stats.rating_count, stats.rating_sum), (0, 1, 6))
+
+    def test_stale_entry_applies_stored_state(self):
+        UserEpisode.objects.create(user=self.user1, episode=self.episode1)
+        first, second = UserEpisode.objects.get(user=self.user1), UserEpisode.objects.get(user=self.user1)
+
+        for entry in (first, second):
+            entry.watched = True
+            entry.save()
+
+        self.assertEqual(EpisodeStats.objects.get(episode=self.episode1).watched_count, 1)
+
+    def test_cascades_update_stats(self):
+        UserEpisode.objects.create(user=self.user1, episode=self.episode1, watched=True, rating=8)
+        UserEpisode.objects.create(user=self.user1, episode=self.episode2, watched=True)
+        UserEpisode.objects.create(user=self.user2, episode=self.episode1, watched=True, rating=6)
+
+        self.user1.delete()
+
+        stats = EpisodeStats.objects.get(episode=self.episode1)
+        self.assertEqual((stats.watched_count, stats.rating_count, stats.rating_sum), (1, 1, 6))
+        self.assertEqual(stats.histogram, [0, 0, 0, 0, 0, 1, 0, 0, 0, 0])
+        self.assertEqual(EpisodeStats.objects.get(episode=self.episode2).watched_count, 0)
+
+        UserEpisode.objects.create(user=self.user2, episode=self.episode2, watched=True)
+        Episode.objects.filter(pk=self.episode2.pk).delete()
+        self.assertFalse(EpisodeStats.objects.filter(episode_id=self.episode2.pk).exists())
+
+    def test_rebuild_matches_incremental_updates(self):
+        UserEpisode.objects.create(user=self.user1, episode=self.episode1, watched=True, rating=3)
+        UserEpisode.objects.create(user=self.user2, episode=self.episode2, watched=True)
+        expected = list(EpisodeStats.objects.order_by('episode').values())
+
+        self.assertEqual(EpisodeStats.rebuild(), 2)
+        self.assertEqual(list(EpisodeStats.objects.order_by('episode').values()), expected)
+
+    def test_top_episodes_endpoint(self):
+        UserEpisode.objects.create(user=self.user1, episode=self.episode1, watched=True, rating=5)
+        UserEpisode.objects.create(user=self.user1, episode=self.episode2, watched=True, rating=9)
+        UserEpisode.objects.create(user=self.user2, episode=self.episode1, watched=True)
+        self.client.force_login(self.user1)
+
+        response = self.client.get(reverse('top_episodes'))
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([e['number'] for e in data['top_rated']], [2, 1])
+        self.assertEqual([e['number'] for e in data['most_watched']], [1, 2])
+        self.assertEqual(data['most_watched'][0]['watched_count'], 2)
+
+
+class UserEpisodeQueryPlanTest(TestCase):
+
+    def test_watched_episodes_in_date_order(self):
+        user = User.objects.create_user(username="viewer", password="password123")
+        episode = Episode.objects.create(number=1, title_pl="Odcinek", title_en="Episode", release_date=date(1999, 10, 20))
+        UserEpisode.objects.create(user=user, episode=episode, watched=True, watched_date=date(2024, 1, 1))
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+            if connection.vendor == 'postgresql':
+                cursor.execute("SET LOCAL enable_seqscan = off")
+
+        plan = UserEpisode.objects.filter(user=user, watched=True).order_by('watched_date').explain()
 
-# Create your tests here.
+        self.assertIn('userepisode_watched_idx', plan)
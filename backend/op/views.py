@@ -4,11 +4,12 @@ from django.http import JsonResponse
 from django.utils.timezone import now
 from datetime import timedelta, date
 from collections import defaultdict
-from .models import Episode, UserEpisode
+from django.db.models import F, FloatField, ExpressionWrapper
+from .models import Episode, EpisodeStats, UserEpisode
 
 @login_required
 def home(request):
-    episodes = Episode.objects.all()
+    episodes = Episode.objects.select_related('stats')
     total_episodes = episodes.count()
     watched_episodes = UserEpisode.objects.filter(user=request.user, watched=True)
 
@@ -113,3 +114,41 @@ def mark_as_watched(request, episode_id):
             return JsonResponse({'status': 'watched', 'episode_id': episode_id})
 
     return JsonResponse({'status': 'error'}, status=400)
+
+
+@login_required
+def top_episodes(request):
+    """Returns the top rated and most watched episodes, read from the `EpisodeStats` summary table.
+
+    Query parameters:
+    - `limit`: Number of episodes in each list (default 10, at most 100).
+    - `min_ratings`: Minimum number of ratings for an episode to be ranked by rating (default 1).
+    """
+    try:
+        limit = min(max(int(request.GET.get('limit', 10)), 1), 100)
+        min_ratings = max(int(request.GET.get('min_ratings', 1)), 1)
+    except ValueError:
+        return JsonResponse({'status': 'error', 'detail': 'limit and min_ratings must be integers.'}, status=400)
+
+    stats = EpisodeStats.objects.select_related('episode')
+    top_rated = stats.filter(rating_count__gte=min_ratings).annotate(
+        average=ExpressionWrapper(F('rating_sum') * 1.0 / F('rating_count'), output_field=FloatField())
+    ).order_by('-average', '-rating_count', 'episode__number')[:limit]
+    most_watched = stats.filter(watched_count__gt=0).order_by('-watched_count', 'episode__number')[:limit]
+
+    return JsonResponse({
+        'top_rated': [_episode_stats_data(s) for s in top_rated],
+        'most_watched': [_episode_stats_data(s) for s in most_watched],
+    })
+
+
+def _episode_stats_data(stats):
+    return {
+        'episode_id': stats.episode_id,
+        'number': stats.episode.number,
+        'title_en': stats.episode.title_en,
+        'watched_count': stats.watched_count,
+        'rating_count': stats.rating_count,
+        'average_rating': stats.average_rating,
+        'histogram': stats.histogram,
+    }
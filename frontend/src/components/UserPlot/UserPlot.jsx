@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { splitDataAtZero } from '../../utils/splitData';
+import { decodeColumnar } from '../../utils/columnar';
 import LineChart from './LineChart';
 import ColumnChart from './ColumnChart';
 import './UserPlot.css';
@@ -16,8 +17,8 @@ const UserPlot = () => {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const response = await api.get('/api/user/plot-data/');
-        setPlotData(response.data); 
+        const response = await api.get('/api/user/plot-data/', { params: { format: 'columnar' } });
+        setPlotData(decodeColumnar(response.data));
       } catch (error) {
         console.error("Błąd podczas pobierania danych do wykresu:", error);
       }
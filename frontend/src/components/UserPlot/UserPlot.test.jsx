@@ -36,6 +36,16 @@ describe("UserPlot Component Tests", () => {
     cumulative_results: [100, 50],
   };
 
+  const mockColumnarData = {
+    length: 2,
+    types: { labels: "epoch_day", single_game_results: "cents", cumulative_results: "cents" },
+    columns: {
+      labels: [19723, 19724],
+      single_game_results: [10000, -5000],
+      cumulative_results: [10000, 5000],
+    },
+  };
+
   const mockSplitData = {
     labels: [new Date("2024-01-01"), new Date("2024-01-02")],
     positive: [100],
@@ -45,13 +55,13 @@ describe("UserPlot Component Tests", () => {
   };
 
   it("fetches and displays plot data on mount", async () => {
-    api.get.mockResolvedValueOnce({ data: mockPlotData });
+    api.get.mockResolvedValueOnce({ data: mockColumnarData });
     splitDataAtZero.mockReturnValue(mockSplitData);
 
     render(<UserPlot />);
 
     await waitFor(() => {
-      expect(api.get).toHaveBeenCalledWith("/api/user/plot-data/");
+      expect(api.get).toHaveBeenCalledWith("/api/user/plot-data/", { params: { format: "columnar" } });
       expect(splitDataAtZero).toHaveBeenCalledWith(
         [new Date("2024-01-01"), new Date("2024-01-02")],
         [100, 50]
@@ -63,7 +73,7 @@ describe("UserPlot Component Tests", () => {
   });
 
   it("renders charts with correct data", async () => {
-    api.get.mockResolvedValueOnce({ data: mockPlotData });
+    api.get.mockResolvedValueOnce({ data: mockColumnarData });
     splitDataAtZero.mockReturnValue(mockSplitData);
 
     render(<UserPlot />);
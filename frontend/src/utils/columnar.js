@@ -0,0 +1,20 @@
+const MS_PER_DAY = 86400000;
+
+const decoders = {
+  epoch_day: (day) => new Date(day * MS_PER_DAY).toISOString().slice(0, 10),
+  cents: (value) => value / 100,
+};
+
+/**
+ * Decodes a columnar series response (`?format=columnar`) back to plain arrays.
+ * Epoch days become "YYYY-MM-DD" strings and cents become amounts.
+ * @param {object} data - Response with `types` and `columns`.
+ * @returns {object} - The series keyed by name, plus any other fields of the response.
+ */
+export const decodeColumnar = ({ types, columns, length, ...rest }) => {
+  const decoded = { ...rest };
+  for (const [key, type] of Object.entries(types)) {
+    decoded[key] = columns[key].map(decoders[type]);
+  }
+  return decoded;
+};